@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark suite against a local stand-in for GitHub.
+
+Starts an HTTP server on 127.0.0.1 that imitates the endpoints the CLI uses:
+
+    GET /repos/<owner>/<repo>/releases/latest          release JSON (ETag / 304)
+    GET /assets/<name>                                 release assets and manifests
+    GET /<owner>/<repo>/archive/refs/heads/<branch>.zip  branch archive
+
+and serves synthetic templates built from this checkout's templates/,
+scripts/ and memory/, padded per profile:
+
+    tiny          the real templates only
+    medium        + 5,000 small files (~10 MB)
+    entries-50k   + 50,000 small files
+    size-100mb    + 100 MB of incompressible files
+
+Release assets are built with the same code as `specify build-templates`
+(reproducible zips plus .manifest.json). For each profile it times, in
+process: download_template_from_github (cold, and warm from a revalidated
+cache), download_release_asset (release path, SHA-256 verified),
+download_and_extract_template (from the branch archive, and from the release
+packages in a local `specify mirror`), generate_ai_commands, and
+ensure_executable_scripts. Full `specify init` runs in a subprocess, with a
+cold and a warm cache, and from the mirror with --template-source.
+
+Projects installed from release packages are checked for .specify/ and the
+assistants' command directories, and `specify init` must refuse a mirror
+with a tampered template file (caught by the archive digest, or by the
+per-file hashes when the digest was updated too). Results are written as
+JSON. Pass --compare with an earlier results file to print the change per
+case. The run fails when an install is incomplete, a tampered mirror is
+accepted, or a case regressed beyond --threshold.
+
+Usage:
+    python benchmarks/e2e.py                                  # tiny + medium
+    python benchmarks/e2e.py --profiles tiny,entries-50k,size-100mb --runs 3 -o results.json
+    python benchmarks/e2e.py -o new.json --compare old.json --threshold 0.2 --min-delta-ms 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_ROOT / "src"
+
+OWNER, REPO, BRANCH, TAG = "bench", "spec-kit", "main", "v0.0.0-bench"
+AI, SCRIPT = "claude", "sh"
+# Assistants installed together from the mirrored release packages
+MIRROR_AIS = [AI, "gemini"]
+PROFILES = {
+    # name: (padding files, bytes per file, incompressible)
+    "tiny": (0, 0, False),
+    "medium": (5_000, 2_048, False),
+    "entries-50k": (50_000, 256, False),
+    "size-100mb": (25, 4 * 1024 * 1024, True),
+}
+DEFAULT_PROFILES = "tiny,medium"
+
+
+# ---------------------------------------------------------------------------
+# Stand-in GitHub server
+
+
+class StandInGitHub(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.routes: dict[str, tuple[bytes, str]] = {}  # path -> (body, content type)
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def publish(self, release_dir: Path, branch_zip: Path) -> None:
+        """Serve the release assets in release_dir and the branch archive (replacing earlier content)."""
+        self.routes = {f"/{OWNER}/{REPO}/archive/refs/heads/{BRANCH}.zip": (branch_zip.read_bytes(), "application/zip")}
+        assets = []
+        for path in sorted(release_dir.iterdir()):
+            body = path.read_bytes()
+            self.routes[f"/assets/{path.name}"] = (body, "application/octet-stream")
+            assets.append({"name": path.name, "size": len(body), "browser_download_url": f"{self.base_url}/assets/{path.name}"})
+        release = {"tag_name": TAG, "name": TAG, "assets": assets}
+        self.routes[f"/repos/{OWNER}/{REPO}/releases/latest"] = (json.dumps(release).encode(), "application/json")
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests += 1
+        route = self.server.routes.get(self.path)
+        if route is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body, content_type = route
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic templates
+
+
+def make_source_tree(dest: Path, profile: str) -> None:
+    """Copy the real template sources and add the profile's padding under templates/bench/."""
+    for dirname in ("templates", "scripts", "memory"):
+        if (REPO_ROOT / dirname).is_dir():
+            shutil.copytree(REPO_ROOT / dirname, dest / dirname)
+    count, size, incompressible = PROFILES[profile]
+    if not count:
+        return
+    pad_root = dest / "templates" / "bench"
+    filler = b"# benchmark padding\n" * (size // 20 + 1)
+    for i in range(count):
+        directory = pad_root / f"d{i // 1000:03d}"
+        if i % 1000 == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"f{i:05d}.md").write_bytes(os.urandom(size) if incompressible else filler[:size])
+
+
+def make_branch_zip(source: Path, dest: Path) -> None:
+    """Zip source under a GitHub-style <repo>-<branch>/ root."""
+    root = f"{REPO}-{BRANCH}/"
+    with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for path in sorted(source.rglob("*")):
+            if path.is_file():
+                zf.write(path, root + path.relative_to(source).as_posix())
+
+
+def archive_stats(path: Path) -> dict:
+    with zipfile.ZipFile(path) as zf:
+        infos = zf.infolist()
+    return {"bytes": path.stat().st_size, "entries": len(infos), "uncompressed_bytes": sum(i.file_size for i in infos)}
+
+
+# ---------------------------------------------------------------------------
+# Timing
+
+
+def check_release_project(specify, project: Path, ai_assistants: list[str]) -> list[str]:
+    """What an install from release packages should have produced but did not."""
+    missing = [f".specify/{name}" for name in ("memory", f"scripts/{specify.SCRIPT_VARIANT_DIRS[SCRIPT]}", "templates") if not (project / ".specify" / name).is_dir()]
+    for ai in ai_assistants:
+        directory, pattern = specify.AGENT_COMMAND_DIRS[ai]
+        if not any((project / directory).glob(pattern)):
+            missing.append(f"{directory}/{pattern}")
+    return [f"{project.name}: missing {path}" for path in missing]
+
+
+def tamper_mirror(mirror_dir: Path, dest: Path, asset_name: str, *, reseal: bool) -> str:
+    """Copy a mirror and rewrite one template file inside asset_name; returns the file's name.
+
+    With reseal the archive's size and SHA-256 are updated in the release
+    JSON and the asset manifest as well, so only the per-file hashes can
+    catch the change.
+    """
+    shutil.copytree(mirror_dir, dest)
+    releases = dest / OWNER / REPO / "releases"
+    archive = releases / TAG / asset_name
+    with zipfile.ZipFile(archive) as zf:
+        infos = zf.infolist()
+        contents = [zf.read(info) for info in infos]
+    victim = next(info.filename for info in infos if info.filename.startswith(".specify/templates/") and not info.is_dir())
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for info, data in zip(infos, contents):
+            zf.writestr(info, b"# tampered\n" if info.filename == victim else data)
+    if not reseal:
+        return victim
+
+    manifest_path = archive.with_name(asset_name + ".manifest.json")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest.update(sha256=hashlib.sha256(archive.read_bytes()).hexdigest(), size=archive.stat().st_size)
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    sizes = {asset_name: archive.stat().st_size, manifest_path.name: manifest_path.stat().st_size}
+    for release_json in releases.glob("*.json"):
+        release = json.loads(release_json.read_text(encoding="utf-8"))
+        for asset in release["assets"]:
+            asset["size"] = sizes.get(asset["name"], asset["size"])
+        release_json.write_text(json.dumps(release), encoding="utf-8")
+    return victim
+
+
+def timed(fn, runs: int, setup=None) -> dict:
+    samples = []
+    for _ in range(runs):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        fn(state) if setup else fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"runs": runs, "median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples)}
+
+
+def run_profile(specify, server: StandInGitHub, profile: str, work: Path, runs: int, init_runs: int) -> dict:
+    source = work / "source"
+    make_source_tree(source, profile)
+    branch_zip = work / f"{REPO}-{BRANCH}.zip"
+    make_branch_zip(source, branch_zip)
+    release_dir = work / "release"
+    specify.build_release_packages(source, TAG, MIRROR_AIS, [SCRIPT], release_dir)
+    server.publish(release_dir, branch_zip)
+    asset_name = specify.release_asset_name(AI, SCRIPT, TAG)
+
+    client = specify.get_http_client()
+    counter = iter(range(1_000_000))
+    results = {"branch_archive": archive_stats(branch_zip), "release_asset": archive_stats(release_dir / asset_name), "failures": []}
+
+    def fresh_dir(name: str) -> Path:
+        return work / f"{name}-{next(counter)}"
+
+    # Downloads: branch archive (the path `init` takes) and the verified release asset
+    results["download_template_from_github/cold"] = timed(lambda: specify.download_template_from_github(
+        AI, None, script_type=SCRIPT, verbose=False, show_progress=False, client=client,
+        repo_owner=OWNER, repo_name=REPO, repo_branch=BRANCH,
+    )[0].close(), runs)
+
+    warm_cache = specify.TemplateCache(work / "warm-cache")
+    specify.download_template_from_github(AI, None, script_type=SCRIPT, verbose=False, show_progress=False, client=client,
+                                          repo_owner=OWNER, repo_name=REPO, repo_branch=BRANCH, cache=warm_cache)
+    results["download_template_from_github/warm"] = timed(lambda: specify.download_template_from_github(
+        AI, None, script_type=SCRIPT, verbose=False, show_progress=False, client=client,
+        repo_owner=OWNER, repo_name=REPO, repo_branch=BRANCH, cache=warm_cache,
+    ), runs)
+
+    def release_download():
+        release = specify.fetch_release_data(client, OWNER, REPO, verbose=False)
+        asset = specify.find_template_asset(release, AI, SCRIPT)
+        archive, _ = specify.download_release_asset(client, asset, release["tag_name"], OWNER, REPO,
+                                                    manifest_asset=specify.find_asset_manifest(release, asset),
+                                                    verbose=False, show_progress=False)
+        archive.close()
+
+    results["download_release_asset"] = timed(release_download, runs)
+
+    # Download + extract + branch transform into a new project
+    results["download_and_extract_template"] = timed(
+        lambda project: specify.download_and_extract_template(
+            project, AI, SCRIPT, verbose=False, client=client,
+            repo_owner=OWNER, repo_name=REPO, repo_branch=BRANCH,
+        ),
+        runs, setup=lambda: fresh_dir("extract"),
+    )
+
+    # Download + extract the release packages of a local mirror (no branch transform)
+    mirror_dir = work / "mirror"
+    specify.mirror_release(client, specify.fetch_release_data(client, OWNER, REPO, verbose=False), mirror_dir, OWNER, REPO)
+    specify.update_mirror_latest(mirror_dir, OWNER, REPO)
+
+    def mirror_extract(project: Path) -> None:
+        specify.download_and_extract_templates(
+            project, MIRROR_AIS, [SCRIPT], verbose=False, client=client,
+            repo_owner=OWNER, repo_name=REPO, template_source=str(mirror_dir),
+        )
+
+    results["download_and_extract_template/mirror"] = timed(mirror_extract, runs, setup=lambda: fresh_dir("mirror-extract"))
+    project = fresh_dir("mirror-extract")
+    mirror_extract(project)
+    results["failures"] += check_release_project(specify, project, MIRROR_AIS)
+
+    commands_dir = source / "templates" / "commands"
+    for ai in ("claude", "gemini", "copilot"):
+        results[f"generate_ai_commands/{ai}"] = timed(
+            lambda project, ai=ai: specify.generate_ai_commands(project, ai, SCRIPT, commands_dir),
+            runs, setup=lambda: fresh_dir("commands"),
+        )
+
+    project = fresh_dir("chmod")
+    specify.download_and_extract_template(project, AI, SCRIPT, verbose=False, client=client,
+                                          repo_owner=OWNER, repo_name=REPO, repo_branch=BRANCH)
+
+    def reset_modes():
+        for script in (project / ".specify" / "scripts").rglob("*.sh"):
+            script.chmod(0o644)
+
+    results["ensure_executable_scripts"] = timed(lambda _: specify.ensure_executable_scripts(project), runs, setup=reset_modes)
+
+    # Full CLI runs in a fresh interpreter, as users run it
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])),
+        "SPECIFY_GITHUB_URL": server.base_url,
+        "SPECIFY_GITHUB_API_URL": server.base_url,
+        "SPECIFY_REPO_OWNER": OWNER,
+        "SPECIFY_REPO_NAME": REPO,
+        "SPECIFY_REPO_BRANCH": BRANCH,
+        "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@example.invalid",
+        "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@example.invalid",
+        "COLUMNS": "120",
+    })
+
+    def run_init(cache_dir: Path, project: Path, *args: str, ai: str = AI) -> subprocess.CompletedProcess:
+        env["SPECIFY_CACHE_DIR"] = str(cache_dir)
+        return subprocess.run(
+            [sys.executable, "-c", "import sys; from specify_cli import main; sys.argv[0] = 'specify'; main()",
+             "init", str(project), "--ai", ai, "--script", SCRIPT, "--ignore-agent-tools", *args],
+            env=env, cwd=work, capture_output=True,
+        )
+
+    def init(cache_dir: Path, *args: str, ai: str = AI) -> Path:
+        project = fresh_dir("init")
+        run_init(cache_dir, project, *args, ai=ai).check_returncode()
+        return project
+
+    results["init/cold"] = timed(lambda cache_dir: init(cache_dir), init_runs, setup=lambda: fresh_dir("init-cache"))
+    warm_init_cache = fresh_dir("init-cache")
+    init(warm_init_cache)
+    results["init/warm"] = timed(lambda: init(warm_init_cache), init_runs)
+
+    mirror_args = ("--template-source", str(mirror_dir))
+    results["init/mirror"] = timed(lambda cache_dir: init(cache_dir, *mirror_args, ai=",".join(MIRROR_AIS)), init_runs, setup=lambda: fresh_dir("init-cache"))
+    results["failures"] += check_release_project(specify, init(fresh_dir("init-cache"), *mirror_args, ai=",".join(MIRROR_AIS)), MIRROR_AIS)
+
+    # A tampered mirror must abort init, whether the archive digest or only a per-file hash gives it away
+    for reseal in (False, True):
+        tampered = fresh_dir("tampered-mirror")
+        victim = tamper_mirror(mirror_dir, tampered, asset_name, reseal=reseal)
+        project = fresh_dir("init")
+        completed = run_init(fresh_dir("init-cache"), project, "--template-source", str(tampered))
+        label = f"tampered {victim} ({'resealed archive' if reseal else 'archive digest'})"
+        if completed.returncode == 0:
+            results["failures"].append(f"{label}: init succeeded")
+        elif project.exists():
+            results["failures"].append(f"{label}: init failed but left {project.name}")
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def project_version() -> str | None:
+    for line in (REPO_ROOT / "pyproject.toml").read_text(encoding="utf-8").splitlines():
+        if line.startswith("version"):
+            return line.split("=", 1)[1].strip().strip('"')
+    return None
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """Print per-case changes against a baseline run; returns the regressions.
+
+    A case regressed when its median grew by more than threshold (relative)
+    and by more than min_delta_ms, so jitter in millisecond cases is ignored.
+    """
+    regressions = []
+    print(f"\nCompared with {baseline.get('version')} ({(baseline.get('git_revision') or '?')[:12]}):")
+    for profile, cases in current["profiles"].items():
+        old_cases = baseline.get("profiles", {}).get(profile, {})
+        for case, result in cases.items():
+            old = old_cases.get(case)
+            if "median_ms" not in result or not old or "median_ms" not in old:
+                continue
+            change = (result["median_ms"] - old["median_ms"]) / old["median_ms"] if old["median_ms"] else 0.0
+            regressed = change > threshold and result["median_ms"] - old["median_ms"] > min_delta_ms
+            flag = "  REGRESSION" if regressed else ""
+            print(f"  {profile:12} {case:40} {old['median_ms']:9.1f} -> {result['median_ms']:9.1f} ms ({change:+.0%}){flag}")
+            if flag:
+                regressions.append(f"{profile} {case} {change:+.0%}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default=DEFAULT_PROFILES, help=f"Comma-separated profiles: {', '.join(PROFILES)} (default: {DEFAULT_PROFILES})")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per in-process case (default: 5)")
+    parser.add_argument("--init-runs", type=int, default=3, help="Runs per `specify init` case (default: 3)")
+    parser.add_argument("--output", "-o", type=Path, help="Write the results JSON here (default: print it)")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown counted as a regression with --compare (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Smallest absolute slowdown counted as a regression (default: 5 ms)")
+    parser.add_argument("--keep", action="store_true", help="Keep the working directory (printed) for inspection")
+    args = parser.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profile(s): {', '.join(unknown)}")
+
+    server = StandInGitHub()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    work_root = Path(tempfile.mkdtemp(prefix="specify-e2e-bench-"))
+    # The module reads its endpoints at import time, so configure them first
+    os.environ.update({
+        "SPECIFY_GITHUB_URL": server.base_url,
+        "SPECIFY_GITHUB_API_URL": server.base_url,
+        "SPECIFY_CACHE_DIR": str(work_root / "default-cache"),
+    })
+    sys.path.insert(0, str(SRC_DIR))
+    import specify_cli
+
+    specify_cli.console.quiet = True
+
+    results = {
+        "version": project_version(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "runs": args.runs,
+        "init_runs": args.init_runs,
+        "profiles": {},
+    }
+    try:
+        for profile in profiles:
+            print(f"[{profile}] building fixtures and timing...", file=sys.stderr)
+            work = work_root / profile
+            work.mkdir()
+            results["profiles"][profile] = run_profile(specify_cli, server, profile, work, args.runs, args.init_runs)
+    finally:
+        server.shutdown()
+        if args.keep:
+            print(f"Working directory kept: {work_root}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_root, ignore_errors=True)
+    results["http_requests"] = server.requests
+
+    for profile, cases in results["profiles"].items():
+        archive = cases["branch_archive"]
+        print(f"\n{profile}: branch archive {archive['bytes']:,} bytes, {archive['entries']:,} entries")
+        for case, result in cases.items():
+            if "median_ms" in result:
+                print(f"  {case:40} median {result['median_ms']:9.1f} ms  (min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+
+    regressions = compare(results, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold, args.min_delta_ms) if args.compare else []
+    failures = [f"{profile}: {failure}" for profile, cases in results["profiles"].items() for failure in cases["failures"]]
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    for regression in regressions:
+        print(f"FAIL: regression: {regression}", file=sys.stderr)
+    return 1 if regressions or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Subprocess count and wall time of feature path resolution: common.sh vs ``specify paths``.
+
+Builds a throwaway git repo on a capability branch (``user/proj-1.demo-cap-001``
+with ``specs/proj-1.demo/cap-001-demo/``), then resolves the feature paths
+with ``get_feature_paths`` / ``get_feature_paths_smart`` from
+``scripts/bash/common.sh`` and with ``specify paths``. External commands are
+counted through a PATH shim directory that logs every git/sed/awk/... call
+before exec'ing the real binary. Bash ``$(...)`` subshells that only run
+builtins fork without exec and are not counted, so the bash numbers are a
+lower bound. Both sides must print identical assignments.
+
+Usage:
+    python benchmarks/paths.py
+    python benchmarks/paths.py --runs 20 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_ROOT / "src"
+COMMON_SH = REPO_ROOT / "scripts" / "bash" / "common.sh"
+
+BRANCH = "user/proj-1.demo-cap-001"
+# Commands common.sh and `specify paths` may exec; each gets a logging shim
+SHIMMED = ["git", "sed", "awk", "grep", "dirname", "basename", "xargs", "cut", "head", "tail", "tr", "find", "realpath", "cat", "ls", "sort"]
+
+
+def make_fixture(root: Path) -> Path:
+    repo = root / "repo"
+    repo.mkdir()
+    git = ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.invalid", "-c", "init.defaultBranch=main"]
+    subprocess.run(git + ["init", "-q"], cwd=repo, check=True)
+    feature = repo / "specs" / "proj-1.demo" / "cap-001-demo"
+    feature.mkdir(parents=True)
+    (feature / "spec.md").write_text("# Demo\n")
+    subprocess.run(git + ["add", "-A"], cwd=repo, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "fixture"], cwd=repo, check=True)
+    subprocess.run(git + ["checkout", "-q", "-b", BRANCH], cwd=repo, check=True)
+    return repo
+
+
+def make_shims(root: Path) -> tuple[Path, Path]:
+    shim_dir = root / "shims"
+    shim_dir.mkdir()
+    log = root / "exec.log"
+    for name in SHIMMED:
+        real = shutil.which(name)
+        if not real:
+            continue
+        shim = shim_dir / name
+        shim.write_text(f'#!/bin/sh\necho {name} >> "{log}"\nexec "{real}" "$@"\n')
+        shim.chmod(0o755)
+    return shim_dir, log
+
+
+def run(cmd: list[str], cwd: Path, env: dict, log: Path) -> tuple[str, float, Counter]:
+    log.write_text("")
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    return result.stdout, elapsed, Counter(log.read_text().split())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per variant (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="specify-paths-bench-") as tmp:
+        root = Path(tmp)
+        repo = make_fixture(root)
+        shim_dir, log = make_shims(root)
+        env = dict(os.environ)
+        env["PATH"] = os.pathsep.join([str(shim_dir), env.get("PATH", "")])
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+
+        specify = [sys.executable, "-c", "import sys; from specify_cli import main; sys.argv[0] = 'specify'; main()", "paths"]
+        variants = {
+            "bash get_feature_paths": ["bash", "-c", f'source "{COMMON_SH}"; get_feature_paths'],
+            "bash get_feature_paths_smart": ["bash", "-c", f'source "{COMMON_SH}"; get_feature_paths_smart'],
+            "specify paths --no-workspace": specify + ["--no-workspace"],
+            "specify paths": specify,
+        }
+
+        results: dict[str, dict] = {}
+        outputs = {}
+        for label, cmd in variants.items():
+            output, _, execs = run(cmd, repo, env, log)  # warm-up; also the exec count
+            samples = [run(cmd, repo, env, log)[1] for _ in range(args.runs)]
+            outputs[label] = output
+            results[label] = {
+                "execs": sum(execs.values()),
+                "by_command": dict(sorted(execs.items())),
+                "ms": {"median": statistics.median(samples), "min": min(samples), "max": max(samples)},
+            }
+
+    mismatches = [
+        f"{bash_label} != {py_label}"
+        for bash_label, py_label in [
+            ("bash get_feature_paths", "specify paths --no-workspace"),
+            ("bash get_feature_paths_smart", "specify paths"),
+        ]
+        if outputs[bash_label] != outputs[py_label]
+    ]
+
+    if args.json:
+        print(json.dumps({"runs": args.runs, "results": results, "mismatches": mismatches}, indent=2))
+    else:
+        for label, data in results.items():
+            commands = ", ".join(f"{name}={count}" for name, count in data["by_command"].items()) or "-"
+            print(f"{label:30} execs {data['execs']:3}  median {data['ms']['median']:7.1f} ms  ({commands})")
+    for mismatch in mismatches:
+        print(f"FAIL: output differs: {mismatch}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
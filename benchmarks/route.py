@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Convention routing budget check for ``specify route``.
+
+Generates a throwaway workspace whose workspace.yml has many repos and
+prefix/suffix rules, then measures in-process:
+
+- parsing workspace.yml and compiling the rule tries (cold load)
+- loading the cached snapshot from .specify/cache/workspace.json (warm load)
+- routing one spec ID (median over a batch of generated IDs)
+
+Every route is checked against a plain linear scan of the rules, and the
+check fails when the median route or warm load exceeds its budget.
+
+Usage:
+    python benchmarks/route.py
+    python benchmarks/route.py --rules 1000 --repos 50 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from specify_cli import JIRA_PREFIX_RE, WorkspaceRouter  # noqa: E402
+
+DEFAULT_ROUTE_BUDGET_MS = 1.0
+DEFAULT_LOAD_BUDGET_MS = 20.0
+WORDS = ["auth", "billing", "search", "backend", "frontend", "api", "ui", "mobile", "data", "infra", "login", "report"]
+
+
+def make_workspace(root: Path, repos: int, rules: int, rng: random.Random) -> list[str]:
+    names = [f"svc-{i:03d}" for i in range(repos)]
+    lines = ["workspace:", f"  name: {root.name}", f"  root: {root}", "  version: 1.0.0", "", "repos:"]
+    for i, name in enumerate(names):
+        lines += [f"  - name: {name}", f"    path: ./{name}", f"    require_jira: {'true' if i % 3 == 0 else 'false'}"]
+    lines += ["", "conventions:", "  prefix_rules:"]
+    for i in range(rules // 2):
+        lines.append(f"    {rng.choice(WORDS)}{i}-: [{', '.join(rng.sample(names, 2))}]")
+    lines += ["", "  suffix_rules:"]
+    for i in range(rules - rules // 2):
+        lines.append(f"    -{rng.choice(WORDS)}{i}: [{rng.choice(names)}]")
+    lines += ["", "  defaults:", "    ambiguous_prompt: true", "    default_repo: null"]
+    (root / ".specify").mkdir()
+    (root / ".specify" / "workspace.yml").write_text("\n".join(lines) + "\n")
+    # Old enough that the snapshot is trusted right away
+    old = time.time() - 60
+    os.utime(root / ".specify" / "workspace.yml", (old, old))
+    return names
+
+
+def linear_route(config: dict, spec_id: str) -> list[str]:
+    jira = JIRA_PREFIX_RE.match(spec_id)
+    name = jira.group(1) if jira else spec_id
+    matched = set()
+    for pattern, targets in config["prefix_rules"]:
+        if name.startswith(pattern):
+            matched.update(targets)
+    for pattern, targets in config["suffix_rules"]:
+        if name.endswith(pattern):
+            matched.update(targets)
+    return sorted(matched)
+
+
+def timed(fn, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=500, help="Prefix + suffix rules (default: 500)")
+    parser.add_argument("--repos", type=int, default=40, help="Repos in workspace.yml (default: 40)")
+    parser.add_argument("--specs", type=int, default=2000, help="Spec IDs to route (default: 2000)")
+    parser.add_argument("--runs", type=int, default=9, help="Runs per load measurement (default: 9)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_ROUTE_BUDGET_MS, help=f"Median route budget in ms (default: {DEFAULT_ROUTE_BUDGET_MS})")
+    parser.add_argument("--load-budget-ms", type=float, default=DEFAULT_LOAD_BUDGET_MS, help=f"Median snapshot load budget in ms (default: {DEFAULT_LOAD_BUDGET_MS})")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory(prefix="specify-route-bench-") as tmp:
+        root = Path(tmp)
+        make_workspace(root, args.repos, args.rules, rng)
+        snapshot = root / ".specify" / "cache" / "workspace.json"
+
+        def cold_load():
+            snapshot.unlink(missing_ok=True)
+            return WorkspaceRouter.load(root)
+
+        cold = timed(cold_load, args.runs)
+        warm = timed(lambda: WorkspaceRouter.load(root), args.runs)
+        router = WorkspaceRouter.load(root)
+
+        specs = [
+            f"{'proj-%d.' % rng.randint(1, 999) if rng.random() < 0.5 else ''}"
+            f"{rng.choice(WORDS)}{rng.randint(0, args.rules)}-{rng.choice(WORDS)}-{rng.choice(WORDS)}{rng.randint(0, args.rules)}"
+            for _ in range(args.specs)
+        ]
+        route_samples = []
+        mismatches = []
+        for spec_id in specs:
+            start = time.perf_counter()
+            result = router.route(spec_id)
+            route_samples.append((time.perf_counter() - start) * 1000)
+            expected = linear_route(router.config, spec_id)
+            if [repo["name"] for repo in result["repos"]] != (expected or list(router.repos)):
+                mismatches.append(spec_id)
+        matched = sum(1 for spec_id in specs if router.matched_repos(spec_id))
+
+    results = {
+        "rules": args.rules,
+        "repos": args.repos,
+        "specs": args.specs,
+        "specs_matched": matched,
+        "cold_load_ms": {"median": statistics.median(cold), "min": min(cold), "max": max(cold)},
+        "warm_load_ms": {"median": statistics.median(warm), "min": min(warm), "max": max(warm)},
+        "route_ms": {"median": statistics.median(route_samples), "p99": sorted(route_samples)[int(len(route_samples) * 0.99)], "max": max(route_samples)},
+        "route_budget_ms": args.budget_ms,
+        "load_budget_ms": args.load_budget_ms,
+        "mismatches": mismatches[:10],
+    }
+    failures = []
+    if mismatches:
+        failures.append(f"{len(mismatches)} routes differ from a linear rule scan (e.g. {mismatches[0]})")
+    if results["route_ms"]["median"] > args.budget_ms:
+        failures.append(f"route median {results['route_ms']['median']:.3f} ms > budget {args.budget_ms:.3f} ms")
+    if results["warm_load_ms"]["median"] > args.load_budget_ms:
+        failures.append(f"snapshot load median {results['warm_load_ms']['median']:.1f} ms > budget {args.load_budget_ms:.1f} ms")
+    results["passed"] = not failures
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"workspace          : {args.repos} repos, {args.rules} rules, {matched}/{args.specs} specs matched a rule")
+        print(f"cold load (parse)  : median {results['cold_load_ms']['median']:8.3f} ms")
+        print(f"warm load (cache)  : median {results['warm_load_ms']['median']:8.3f} ms (budget {args.load_budget_ms:.0f} ms)")
+        print(f"route              : median {results['route_ms']['median']:8.4f} ms, p99 {results['route_ms']['p99']:.4f} ms (budget {args.budget_ms:.1f} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
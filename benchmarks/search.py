@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Search index budget check for ``specify search``.
+
+Generates throwaway spec corpora of increasing size (features with spec.md,
+plan.md, tasks.md and research.md full of requirement and task IDs, a share
+of them packed into archive/*.zip) and measures in-process:
+
+- building the index from scratch (cold)
+- refreshing an unchanged tree (warm), a full rescan that stats every
+  file, and a refresh after a few files were saved (replaced) by an editor
+- querying rare terms that occur in the same number of documents at every
+  corpus size, plus requirement IDs and common words
+- a refresh followed by a rare-term query: what `specify search` runs
+
+Rare-term results are checked against a plain scan of every file (what a
+grep over specs/ and archive/ does, also timed), and every saved file must
+be re-indexed. The check fails when the median rare-term query, or the
+median refresh + query, exceeds its budget, or when the query grows by
+more than --flat-ratio from the smallest to the largest corpus. (A refresh
+stats every directory, one per feature, so it is held to the budget rather
+than to the ratio.)
+
+Usage:
+    python benchmarks/search.py
+    python benchmarks/search.py --features 500,5000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from specify_cli import SearchIndex, pack_feature  # noqa: E402
+
+DEFAULT_QUERY_BUDGET_MS = 10.0
+DEFAULT_SEARCH_BUDGET_MS = 50.0
+DEFAULT_FLAT_RATIO = 3.0
+NEEDLES = 20
+NEEDLE_DOCS = 5
+ARTIFACTS = ("spec.md", "plan.md", "tasks.md", "research.md")
+
+
+def make_vocabulary(rng: random.Random, size: int = 4000) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+        for _ in range(size)
+    ]
+
+
+def paragraph(rng: random.Random, vocab: list[str], words: int) -> str:
+    # Zipf-like: low indexes are common words, the tail is rare
+    return " ".join(vocab[min(int(rng.paretovariate(1.1)) - 1, len(vocab) - 1)] for _ in range(words))
+
+
+def make_document(rng: random.Random, vocab: list[str], feature_id: str, artifact: str) -> str:
+    lines = [f"# {artifact.removesuffix('.md').title()}: {feature_id}", ""]
+    for section in range(rng.randint(3, 6)):
+        lines += [f"## {paragraph(rng, vocab, 3).title()}", "", paragraph(rng, vocab, rng.randint(40, 120)), ""]
+        if artifact == "spec.md":
+            lines += [f"- **FR-{section * 5 + i + 1:03d}**: System MUST {paragraph(rng, vocab, 12)}" for i in range(5)]
+        elif artifact == "tasks.md":
+            lines += [f"- [x] T{section * 6 + i + 1:03d} {paragraph(rng, vocab, 10)}" for i in range(6)]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def make_corpus(root: Path, features: int, archived: float, rng: random.Random) -> list[Path]:
+    """Write the corpus, plant each needle in NEEDLE_DOCS documents and pack a share of the features."""
+    vocab = make_vocabulary(random.Random(0))
+    docs = []
+    for i in range(features):
+        feature_id = f"proj-{i}.{vocab[i % 200]}-{vocab[(i * 7) % 300]}"
+        feature_dir = root / "specs" / feature_id
+        feature_dir.mkdir(parents=True)
+        for artifact in ARTIFACTS:
+            path = feature_dir / artifact
+            path.write_text(make_document(rng, vocab, feature_id, artifact), encoding="utf-8")
+            docs.append(path)
+    for n in range(NEEDLES):
+        for path in rng.sample(docs, NEEDLE_DOCS):
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(f"\nDecision: adopt zqneedle{n} for this feature.\n")
+    packed = rng.sample(sorted({path.parent.name for path in docs}), int(features * archived))
+    for feature_id in packed:
+        pack_feature(root, feature_id, timestamp="20260101-000000")
+    return docs
+
+
+def naive_scan(root: Path, word: str) -> set[str]:
+    """What grep -rlw does over specs/ and archive/, zips included."""
+    pattern = re.compile(rf"\b{re.escape(word)}\b", re.IGNORECASE)
+    found = set()
+    for path in (root / "specs").rglob("*.md"):
+        if pattern.search(path.read_text(encoding="utf-8")):
+            found.add(path.relative_to(root).as_posix())
+    for archive in (root / "archive").glob("*.zip"):
+        with zipfile.ZipFile(archive) as zf:
+            for name in zf.namelist():
+                if name.endswith(".md") and pattern.search(zf.read(name).decode("utf-8")):
+                    found.add(f"archive/{archive.name}:{name}")
+    return found
+
+
+def timed(fn, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(samples: list[float]) -> dict:
+    return {"median": statistics.median(samples), "min": min(samples), "max": max(samples)}
+
+
+def run_corpus(features: int, archived: float, runs: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory(prefix="specify-search-bench-") as tmp:
+        root = Path(tmp)
+        docs = make_corpus(root, features, archived, rng)
+
+        start = time.perf_counter()
+        index = SearchIndex(root)
+        counts = index.refresh()
+        cold_ms = (time.perf_counter() - start) * 1000
+        # Let the racy-mtime window pass so the warm refresh trusts the recorded stat data
+        time.sleep(2.1)
+        index.refresh()
+        warm = timed(index.refresh, runs)
+        rescan = timed(lambda: index.refresh(full=True), runs)
+
+        edited = [path for path in docs if path.exists()][:10]
+        for path in edited:
+            # Saved the way editors and git write files: a new file renamed over the old one
+            tmp_path = path.with_name(f".{path.name}.swp")
+            tmp_path.write_text(path.read_text(encoding="utf-8") + "\nEdited after indexing.\n", encoding="utf-8")
+            tmp_path.replace(path)
+        start = time.perf_counter()
+        edit_counts = index.refresh()
+        edit_ms = (time.perf_counter() - start) * 1000
+
+        mismatches = []
+        rare = []
+        for n in range(NEEDLES):
+            word = f"zqneedle{n}"
+            got = {result["path"] for result in index.search(word, limit=NEEDLE_DOCS * 2)}
+            if got != naive_scan(root, word):
+                mismatches.append(word)
+            rare += timed(lambda: index.search(word), runs)
+        ids = []
+        for n in (1, 7, 13):
+            ids += timed(lambda: index.search(f"FR-{n:03d}"), runs)
+        common = timed(lambda: index.search("decision feature"), runs)
+        searches = []
+        for n in range(NEEDLES):
+            searches += timed(lambda: (index.refresh(), index.search(f"zqneedle{n}")), runs)
+        scan = timed(lambda: naive_scan(root, "zqneedle0"), 1)
+        index.close()
+
+    return {
+        "features": features,
+        "documents": counts["documents"],
+        "cold_build_ms": cold_ms,
+        "warm_refresh_ms": summary(warm),
+        "full_rescan_ms": summary(rescan),
+        "edit_refresh_ms": edit_ms,
+        "edited": len(edited),
+        "edit_indexed": edit_counts["indexed"],
+        "rare_query_ms": summary(rare),
+        "id_query_ms": summary(ids),
+        "common_query_ms": summary(common),
+        "search_ms": summary(searches),
+        "naive_scan_ms": scan[0],
+        "mismatches": mismatches,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", default="500,5000", help=f"Comma-separated corpus sizes in features, {len(ARTIFACTS)} documents each (default: 500,5000)")
+    parser.add_argument("--archived", type=float, default=0.1, help="Share of features packed into archive/*.zip (default: 0.1)")
+    parser.add_argument("--runs", type=int, default=9, help="Runs per measurement (default: 9)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed (default: 0)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_QUERY_BUDGET_MS, help=f"Median rare-term query budget in ms (default: {DEFAULT_QUERY_BUDGET_MS})")
+    parser.add_argument("--search-budget-ms", type=float, default=DEFAULT_SEARCH_BUDGET_MS, help=f"Median refresh + rare-term query budget in ms (default: {DEFAULT_SEARCH_BUDGET_MS})")
+    parser.add_argument("--flat-ratio", type=float, default=DEFAULT_FLAT_RATIO, help=f"Allowed growth of the median rare-term query from the smallest to the largest corpus (default: {DEFAULT_FLAT_RATIO})")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.features.split(","))
+    corpora = [run_corpus(size, args.archived, args.runs, args.seed) for size in sizes]
+    failures = []
+    for corpus in corpora:
+        if corpus["mismatches"]:
+            failures.append(f"{corpus['documents']:,} documents: results for {', '.join(corpus['mismatches'])} differ from a plain scan")
+        if corpus["edit_indexed"] != corpus["edited"]:
+            failures.append(f"{corpus['documents']:,} documents: refresh re-indexed {corpus['edit_indexed']} of {corpus['edited']} saved files")
+        if corpus["rare_query_ms"]["median"] > args.budget_ms:
+            failures.append(f"{corpus['documents']:,} documents: rare-term query median {corpus['rare_query_ms']['median']:.2f} ms > budget {args.budget_ms:.2f} ms")
+        if corpus["search_ms"]["median"] > args.search_budget_ms:
+            failures.append(f"{corpus['documents']:,} documents: refresh + query median {corpus['search_ms']['median']:.2f} ms > budget {args.search_budget_ms:.2f} ms")
+    ratio = corpora[-1]["rare_query_ms"]["median"] / max(corpora[0]["rare_query_ms"]["median"], 1e-6)
+    if len(corpora) > 1 and ratio > args.flat_ratio:
+        failures.append(f"rare-term query median grew {ratio:.1f}x from {corpora[0]['documents']:,} to {corpora[-1]['documents']:,} documents (allowed {args.flat_ratio:.1f}x)")
+    results = {
+        "corpora": corpora,
+        "rare_query_growth": ratio,
+        "budget_ms": args.budget_ms,
+        "search_budget_ms": args.search_budget_ms,
+        "flat_ratio": args.flat_ratio,
+        "passed": not failures,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for corpus in corpora:
+            print(f"{corpus['documents']:,} documents ({corpus['features']:,} features)")
+            print(f"  cold build       : {corpus['cold_build_ms']:9.0f} ms")
+            print(f"  warm refresh     : median {corpus['warm_refresh_ms']['median']:8.1f} ms")
+            print(f"  full rescan      : median {corpus['full_rescan_ms']['median']:8.1f} ms")
+            print(f"  {corpus['edited']} files saved   : {corpus['edit_refresh_ms']:9.1f} ms ({corpus['edit_indexed']} re-indexed)")
+            print(f"  rare-term query  : median {corpus['rare_query_ms']['median']:8.2f} ms (budget {args.budget_ms:.0f} ms)")
+            print(f"  ID query         : median {corpus['id_query_ms']['median']:8.2f} ms")
+            print(f"  common words     : median {corpus['common_query_ms']['median']:8.2f} ms")
+            print(f"  refresh + query  : median {corpus['search_ms']['median']:8.2f} ms (budget {args.search_budget_ms:.0f} ms)")
+            print(f"  plain scan       : {corpus['naive_scan_ms']:9.0f} ms")
+        print(f"rare-term query growth: {ratio:.2f}x (allowed {args.flat_ratio:.1f}x)")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Startup-time budget check for the specify CLI.
+
+Runs ``python -X importtime -c "import specify_cli"`` in fresh interpreters,
+takes the median cumulative import time of ``specify_cli`` and fails when it
+exceeds the budget. It also times ``specify --help`` end to end and fails if
+any module that must stay lazy (httpx, truststore, readchar, ...) is imported
+at startup.
+
+Usage:
+    python benchmarks/startup.py                # check against the default budget
+    python benchmarks/startup.py --budget-ms 80 --runs 15 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_ROOT / "src"
+
+# Median cumulative `import specify_cli` time allowed (-X importtime reports microseconds)
+DEFAULT_IMPORT_BUDGET_MS = 120.0
+DEFAULT_HELP_BUDGET_MS = 400.0
+
+# Modules that only specific commands need; importing specify_cli must not pull them in
+LAZY_MODULES = [
+    "httpx",
+    "truststore",
+    "ssl",
+    "readchar",
+    "platformdirs",
+    "rich.live",
+    "rich.progress",
+    "rich.table",
+    "sqlite3",
+]
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def measure_import_ms() -> float:
+    """Return the cumulative import time of specify_cli in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import specify_cli"],
+        capture_output=True, text=True, env=_env(), check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "specify_cli":
+            return int(parts[1]) / 1000
+    raise RuntimeError("specify_cli not found in -X importtime output")
+
+
+def measure_help_ms() -> float:
+    """Return the wall time of `specify --help` in a fresh interpreter."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import sys; from specify_cli import main; sys.argv = ['specify', '--help']; main()"],
+        capture_output=True, env=_env(), check=True,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def eagerly_imported() -> list[str]:
+    code = (
+        "import sys, json, specify_cli; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=_env(), check=True)
+    return json.loads(result.stdout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=9, help="Fresh interpreters per measurement (default: 9)")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("SPECIFY_IMPORT_BUDGET_MS", DEFAULT_IMPORT_BUDGET_MS)),
+                        help=f"Median import budget in ms (default: {DEFAULT_IMPORT_BUDGET_MS})")
+    parser.add_argument("--help-budget-ms", type=float, default=float(os.getenv("SPECIFY_HELP_BUDGET_MS", DEFAULT_HELP_BUDGET_MS)),
+                        help=f"Median `specify --help` budget in ms (default: {DEFAULT_HELP_BUDGET_MS})")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    # Warm the filesystem cache / bytecode once so runs are comparable
+    measure_import_ms()
+
+    import_samples = [measure_import_ms() for _ in range(args.runs)]
+    help_samples = [measure_help_ms() for _ in range(args.runs)]
+    eager = eagerly_imported()
+
+    results = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_ms": {"median": statistics.median(import_samples), "min": min(import_samples), "max": max(import_samples)},
+        "help_ms": {"median": statistics.median(help_samples), "min": min(help_samples), "max": max(help_samples)},
+        "import_budget_ms": args.budget_ms,
+        "help_budget_ms": args.help_budget_ms,
+        "eager_imports": eager,
+    }
+    failures = []
+    if results["import_ms"]["median"] > args.budget_ms:
+        failures.append(f"import specify_cli median {results['import_ms']['median']:.1f} ms > budget {args.budget_ms:.1f} ms")
+    if results["help_ms"]["median"] > args.help_budget_ms:
+        failures.append(f"specify --help median {results['help_ms']['median']:.1f} ms > budget {args.help_budget_ms:.1f} ms")
+    if eager:
+        failures.append(f"modules imported eagerly: {', '.join(eager)}")
+    results["passed"] = not failures
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"import specify_cli : median {results['import_ms']['median']:7.1f} ms (budget {args.budget_ms:.0f} ms)")
+        print(f"specify --help     : median {results['help_ms']['median']:7.1f} ms (budget {args.help_budget_ms:.0f} ms)")
+        print(f"eager heavy imports: {', '.join(eager) or 'none'}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
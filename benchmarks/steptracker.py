@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for StepTracker updates under a Live-style refresh loop.
+
+Adds many child steps (one per "file", as per-file extract/chmod progress
+would) under a few parent steps, then starts and completes each one while a
+background thread calls render() at Live's 8 Hz refresh rate. Reports the
+cost per update and how many tree rebuilds actually happened, and fails when
+the median cost per update exceeds the budget.
+
+For comparison the same workload (scaled down, it is quadratic) runs against
+a replica of the previous tracker: list scans for every add/update and a
+synchronous full re-render on each change.
+
+Usage:
+    python benchmarks/steptracker.py
+    python benchmarks/steptracker.py --steps 50000 --legacy-steps 1000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from rich.tree import Tree  # noqa: E402
+
+from specify_cli import StepTracker  # noqa: E402
+
+DEFAULT_UPDATE_BUDGET_US = 20.0
+REFRESH_PER_SECOND = 8
+PARENTS = ("extract", "chmod", "git")
+
+
+class LegacyTracker:
+    """The list-based tracker with a synchronous refresh callback, as it was before indexing."""
+
+    def __init__(self, title: str):
+        self.title = title
+        self.steps = []
+        self._refresh_cb = None
+
+    def add(self, key: str, label: str):
+        if key not in [s["key"] for s in self.steps]:
+            self.steps.append({"key": key, "label": label, "status": "pending", "detail": ""})
+            self._maybe_refresh()
+
+    def start(self, key: str, detail: str = ""):
+        self._update(key, "running", detail)
+
+    def complete(self, key: str, detail: str = ""):
+        self._update(key, "done", detail)
+
+    def _update(self, key: str, status: str, detail: str):
+        for s in self.steps:
+            if s["key"] == key:
+                s["status"] = status
+                if detail:
+                    s["detail"] = detail
+                self._maybe_refresh()
+                return
+        self.steps.append({"key": key, "label": key, "status": status, "detail": detail})
+        self._maybe_refresh()
+
+    def _maybe_refresh(self):
+        if self._refresh_cb:
+            self._refresh_cb()
+
+    def render(self):
+        tree = Tree(self.title)
+        for step in self.steps:
+            tree.add(f"{step['label']} ({step['detail']})" if step["detail"] else step["label"])
+        return tree
+
+
+class Ticker(threading.Thread):
+    """Calls render() at the Live refresh rate until stopped, like rich.live.Live's refresh thread."""
+
+    def __init__(self, render):
+        super().__init__(daemon=True)
+        self.render = render
+        self.calls = 0
+        self.stop = threading.Event()
+
+    def run(self):
+        # Live renders once on start, then on every tick
+        while True:
+            self.render()
+            self.calls += 1
+            if self.stop.wait(1 / REFRESH_PER_SECOND):
+                return
+
+
+def run_indexed(steps: int) -> dict:
+    tracker = StepTracker("benchmark")
+    rebuilds = 0
+    original = tracker.render
+
+    def counting_render():
+        nonlocal rebuilds
+        rebuilds += tracker._dirty
+        return original()
+
+    ticker = Ticker(counting_render)
+    ticker.start()
+    samples = []
+    start = time.perf_counter()
+    for parent in PARENTS:
+        tracker.add(parent, parent)
+        tracker.start(parent)
+    for i in range(steps):
+        parent = PARENTS[i % len(PARENTS)]
+        key = f"{parent}:{i}"
+        t0 = time.perf_counter_ns()
+        tracker.add(key, f"file-{i}.md", parent=parent)
+        tracker.start(key)
+        tracker.complete(key, "ok")
+        samples.append((time.perf_counter_ns() - t0) / 3)
+    for parent in PARENTS:
+        tracker.complete(parent)
+    elapsed = time.perf_counter() - start
+    ticker.stop.set()
+    ticker.join()
+    render_start = time.perf_counter()
+    tracker.render()
+    final_render = time.perf_counter() - render_start
+    return {
+        "steps": steps,
+        "updates": steps * 3,
+        "seconds": elapsed,
+        "update_us": {"median": statistics.median(samples) / 1000, "p99": sorted(samples)[int(len(samples) * 0.99)] / 1000},
+        "ticks": ticker.calls,
+        "rebuilds": rebuilds,
+        "final_render_ms": final_render * 1000,
+    }
+
+
+def run_legacy(steps: int) -> dict:
+    tracker = LegacyTracker("benchmark")
+    renders = 0
+
+    def refresh():
+        nonlocal renders
+        tracker.render()
+        renders += 1
+
+    tracker._refresh_cb = refresh
+    start = time.perf_counter()
+    for i in range(steps):
+        key = f"step:{i}"
+        tracker.add(key, f"file-{i}.md")
+        tracker.start(key)
+        tracker.complete(key, "ok")
+    elapsed = time.perf_counter() - start
+    return {"steps": steps, "updates": steps * 3, "seconds": elapsed, "update_us": {"mean": elapsed / (steps * 3) * 1e6}, "rebuilds": renders}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=20000, help="Child steps for the indexed tracker (default: 20000)")
+    parser.add_argument("--legacy-steps", type=int, default=1000, help="Steps for the legacy replica, 0 to skip (default: 1000)")
+    parser.add_argument("--budget-us", type=float, default=DEFAULT_UPDATE_BUDGET_US, help=f"Median cost per update in microseconds (default: {DEFAULT_UPDATE_BUDGET_US})")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    results = {"indexed": run_indexed(args.steps), "budget_us": args.budget_us}
+    if args.legacy_steps:
+        results["legacy"] = run_legacy(args.legacy_steps)
+    indexed = results["indexed"]
+    failures = []
+    if indexed["update_us"]["median"] > args.budget_us:
+        failures.append(f"median update {indexed['update_us']['median']:.2f} us > budget {args.budget_us:.2f} us")
+    results["passed"] = not failures
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"indexed: {indexed['updates']:,} updates in {indexed['seconds'] * 1000:.0f} ms, "
+              f"median {indexed['update_us']['median']:.2f} us, p99 {indexed['update_us']['p99']:.2f} us per update; "
+              f"{indexed['rebuilds']} tree rebuilds over {indexed['ticks']} refresh ticks; "
+              f"final render of {indexed['steps'] + len(PARENTS):,} steps {indexed['final_render_ms']:.0f} ms")
+        if "legacy" in results:
+            legacy = results["legacy"]
+            print(f"legacy : {legacy['updates']:,} updates in {legacy['seconds'] * 1000:.0f} ms, "
+                  f"mean {legacy['update_us']['mean']:.0f} us per update; {legacy['rebuilds']:,} tree rebuilds")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
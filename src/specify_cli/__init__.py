@@ -22,6 +22,9 @@ Or install globally:
     specify init --here
 """
 
+from __future__ import annotations
+
+import io
 import os
 import re
 import subprocess
@@ -30,29 +33,30 @@ import zipfile
 import tempfile
 import shutil
 import json
+import hashlib
+import importlib.util
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Optional, Tuple
-from importlib.resources import files
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional, Tuple
 
 import typer
-import httpx
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.text import Text
-from rich.live import Live
 from rich.align import Align
-from rich.table import Table
 from rich.tree import Tree
 from typer.core import TyperGroup
 
-# For cross-platform keyboard input
-import readchar
-import ssl
-import truststore
-
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-client = httpx.Client(verify=ssl_context)
+# Heavier dependencies (httpx, truststore, readchar, rich.live/progress/table,
+# platformdirs) are imported inside the functions that need them so that
+# `specify --help` and `specify check` stay fast. No network objects are
+# created at import time.
+if TYPE_CHECKING:
+    import httpx
 
 # Constants
 AI_CHOICES = {
@@ -64,6 +68,52 @@ AI_CHOICES = {
 # Add script type choices
 SCRIPT_TYPE_CHOICES = {"sh": "POSIX Shell (bash/zsh)", "ps": "PowerShell"}
 
+# GitHub endpoints (overridable to point at a mirror or a local stand-in server)
+GITHUB_URL = os.getenv("SPECIFY_GITHUB_URL", "https://github.com").rstrip("/")
+GITHUB_API_URL = os.getenv("SPECIFY_GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+# HTTP transport tuning (retries and chunk size can be overridden via SPECIFY_HTTP_RETRIES / SPECIFY_DOWNLOAD_CHUNK_SIZE)
+HTTP_TIMEOUT = 60.0
+HTTP_CONNECT_TIMEOUT = 10.0
+HTTP_MAX_CONNECTIONS = 10
+HTTP_RETRIES = 4
+HTTP_BACKOFF_BASE = 0.5
+HTTP_BACKOFF_MAX = 30.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Template cache size cap before least-recently-used archives are evicted
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Downloads without a cache stay in memory up to this size before spilling to a private temp file
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+# Only extract spec-kit's user-facing assets
+# Include both packaged (.spec-kit, .claude) and raw branch (memory, scripts, templates) structures
+ALLOWED_PATHS = {'.spec-kit', '.claude', 'specs', 'CONSTITUTION.md', 'memory', 'scripts', 'templates'}
+# Release and mirror packages (`specify build-templates`) are already laid out for a project:
+# .specify/{memory,scripts,templates}, each assistant's command directory and GEMINI.md
+RELEASE_PATHS = ('.specify', '.claude', '.gemini', '.github/prompts', '.cursor', 'GEMINI.md')
+# Assistant directories that template files are merged into rather than replacing (they hold user settings too)
+MERGED_PATHS = {'.claude', '.gemini', '.github/prompts', '.cursor'}
+
+# Per-variant script directories in raw branch archives (scripts/<dir>/)
+SCRIPT_VARIANT_DIRS = {"sh": "bash", "ps": "powershell"}
+
+# How init materializes template files: stream them out of the archive ("copy"),
+# reflink-clone them from an unpacked cache ("reflink"), or additionally hardlink
+# read-only assets to the cache ("hardlink")
+LINK_MODES = ("copy", "reflink", "hardlink")
+# Template assets that are never edited in place, so hardlink mode may share them with the cache
+HARDLINK_PREFIXES = ("templates/", ".specify/templates/")
+# linux/fs.h FICLONE ioctl
+FICLONE = 0x40049409
+# st_dev of filesystems that rejected FICLONE
+_reflink_unsupported: set[int] = set()
+
+# A selected archive member: (archive, member info, name relative to the archive root)
+ArchiveMember = Tuple[zipfile.ZipFile, zipfile.ZipInfo, str]
+
 # Claude CLI local installation path after migrate-installer
 CLAUDE_LOCAL_PATH = Path.home() / ".claude" / "local" / "claude"
 
@@ -78,92 +128,249 @@ BANNER = """
 """
 
 TAGLINE = "Spec-Driven Development Toolkit"
-class StepTracker:
-    """Track and render hierarchical steps without emojis, similar to Claude Code tree output.
-    Supports live auto-refresh via an attached refresh callback.
+class Tracer:
+    """Collects timed spans and exports them in Chrome trace event format.
+
+    Spans are complete ("X") events with microsecond timestamps relative to
+    the tracer's creation, one track per thread, so spans opened inside a
+    step nest under it in chrome://tracing or Perfetto.
     """
-    def __init__(self, title: str):
-        self.title = title
-        self.steps = []  # list of dicts: {key, label, status, detail}
-        self.status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
-        self._refresh_cb = None  # callable to trigger UI refresh
 
-    def attach_refresh(self, cb):
-        self._refresh_cb = cb
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        self.events: list[dict] = []
+        self.threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, cat: str, start_ns: int, end_ns: int, tid: int | None = None, **args) -> None:
+        thread = threading.current_thread()
+        tid = thread.ident if tid is None else tid
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self.origin_ns) / 1000,
+            "dur": max(end_ns - start_ns, 0) / 1000,
+            "pid": os.getpid(),
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            self.threads.setdefault(tid, thread.name if thread.ident == tid else f"Thread-{tid}")
+
+    def chrome_trace(self) -> dict:
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in self.threads.items()
+        ]
+        return {"traceEvents": metadata + sorted(self.events, key=lambda e: (e["ts"], -e["dur"])), "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(), indent=1), encoding="utf-8")
+
+
+_tracer: Tracer | None = None  # active while --timings / --trace-file is in effect
+TIMINGS_TOP_SPANS = 10
+
+
+@contextmanager
+def trace_span(name: str, cat: str, **args):
+    """Record the enclosed block as a span when tracing is on.
+
+    Yields a dict the block can add args to (status codes, byte counts); it
+    is discarded when no tracer is active, so call sites need no checks.
+    """
+    tracer = _tracer
+    start_ns = time.perf_counter_ns()
+    try:
+        yield args
+    finally:
+        if tracer is not None:
+            tracer.add(name, cat, start_ns, time.perf_counter_ns(), **args)
 
-    def add(self, key: str, label: str):
-        if key not in [s["key"] for s in self.steps]:
-            self.steps.append({"key": key, "label": label, "status": "pending", "detail": ""})
-            self._maybe_refresh()
 
-    def start(self, key: str, detail: str = ""):
-        self._update(key, status="running", detail=detail)
+def start_tracing(timings: bool = False) -> Tracer:
+    """Activate span collection (and step durations in trees with timings)."""
+    global _tracer
+    _tracer = Tracer()
+    StepTracker.show_timings = timings
+    return _tracer
 
-    def complete(self, key: str, detail: str = ""):
-        self._update(key, status="done", detail=detail)
 
-    def error(self, key: str, detail: str = ""):
-        self._update(key, status="error", detail=detail)
+def finish_tracing(command: str, trace_file: Path | None, timings: bool) -> None:
+    """Stop tracing; write the Chrome trace and/or print the slowest spans."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+    tracer.add(command, "command", tracer.origin_ns, time.perf_counter_ns(), tid=threading.main_thread().ident)
+    if trace_file:
+        tracer.write(trace_file)
+        console.print(f"[dim]Trace written to {trace_file} ({len(tracer.events)} spans)[/dim]")
+    if timings:
+        from rich.table import Table
+
+        totals: dict[tuple[str, str], list[float]] = {}
+        for event in tracer.events:
+            if event["cat"] in ("http", "subprocess"):
+                totals.setdefault((event["cat"], event["name"]), []).append(event["dur"] / 1e6)
+        total = next(e["dur"] for e in tracer.events if e["cat"] == "command") / 1e6
+        table = Table(title=f"Timings ({format_duration(total)} total)", show_header=True, header_style="cyan", box=None, padding=(0, 2))
+        table.add_column("Kind")
+        table.add_column("Call", overflow="fold")
+        table.add_column("Count", justify="right")
+        table.add_column("Total", justify="right")
+        table.add_column("Max", justify="right")
+        for (cat, name), durations in sorted(totals.items(), key=lambda item: -sum(item[1]))[:TIMINGS_TOP_SPANS]:
+            table.add_row(cat, name, str(len(durations)), format_duration(sum(durations)), format_duration(max(durations)))
+        console.print(table)
+
+
+def format_duration(seconds: float) -> str:
+    return f"{seconds:.2f}s" if seconds >= 1 else f"{seconds * 1000:.0f} ms"
 
-    def skip(self, key: str, detail: str = ""):
-        self._update(key, status="skipped", detail=detail)
 
-    def _update(self, key: str, status: str, detail: str):
-        for s in self.steps:
-            if s["key"] == key:
-                s["status"] = status
-                if detail:
-                    s["detail"] = detail
-                self._maybe_refresh()
-                return
-        # If not present, add it
-        self.steps.append({"key": key, "label": key, "status": status, "detail": detail})
-        self._maybe_refresh()
+class StepTracker:
+    """Track and render hierarchical steps without emojis, similar to Claude Code tree output.
 
-    def _maybe_refresh(self):
-        if self._refresh_cb:
-            try:
-                self._refresh_cb()
-            except Exception:
-                pass
+    Steps are indexed by key, so add/update cost O(1) however many steps (or
+    per-file child steps) a run records. Updates only mark the tracker dirty;
+    render() rebuilds the tree at most once per change batch, so a Live
+    display polling it through get_renderable coalesces any number of updates
+    into its refresh tick.
 
-    def render(self):
-        tree = Tree(f"[bold cyan]{self.title}[/bold cyan]", guide_style="grey50")
-        for step in self.steps:
-            label = step["label"]
-            detail_text = step["detail"].strip() if step["detail"] else ""
-
-            # Circles (unchanged styling)
-            status = step["status"]
-            if status == "done":
-                symbol = "[green]●[/green]"
-            elif status == "pending":
-                symbol = "[green dim]○[/green dim]"
-            elif status == "running":
-                symbol = "[cyan]○[/cyan]"
-            elif status == "error":
-                symbol = "[red]●[/red]"
-            elif status == "skipped":
-                symbol = "[yellow]○[/yellow]"
-            else:
-                symbol = " "
+    Each step records monotonic start/end times (perf_counter_ns) when it
+    starts running and when it finishes; finished steps are also reported to
+    the active Tracer. show_timings adds the durations to the rendered tree.
+    """
+    show_timings = False  # set by `specify init --timings`
 
-            if status == "pending":
-                # Entire line light gray (pending)
-                if detail_text:
-                    line = f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [bright_black]{label}[/bright_black]"
-            else:
-                # Label white, detail (if any) light gray in parentheses
-                if detail_text:
-                    line = f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [white]{label}[/white]"
+    def __init__(self, title: str):
+        self.title = title
+        self.steps = []  # top-level step dicts: {key, label, status, detail, start_ns, end_ns, tid, children}
+        self.status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
+        self._index: dict[str, dict] = {}  # key -> step, at any depth
+        self._lock = threading.RLock()
+        self._dirty = True
+        self._tree = None
+
+    def add(self, key: str, label: str, parent: str | None = None):
+        """Add a pending step (a child of parent when given); existing keys are left alone."""
+        with self._lock:
+            if key in self._index:
+                return
+            self._insert(key, label, "pending", parent)
+
+    def _insert(self, key: str, label: str, status: str, parent: str | None) -> dict:
+        step = {"key": key, "label": label, "status": status, "detail": "", "start_ns": None, "end_ns": None, "tid": None, "children": [], "line": None}
+        siblings = self._index[parent]["children"] if parent in self._index else self.steps
+        siblings.append(step)
+        self._index[key] = step
+        self._dirty = True
+        return step
+
+    def start(self, key: str, detail: str = "", parent: str | None = None):
+        self._update(key, status="running", detail=detail, parent=parent)
+
+    def complete(self, key: str, detail: str = "", parent: str | None = None):
+        self._update(key, status="done", detail=detail, parent=parent)
+
+    def error(self, key: str, detail: str = "", parent: str | None = None):
+        self._update(key, status="error", detail=detail, parent=parent)
+
+    def skip(self, key: str, detail: str = "", parent: str | None = None):
+        self._update(key, status="skipped", detail=detail, parent=parent)
+
+    def _update(self, key: str, status: str, detail: str, parent: str | None = None):
+        with self._lock:
+            step = self._index.get(key)
+            if step is None:
+                # If not present, add it
+                step = self._insert(key, key, status, parent)
+            step["status"] = status
+            if detail:
+                step["detail"] = detail
+            now = time.perf_counter_ns()
+            if status == "running":
+                # Restarting a running step only updates its detail
+                if step["start_ns"] is None or step["end_ns"] is not None:
+                    step["start_ns"], step["end_ns"], step["tid"] = now, None, threading.get_ident()
+            elif step["start_ns"] is not None and step["end_ns"] is None:
+                step["end_ns"] = now
+                tracer = _tracer
+                if tracer is not None:
+                    tracer.add(step["label"], "step", step["start_ns"], now, tid=step["tid"], tracker=self.title, status=status, detail=step["detail"])
+            step["line"] = None
+            self._dirty = True
+
+    def get(self, key: str) -> dict | None:
+        return self._index.get(key)
+
+    def iter_steps(self):
+        """Every step, depth first in display order."""
+        stack = list(reversed(self.steps))
+        while stack:
+            step = stack.pop()
+            yield step
+            stack.extend(reversed(step["children"]))
+
+    def duration(self, key: str) -> float | None:
+        """Seconds a step ran (None unless it was started and has finished)."""
+        step = self._index.get(key)
+        if step is None or step["start_ns"] is None or step["end_ns"] is None:
+            return None
+        return (step["end_ns"] - step["start_ns"]) / 1e9
+
+    def _line(self, step: dict) -> str:
+        label = step["label"]
+        detail_text = step["detail"].strip() if step["detail"] else ""
+
+        # Circles (unchanged styling)
+        status = step["status"]
+        if status == "done":
+            symbol = "[green]●[/green]"
+        elif status == "pending":
+            symbol = "[green dim]○[/green dim]"
+        elif status == "running":
+            symbol = "[cyan]○[/cyan]"
+        elif status == "error":
+            symbol = "[red]●[/red]"
+        elif status == "skipped":
+            symbol = "[yellow]○[/yellow]"
+        else:
+            symbol = " "
 
-            tree.add(line)
-        return tree
+        if self.show_timings and step["start_ns"] is not None and step["end_ns"] is not None:
+            label = f"{label} [cyan]{format_duration((step['end_ns'] - step['start_ns']) / 1e9)}[/cyan]"
 
+        if status == "pending":
+            # Entire line light gray (pending)
+            if detail_text:
+                return f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
+            return f"{symbol} [bright_black]{label}[/bright_black]"
+        # Label white, detail (if any) light gray in parentheses
+        if detail_text:
+            return f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
+        return f"{symbol} [white]{label}[/white]"
+
+    def render(self):
+        """The step tree; rebuilt only when a step changed since the last call (unchanged lines are reused)."""
+        with self._lock:
+            if not self._dirty and self._tree is not None:
+                return self._tree
+            tree = Tree(f"[bold cyan]{self.title}[/bold cyan]", guide_style="grey50")
+            stack = [(tree, step) for step in reversed(self.steps)]
+            while stack:
+                node, step = stack.pop()
+                if step["line"] is None:
+                    step["line"] = self._line(step)
+                child = node.add(step["line"])
+                stack.extend((child, sub) for sub in reversed(step["children"]))
+            self._tree, self._dirty = tree, False
+            return tree
 
 
 MINI_BANNER = """
@@ -174,6 +381,8 @@ MINI_BANNER = """
 
 def get_key():
     """Get a single keypress in a cross-platform way using readchar."""
+    import readchar
+
     key = readchar.readkey()
     
     # Arrow keys
@@ -210,6 +419,9 @@ def select_with_arrows(options: dict, prompt_text: str = "Select an option", def
     Returns:
         Selected option key
     """
+    from rich.live import Live
+    from rich.table import Table
+
     option_keys = list(options.keys())
     if default_key and default_key in option_keys:
         selected_index = option_keys.index(default_key)
@@ -324,14 +536,29 @@ def callback(ctx: typer.Context):
         console.print()
 
 
+def traced_run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run recorded as a trace span (with its exit code) when tracing is on."""
+    with trace_span(" ".join(cmd[:2]), "subprocess", argv=cmd) as span:
+        result = None
+        try:
+            result = subprocess.run(cmd, **kwargs)
+            return result
+        except subprocess.CalledProcessError as e:
+            span["returncode"] = e.returncode
+            raise
+        finally:
+            if result is not None:
+                span["returncode"] = result.returncode
+
+
 def run_command(cmd: list[str], check_return: bool = True, capture: bool = False, shell: bool = False) -> Optional[str]:
     """Run a shell command and optionally capture output."""
     try:
         if capture:
-            result = subprocess.run(cmd, check=check_return, capture_output=True, text=True, shell=shell)
+            result = traced_run(cmd, check=check_return, capture_output=True, text=True, shell=shell)
             return result.stdout.strip()
         else:
-            subprocess.run(cmd, check=check_return, shell=shell)
+            traced_run(cmd, check=check_return, shell=shell)
             return None
     except subprocess.CalledProcessError as e:
         if check_return:
@@ -383,7 +610,7 @@ def is_git_repo(path: Path = None) -> bool:
 
     try:
         # Use git command to check if inside a work tree
-        subprocess.run(
+        traced_run(
             ["git", "rev-parse", "--is-inside-work-tree"],
             check=True,
             capture_output=True,
@@ -399,13 +626,12 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> bool:
     quiet: if True suppress console output (tracker handles status)
     """
     try:
-        original_cwd = Path.cwd()
-        os.chdir(project_path)
+        # Run git in project_path rather than chdir-ing, so parallel inits don't race on the process cwd
         if not quiet:
             console.print("[cyan]Initializing git repository...[/cyan]")
-        subprocess.run(["git", "init"], check=True, capture_output=True)
-        subprocess.run(["git", "add", "."], check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True)
+        traced_run(["git", "init"], check=True, capture_output=True, cwd=project_path)
+        traced_run(["git", "add", "."], check=True, capture_output=True, cwd=project_path)
+        traced_run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True, cwd=project_path)
         if not quiet:
             console.print("[green]✓[/green] Git repository initialized")
         return True
@@ -414,66 +640,475 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> bool:
         if not quiet:
             console.print(f"[red]Error initializing git repository:[/red] {e}")
         return False
-    finally:
-        os.chdir(original_cwd)
 
 
-def download_from_branch(ai_assistant: str, download_dir: Path, repo_owner: str, repo_name: str, repo_branch: str, script_type: str, verbose: bool, show_progress: bool, client: httpx.Client, debug: bool) -> Tuple[Path, dict]:
-    """Download template directly from a branch as an archive."""
-    download_url = f"https://github.com/{repo_owner}/{repo_name}/archive/refs/heads/{repo_branch}.zip"
-    filename = f"{repo_name}-{repo_branch}.zip"
-    zip_path = download_dir / filename
+class TransientHTTPError(RuntimeError):
+    """A retryable HTTP status (429 / 5xx) from the server."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def http_retries() -> int:
+    return int(os.getenv("SPECIFY_HTTP_RETRIES", HTTP_RETRIES))
 
-    if verbose:
-        console.print(f"[cyan]Downloading from branch:[/cyan] {repo_branch}")
-        console.print(f"[cyan]URL:[/cyan] {download_url}")
 
+def download_chunk_size() -> int:
+    return int(os.getenv("SPECIFY_DOWNLOAD_CHUNK_SIZE", DOWNLOAD_CHUNK_SIZE))
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Exponential backoff with jitter; honours a server Retry-After when present."""
+    if retry_after is not None:
+        return min(retry_after, HTTP_BACKOFF_MAX)
+    return min(HTTP_BACKOFF_BASE * (2 ** attempt), HTTP_BACKOFF_MAX) + random.uniform(0, HTTP_BACKOFF_BASE)
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after")
     try:
-        with client.stream("GET", download_url, timeout=60, follow_redirects=True) as response:
-            if response.status_code != 200:
-                # Read response content for error message
-                error_content = b"".join(response.iter_bytes(chunk_size=1024))
-                body_sample = error_content.decode('utf-8', errors='ignore')[:400]
-                raise RuntimeError(f"Branch download failed with {response.status_code}\nHeaders: {response.headers}\nBody (truncated): {body_sample}")
-
-            total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
-                if total_size == 0:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                else:
-                    if show_progress:
-                        with Progress(
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+_ssl_context = None
+_http_clients: dict[bool, httpx.Client] = {}
+
+
+def get_ssl_context():
+    """Return the truststore-backed SSL context, created on first use."""
+    global _ssl_context
+    if _ssl_context is None:
+        import ssl
+        import truststore
+
+        _ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    return _ssl_context
+
+
+def get_http_client(verify: bool = True) -> httpx.Client:
+    """Return the shared pooled HTTP client for the given TLS verification mode.
+
+    Connections are kept alive across the release lookup and asset download,
+    and HTTP/2 is negotiated when the optional h2 package is installed.
+    """
+    client = _http_clients.get(verify)
+    if client is None:
+        import httpx
+
+        client = httpx.Client(
+            verify=get_ssl_context() if verify else False,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        )
+        _http_clients[verify] = client
+    return client
+
+
+def http_get(client: httpx.Client, url: str, *, headers: dict | None = None, timeout: float = 30, retries: int | None = None) -> httpx.Response:
+    """GET url, retrying transport errors and 429/5xx responses with backoff."""
+    import httpx
+
+    retries = http_retries() if retries is None else retries
+    for attempt in range(retries + 1):
+        try:
+            with trace_span(f"GET {url}", "http", attempt=attempt) as span:
+                response = client.get(url, timeout=timeout, follow_redirects=True, headers=headers)
+                span.update(status=response.status_code, bytes=len(response.content), http_version=response.http_version)
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < retries:
+                raise TransientHTTPError(f"{url} returned {response.status_code}", parse_retry_after(response))
+            return response
+        except (httpx.TransportError, TransientHTTPError) as e:
+            if attempt >= retries:
+                raise
+            time.sleep(backoff_delay(attempt, getattr(e, "retry_after", None)))
+
+
+def get_cache_dir() -> Path:
+    """Return the template cache directory (override with SPECIFY_CACHE_DIR)."""
+    override = os.getenv("SPECIFY_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    from platformdirs import user_cache_dir
+
+    return Path(user_cache_dir("specify-cli")) / "templates"
+
+
+class TemplateCache:
+    """Content-addressed store for downloaded template archives.
+
+    Archives are stored once under blobs/<sha256>.zip and referenced from
+    index.json by a logical key (release tag + asset name, or branch). Each entry
+    keeps the ETag / Last-Modified validators of the response it came from so the
+    next run can revalidate with a conditional request instead of downloading
+    again. Entries past ``max_bytes`` are evicted least-recently-used first.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, root: Path | None = None, max_bytes: int | None = None):
+        self.root = root or get_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SPECIFY_CACHE_MAX_BYTES", CACHE_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self.blobs_dir = self.root / "blobs"
+        self.index_path = self.root / "index.json"
+        self._index = None
+        # Guards the index when assets are fetched from several threads
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def release_key(repo_owner: str, repo_name: str, tag: str, asset_name: str) -> str:
+        return f"{repo_owner}/{repo_name}/release/{tag}/{asset_name}"
+
+    @staticmethod
+    def branch_key(repo_owner: str, repo_name: str, repo_branch: str) -> str:
+        return f"{repo_owner}/{repo_name}/branch/{repo_branch}"
+
+    def _load(self) -> dict:
+        with self._lock:
+            return self._load_unlocked()
+
+    def _load_unlocked(self) -> dict:
+        if self._index is None:
+            try:
+                data = json.loads(self.index_path.read_text(encoding="utf-8"))
+                if data.get("version") != self.INDEX_VERSION:
+                    raise ValueError("cache index version mismatch")
+            except (OSError, ValueError):
+                data = {"version": self.INDEX_VERSION, "entries": {}, "releases": {}}
+            self._index = data
+        return self._index
+
+    def _save(self) -> None:
+        # Write-then-rename so concurrent readers never see a torn index
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"index.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._index, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blobs_dir / f"{sha256}.zip"
+
+    def unpacked_path(self, sha256: str) -> Path:
+        return self.root / "unpacked" / sha256
+
+    def unpack(self, archive: Path, zip_ref: zipfile.ZipFile) -> Path | None:
+        """Return a read-only unpacked copy of a cached archive, extracting it on first use.
+
+        Only template members (see select_template_members(), every script variant) are kept,
+        named relative to the archive root. Returns None for archives that are
+        not blobs of this cache.
+        """
+        if archive.parent != self.blobs_dir:
+            return None
+        target = self.unpacked_path(archive.stem)
+        if target.is_dir():
+            if any(target.iterdir()):
+                return target
+            # Left empty by versions that dropped every member of release packages
+            shutil.rmtree(target, ignore_errors=True)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = swap_sibling(target, "new")
+        try:
+            root = archive_root_prefix(zip_ref.namelist())
+            items = select_template_members(zip_ref, root, list(SCRIPT_VARIANT_DIRS))
+            write_zip_members([member for group in items.values() for member in group], staging)
+            for path in staging.rglob("*"):
+                if path.is_file():
+                    path.chmod(0o444)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                pass  # another process unpacked it first
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        return target
+
+    def new_blob_file(self) -> Path:
+        """Create an empty temp file inside the cache to download into."""
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=self.blobs_dir, suffix=".part")
+        os.close(fd)
+        return Path(name)
+
+    def get(self, key: str) -> dict | None:
+        """Return the index entry for key if its archive is still on disk."""
+        entry = self._load()["entries"].get(key)
+        if entry and self.blob_path(entry["sha256"]).is_file():
+            return entry
+        return None
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            entry = self._load()["entries"].get(key)
+            if entry:
+                entry["last_used"] = time.time()
+                self._save()
+
+    def store(self, key: str, tmp_path: Path, sha256: str, *, etag: str | None, last_modified: str | None, **info) -> Path:
+        """Move a completed download into the store and index it under key."""
+        blob = self.blob_path(sha256)
+        with self._lock:
+            os.replace(tmp_path, blob)
+            self._load()["entries"][key] = {
+                "sha256": sha256,
+                "size": blob.stat().st_size,
+                "etag": etag,
+                "last_modified": last_modified,
+                "last_used": time.time(),
+                **info,
+            }
+            self._evict(keep=key)
+            self._save()
+        return blob
+
+    def _evict(self, keep: str) -> None:
+        entries = self._index["entries"]
+        sizes = {e["sha256"]: e["size"] for e in entries.values()}
+        total = sum(sizes.values())
+        for _, key in sorted((e["last_used"], k) for k, e in entries.items() if k != keep):
+            if total <= self.max_bytes:
+                break
+            sha256 = entries.pop(key)["sha256"]
+            # Blobs are shared between keys with identical content
+            if not any(e["sha256"] == sha256 for e in entries.values()):
+                self.blob_path(sha256).unlink(missing_ok=True)
+                shutil.rmtree(self.unpacked_path(sha256), ignore_errors=True)
+                total -= sizes[sha256]
+
+    def get_manifest(self, key: str) -> dict | None:
+        """Return the cached release manifest for an asset key (manifests never change for a tag)."""
+        return self._load().get("manifests", {}).get(key)
+
+    def store_manifest(self, key: str, manifest: dict) -> None:
+        with self._lock:
+            self._load().setdefault("manifests", {})[key] = manifest
+            self._save()
+
+    def get_release(self, repo_owner: str, repo_name: str) -> dict | None:
+        return self._load()["releases"].get(f"{repo_owner}/{repo_name}")
+
+    def store_release(self, repo_owner: str, repo_name: str, release_data: dict, *, etag: str | None, last_modified: str | None) -> None:
+        # Keep only the fields asset matching needs
+        data = {
+            "tag_name": release_data.get("tag_name"),
+            "assets": [
+                {k: a.get(k) for k in ("name", "browser_download_url", "size")}
+                for a in release_data.get("assets", [])
+            ],
+        }
+        with self._lock:
+            self._load()["releases"][f"{repo_owner}/{repo_name}"] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "data": data,
+            }
+            self._save()
+
+
+def conditional_headers(validators: dict | None) -> dict:
+    """Build If-None-Match / If-Modified-Since headers from cached validators."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def new_download_buffer() -> BinaryIO:
+    """Return an in-memory buffer for an archive that spills to a private temp file when large."""
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+
+
+def archive_size(archive: Path | BinaryIO) -> int:
+    if isinstance(archive, Path):
+        return archive.stat().st_size
+    return archive.seek(0, os.SEEK_END)
+
+
+def discard_archive(archive: Path | BinaryIO) -> None:
+    """Delete a downloaded archive file or release its buffer."""
+    if isinstance(archive, Path):
+        archive.unlink(missing_ok=True)
+    else:
+        archive.close()
+
+
+def stream_download(client: httpx.Client, url: str, dest: Path | BinaryIO, *, headers: dict | None = None, show_progress: bool = True, label: str = "Download", chunk_size: int | None = None, retries: int | None = None) -> tuple[int, str | None, httpx.Headers]:
+    """Stream url into dest (a path or a writable binary file), hashing the bytes as they arrive.
+
+    Transport errors and 429/5xx responses are retried with exponential
+    backoff. When a retry happens after part of the body arrived, the download
+    resumes with a Range request (guarded by If-Range) instead of starting over.
+
+    Returns (status_code, sha256 hexdigest, response headers). A 304 response
+    leaves dest untouched and returns a None digest.
+    """
+    import httpx
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    chunk_size = chunk_size or download_chunk_size()
+    retries = http_retries() if retries is None else retries
+    digest = hashlib.sha256()
+    received = 0
+    validator = None  # strong ETag or Last-Modified of the body being resumed
+
+    with ExitStack() as stack:
+        f = stack.enter_context(open(dest, 'wb')) if isinstance(dest, Path) else dest
+        progress = task = None
+        for attempt in range(retries + 1):
+            request_headers = dict(headers or {})
+            if received and validator:
+                request_headers["Range"] = f"bytes={received}-"
+                request_headers["If-Range"] = validator
+            try:
+                with trace_span(f"GET {url}", "http", attempt=attempt, resume_from=received) as span, \
+                        client.stream("GET", url, timeout=HTTP_TIMEOUT, follow_redirects=True, headers=request_headers) as response:
+                    status = span["status"] = response.status_code
+                    if status == 304:
+                        return 304, None, response.headers
+                    if status in RETRYABLE_STATUS_CODES and attempt < retries:
+                        raise TransientHTTPError(f"{label} returned {status}", parse_retry_after(response))
+                    if status not in (200, 206) or (status == 206 and not received):
+                        # Read response content for error message
+                        error_content = b"".join(response.iter_bytes(chunk_size=1024))
+                        body_sample = error_content.decode('utf-8', errors='ignore')[:400]
+                        raise RuntimeError(f"{label} failed with {status}\nHeaders: {response.headers}\nBody (truncated): {body_sample}")
+
+                    if status == 200:
+                        # Fresh body (first attempt, or the server ignored our Range)
+                        if received:
+                            f.seek(0)
+                            f.truncate()
+                            digest = hashlib.sha256()
+                            received = 0
+                        etag = response.headers.get("etag")
+                        validator = etag if etag and not etag.startswith("W/") else response.headers.get("last-modified")
+
+                    total_size = received + int(response.headers.get('content-length', 0))
+                    if show_progress and total_size and progress is None:
+                        progress = stack.enter_context(Progress(
                             SpinnerColumn(),
                             TextColumn("[progress.description]{task.description}"),
                             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
                             console=console,
-                        ) as progress:
-                            task = progress.add_task("Downloading...", total=total_size)
-                            downloaded = 0
-                            for chunk in response.iter_bytes(chunk_size=8192):
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                progress.update(task, completed=downloaded)
-                    else:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
+                        ))
+                        task = progress.add_task("Downloading...", total=total_size)
+
+                    for chunk in response.iter_bytes(chunk_size=chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        received += len(chunk)
+                        if progress:
+                            progress.update(task, completed=received)
+                    span["bytes"] = received
+                    return 200, digest.hexdigest(), response.headers
+            except (httpx.TransportError, TransientHTTPError) as e:
+                if attempt >= retries:
+                    raise
+                time.sleep(backoff_delay(attempt, getattr(e, "retry_after", None)))
+    raise RuntimeError(f"{label} failed after {retries + 1} attempts")
+
+
+def check_archive_digest(filename: str, sha256: str, size: int, expected_sha256: str | None, expected_size: int | None) -> None:
+    """Raise RuntimeError when an archive's digest or size differs from what the release advertises."""
+    if expected_size is not None and size != expected_size:
+        raise RuntimeError(f"Integrity check failed for {filename}: expected {expected_size:,} bytes, got {size:,}")
+    if expected_sha256 and sha256 != expected_sha256:
+        raise RuntimeError(f"Integrity check failed for {filename}: SHA-256 {sha256} does not match the release manifest ({expected_sha256})")
+
+
+def fetch_archive(client: httpx.Client, url: str, cache_key: str, filename: str, *, cache: TemplateCache | None, offline: bool, download_dir: Path | None, show_progress: bool, label: str = "Download", expected_sha256: str | None = None, expected_size: int | None = None, **info) -> tuple[Path | BinaryIO, bool]:
+    """Fetch one archive through the cache.
+
+    Revalidates a cached copy with a conditional request, resolves it from the
+    cache only when offline, and otherwise downloads it. Returns
+    (archive, cache_hit). Raises RuntimeError when the archive cannot be
+    obtained or does not match expected_sha256 / expected_size. Downloads are
+    hashed as they stream and cached blobs are named by their digest, so
+    the check never reads the archive again.
+    """
+    entry = cache.get(cache_key) if cache else None
+    if offline:
+        if not entry:
+            raise RuntimeError(f"{filename} is not in the template cache (run once without --offline to populate it)")
+        check_archive_digest(filename, entry["sha256"], entry["size"], expected_sha256, expected_size)
+        cache.touch(cache_key)
+        return cache.blob_path(entry["sha256"]), True
+
+    # Download into the cache when enabled, else into memory unless a directory is given
+    if cache:
+        archive = cache.new_blob_file()
+    else:
+        archive = download_dir / filename if download_dir else new_download_buffer()
+    try:
+        status, sha256, headers = stream_download(client, url, archive, headers=conditional_headers(entry), show_progress=show_progress, label=label)
+    except BaseException:
+        discard_archive(archive)
+        raise
+
+    if status == 304 and entry:
+        discard_archive(archive)
+        check_archive_digest(filename, entry["sha256"], entry["size"], expected_sha256, expected_size)
+        cache.touch(cache_key)
+        return cache.blob_path(entry["sha256"]), True
+    try:
+        check_archive_digest(filename, sha256, archive_size(archive), expected_sha256, expected_size)
+    except RuntimeError:
+        discard_archive(archive)
+        raise
+    if cache:
+        archive = cache.store(
+            cache_key, archive, sha256,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            filename=filename,
+            **info,
+        )
+    return archive, False
+
+
+def download_from_branch(ai_assistant: str, download_dir: Path | None, repo_owner: str, repo_name: str, repo_branch: str, script_type: str, verbose: bool, show_progress: bool, client: httpx.Client, debug: bool, cache: TemplateCache | None = None, offline: bool = False) -> Tuple[Path | BinaryIO, dict]:
+    """Download template directly from a branch as an archive.
+
+    With a cache, the archive is revalidated by ETag and reused on 304; with
+    offline=True it is resolved from the cache only.
+    """
+    download_url = f"{GITHUB_URL}/{repo_owner}/{repo_name}/archive/refs/heads/{repo_branch}.zip"
+    filename = f"{repo_name}-{repo_branch}.zip"
+
+    if verbose:
+        console.print(f"[cyan]Downloading from branch:[/cyan] {repo_branch}")
+        console.print(f"[cyan]URL:[/cyan] {download_url}")
+
+    try:
+        zip_path, cache_hit = fetch_archive(
+            client, download_url, TemplateCache.branch_key(repo_owner, repo_name, repo_branch), filename,
+            cache=cache, offline=offline, download_dir=download_dir, show_progress=show_progress,
+            label="Branch download", release=f"branch-{repo_branch}",
+        )
     except Exception as e:
         console.print(f"[red]Error downloading template from branch[/red]")
-        detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
-        console.print(Panel(detail, title="Download Error", border_style="red"))
+        console.print(Panel(str(e), title="Download Error", border_style="red"))
         raise typer.Exit(1)
 
     if verbose:
-        console.print(f"Downloaded: {filename}")
+        console.print(f"{'Using cached' if cache_hit else 'Downloaded'}: {filename}")
 
     metadata = {
         "filename": filename,
-        "size": zip_path.stat().st_size,
+        "size": archive_size(zip_path),
         "release": f"branch-{repo_branch}",
-        "asset_url": download_url
+        "asset_url": download_url,
+        "cached": cache is not None,
+        "cache_hit": cache_hit,
     }
     return zip_path, metadata
 
@@ -502,34 +1137,42 @@ def detect_uvx_repo_info() -> tuple[str | None, str | None, str | None]:
     return None, None, None
 
 
-def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, repo_owner: str = None, repo_name: str = None, repo_branch: str = None) -> Tuple[Path, dict]:
+def resolve_repo(repo_owner: str | None, repo_name: str | None, repo_branch: str | None, verbose: bool = False) -> tuple[str, str, str]:
+    """Resolve the template repo from parameters, environment variables, uvx detection, or defaults."""
     # Auto-detect repo info if running from uvx --from
     detected_owner, detected_name, detected_branch = detect_uvx_repo_info()
 
-    # Get repo settings from parameters, environment variables, uvx detection, or defaults
     repo_owner = repo_owner or os.getenv("SPECIFY_REPO_OWNER") or detected_owner or "hcnimi"
     repo_name = repo_name or os.getenv("SPECIFY_REPO_NAME") or detected_name or "spec-kit"
     repo_branch = repo_branch or os.getenv("SPECIFY_REPO_BRANCH") or detected_branch or "main"
 
     if verbose and (detected_owner or detected_name or detected_branch):
         console.print(f"[dim]Auto-detected from uvx: {detected_owner}/{detected_name}@{detected_branch or 'main'}[/dim]")
+    return repo_owner, repo_name, repo_branch
 
-    if client is None:
-        client = httpx.Client(verify=ssl_context)
-    
-    if repo_branch:
-        if verbose:
-            console.print(f"[cyan]Downloading template from branch {repo_branch}...[/cyan]")
-        # Use direct branch archive download
-        return download_from_branch(ai_assistant, download_dir, repo_owner, repo_name, repo_branch, script_type, verbose, show_progress, client, debug)
+
+def fetch_release_data(client: httpx.Client, repo_owner: str, repo_name: str, *, tag: str | None = None, cache: TemplateCache | None = None, offline: bool = False, verbose: bool = True, debug: bool = False) -> dict:
+    """Return the latest (or the tagged) release JSON, revalidated against (or, offline, taken from) the cache.
+
+    Only the latest release is cached.
+    """
+    cached_release = cache.get_release(repo_owner, repo_name) if cache and not tag else None
+    if offline:
+        if not cached_release:
+            console.print(f"[red]No cached release information[/red] for [bold]{repo_owner}/{repo_name}[/bold]")
+            console.print("[yellow]Tip:[/yellow] Run once without --offline to populate the cache")
+            raise typer.Exit(1)
+        return cached_release["data"]
 
     if verbose:
-        console.print("[cyan]Fetching latest release information...[/cyan]")
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
-    
+        console.print(f"[cyan]Fetching {'release ' + tag if tag else 'latest release'} information...[/cyan]")
+    api_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/releases/" + (f"tags/{tag}" if tag else "latest")
+
     try:
-        response = client.get(api_url, timeout=30, follow_redirects=True)
+        response = http_get(client, api_url, headers=conditional_headers(cached_release))
         status = response.status_code
+        if status == 304 and cached_release:
+            return cached_release["data"]
         if status != 200:
             msg = f"GitHub API returned {status} for {api_url}"
             if debug:
@@ -539,12 +1182,17 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
             release_data = response.json()
         except ValueError as je:
             raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+        if cache and not tag:
+            cache.store_release(repo_owner, repo_name, release_data, etag=response.headers.get("etag"), last_modified=response.headers.get("last-modified"))
+        return release_data
     except Exception as e:
         console.print(f"[red]Error fetching release information[/red]")
         console.print(Panel(str(e), title="Fetch Error", border_style="red"))
         raise typer.Exit(1)
-    
-    # Find the template asset for the specified AI assistant
+
+
+def find_template_asset(release_data: dict, ai_assistant: str, script_type: str) -> dict:
+    """Return the release asset for an assistant/script pair, or exit listing what is available."""
     pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
     matching_assets = [
         asset for asset in release_data.get("assets", [])
@@ -558,332 +1206,875 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
         raise typer.Exit(1)
     
     # Use the first matching asset
-    asset = matching_assets[0]
-    download_url = asset["browser_download_url"]
+    return matching_assets[0]
+
+
+def find_asset_manifest(release_data: dict, asset: dict) -> dict | None:
+    """Return the <asset>.manifest.json release asset published next to asset (see build-templates), if any."""
+    name = f"{asset['name']}.manifest.json"
+    return next((a for a in release_data.get("assets", []) if a.get("name") == name), None)
+
+
+def fetch_release_manifest(client: httpx.Client, manifest_asset: dict, cache_key: str, *, cache: TemplateCache | None = None, offline: bool = False) -> dict | None:
+    """Fetch an asset's release manifest ({"sha256", "size", "files"}), cached per tag.
+
+    Manifests in a local template mirror (assets with a "path") are read in place.
+
+    Returns None offline when it was never cached. Raises RuntimeError for
+    an unreachable or malformed manifest: a release that publishes one must
+    be verifiable.
+    """
+    if manifest_asset.get("path"):
+        # Local mirror: read in place, no cache needed
+        try:
+            data = json.loads(Path(manifest_asset["path"]).read_text(encoding="utf-8"))
+        except ValueError as e:
+            raise RuntimeError(f"Release manifest {manifest_asset['name']} is not valid JSON: {e}")
+        cache = None
+    else:
+        cached = cache.get_manifest(cache_key) if cache else None
+        if cached or offline:
+            return cached
+        response = http_get(client, manifest_asset["browser_download_url"])
+        if response.status_code != 200:
+            raise RuntimeError(f"Release manifest {manifest_asset['name']} returned {response.status_code}")
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise RuntimeError(f"Release manifest {manifest_asset['name']} is not valid JSON: {e}")
+    if not (isinstance(data, dict) and isinstance(data.get("sha256"), str) and isinstance(data.get("files"), dict)):
+        raise RuntimeError(f"Release manifest {manifest_asset['name']} is missing sha256/files")
+    manifest = {"sha256": data["sha256"], "size": data.get("size"), "files": data["files"]}
+    if cache:
+        cache.store_manifest(cache_key, manifest)
+    return manifest
+
+
+def download_release_asset(client: httpx.Client, asset: dict, tag: str, repo_owner: str, repo_name: str, *, manifest_asset: dict | None = None, download_dir: Path | None = None, verbose: bool = True, show_progress: bool = True, cache: TemplateCache | None = None, offline: bool = False) -> Tuple[Path | BinaryIO, dict]:
+    """Download (or resolve from the cache) a single release asset.
+
+    The archive is checked against the size in the release JSON and, when
+    the release publishes a manifest_asset, against its SHA-256. The
+    manifest's per-file hashes are returned as metadata["members"] so
+    extraction can verify each file as it is written.
+
+    Assets of a local template mirror (with a "path", see
+    fetch_mirror_release()) are not copied: the mirrored file is checked
+    the same way and returned as is.
+    """
+    download_url = asset.get("path") or asset["browser_download_url"]
     filename = asset["name"]
     file_size = asset["size"]
-    
+    cache_key = TemplateCache.release_key(repo_owner, repo_name, tag, filename)
+    local = bool(asset.get("path"))
+
     if verbose:
         console.print(f"[cyan]Found template:[/cyan] {filename}")
         console.print(f"[cyan]Size:[/cyan] {file_size:,} bytes")
-        console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
-    
-    # Download the file
-    zip_path = download_dir / filename
-    if verbose:
-        console.print(f"[cyan]Downloading template...[/cyan]")
-    
+        console.print(f"[cyan]Release:[/cyan] {tag}")
+        if not offline and not local:
+            console.print(f"[cyan]Downloading template...[/cyan]")
+
     try:
-        with client.stream("GET", download_url, timeout=60, follow_redirects=True) as response:
-            if response.status_code != 200:
-                body_sample = response.text[:400]
-                raise RuntimeError(f"Download failed with {response.status_code}\nHeaders: {response.headers}\nBody (truncated): {body_sample}")
-            total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
-                if total_size == 0:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                else:
-                    if show_progress:
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                            console=console,
-                        ) as progress:
-                            task = progress.add_task("Downloading...", total=total_size)
-                            downloaded = 0
-                            for chunk in response.iter_bytes(chunk_size=8192):
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                progress.update(task, completed=downloaded)
-                    else:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
+        manifest = fetch_release_manifest(client, manifest_asset, cache_key, cache=cache, offline=offline) if manifest_asset else None
+        if local:
+            zip_path, cache_hit = Path(download_url), False
+            size = zip_path.stat().st_size
+            # Hash only when the release publishes a digest to check it against
+            check_archive_digest(filename, file_sha256(zip_path) if manifest else "", size, manifest and manifest["sha256"], file_size)
+        else:
+            zip_path, cache_hit = fetch_archive(
+                client, download_url, cache_key, filename,
+                cache=cache, offline=offline, download_dir=download_dir, show_progress=show_progress,
+                expected_sha256=manifest and manifest["sha256"], expected_size=file_size, release=tag,
+            )
     except Exception as e:
         console.print(f"[red]Error downloading template[/red]")
-        detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
-        console.print(Panel(detail, title="Download Error", border_style="red"))
+        console.print(Panel(str(e), title="Download Error", border_style="red"))
         raise typer.Exit(1)
+
     if verbose:
-        console.print(f"Downloaded: {filename}")
+        console.print(f"{'Using cached' if cache_hit else 'Downloaded'}: {filename}")
     metadata = {
         "filename": filename,
         "size": file_size,
-        "release": release_data["tag_name"],
-        "asset_url": download_url
+        "release": tag,
+        "asset_url": download_url,
+        # Mirrored files are shared by every reader and must never be discarded
+        "cached": cache is not None or local,
+        "cache_hit": cache_hit,
+        "mirror": local,
+        "verified": "sha256" if manifest else "size",
+        "members": manifest["files"] if manifest else None,
     }
     return zip_path, metadata
 
 
-def handle_specify_extraction(source: Path, dest: Path, force: bool, verbose: bool = False, tracker: StepTracker | None = None) -> None:
-    """Extract .specify/ directory but preserve memory/ contents unless force=True"""
-    memory_backup_path = None
-    temp_dir_obj = None
+def download_template_from_github(ai_assistant: str, download_dir: Path | None, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, repo_owner: str = None, repo_name: str = None, repo_branch: str = None, cache: TemplateCache | None = None, offline: bool = False, template_source: str | None = None) -> Tuple[Path | BinaryIO, dict]:
+    """Resolve the release asset for an assistant/script pair and download it.
 
-    try:
-        # Step 1: Backup existing memory/ if present and not force
-        if dest.exists() and not force:
-            memory_path = dest / "memory"
-            if memory_path.exists() and memory_path.is_dir():
-                # Create temp directory for backup
-                temp_dir_obj = tempfile.TemporaryDirectory()
-                memory_backup_path = Path(temp_dir_obj.name) / "memory_backup"
-                shutil.copytree(memory_path, memory_backup_path)
-                if verbose and not tracker:
-                    console.print(f"[cyan]Backed up .specify/memory/[/cyan]")
-
-        # Step 2: Remove old .specify/ if it exists
-        if dest.exists():
-            shutil.rmtree(dest)
-            if verbose and not tracker:
-                console.print(f"[cyan]Removed old .specify/[/cyan]")
-
-        # Step 3: Copy new .specify/
-        shutil.copytree(source, dest)
-        if verbose and not tracker:
-            console.print(f"[cyan]Copied new .specify/[/cyan]")
+    The archive is returned as a cache path, a file in download_dir, or (with
+    neither) an in-memory buffer. With a template_source (a mirror written
+    by `specify mirror`), the latest mirrored release is used instead of
+    GitHub; a local mirror's archive is returned in place.
+    """
+    repo_owner, repo_name, repo_branch = resolve_repo(repo_owner, repo_name, repo_branch, verbose)
 
-        # Step 4: Restore old memory/ if we backed it up
-        if memory_backup_path and memory_backup_path.exists():
-            new_memory = dest / "memory"
-            if new_memory.exists():
-                shutil.rmtree(new_memory)
-            shutil.copytree(memory_backup_path, new_memory)
-            if verbose and not tracker:
-                console.print(f"[green]Restored .specify/memory/[/green]")
+    if client is None:
+        client = get_http_client()
 
-    finally:
-        # Cleanup temp directory
-        if temp_dir_obj:
-            temp_dir_obj.cleanup()
+    if template_source:
+        # Mirrors hold releases only, so the branch default does not apply
+        release_data = fetch_mirror_release(client, template_source, repo_owner, repo_name, offline=offline, debug=debug)
+    elif repo_branch:
+        if verbose:
+            console.print(f"[cyan]Downloading template from branch {repo_branch}...[/cyan]")
+        # Use direct branch archive download
+        return download_from_branch(ai_assistant, download_dir, repo_owner, repo_name, repo_branch, script_type, verbose, show_progress, client, debug, cache=cache, offline=offline)
+    else:
+        release_data = fetch_release_data(client, repo_owner, repo_name, cache=cache, offline=offline, verbose=verbose, debug=debug)
+    asset = find_template_asset(release_data, ai_assistant, script_type)
+    return download_release_asset(client, asset, release_data["tag_name"], repo_owner, repo_name, manifest_asset=find_asset_manifest(release_data, asset), download_dir=download_dir, verbose=verbose, show_progress=show_progress, cache=cache, offline=offline)
 
 
-def merge_gitignore(project_path: Path, source_dir: Path, verbose: bool = False, tracker: StepTracker | None = None) -> None:
-    """Merge template .gitignore entries into project .gitignore"""
-    template_gitignore = source_dir / ".gitignore"
+def download_templates(ai_assistants: list[str], script_types: list[str], *, verbose: bool = True, client: httpx.Client = None, debug: bool = False, repo_owner: str = None, repo_name: str = None, repo_branch: str = None, cache: TemplateCache | None = None, offline: bool = False, template_source: str | None = None) -> list[Tuple[Path | BinaryIO, dict]]:
+    """Fetch the templates for every assistant × script combination.
 
-    # If template has no .gitignore, nothing to merge
-    if not template_gitignore.exists():
-        return
+    Release metadata is resolved once and the matching assets are downloaded
+    concurrently over the shared pooled client. A branch archive already
+    carries every assistant and script variant, so it is fetched once.
+    """
+    if len(ai_assistants) == 1 and len(script_types) == 1:
+        return [download_template_from_github(
+            ai_assistants[0], None, script_type=script_types[0], verbose=verbose, show_progress=verbose,
+            client=client, debug=debug, repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch,
+            cache=cache, offline=offline, template_source=template_source,
+        )]
+
+    repo_owner, repo_name, repo_branch = resolve_repo(repo_owner, repo_name, repo_branch, verbose)
+    if client is None:
+        client = get_http_client()
 
-    template_content = template_gitignore.read_text(encoding='utf-8')
-    project_gitignore = project_path / ".gitignore"
+    if template_source:
+        release_data = fetch_mirror_release(client, template_source, repo_owner, repo_name, offline=offline, debug=debug)
+    elif repo_branch:
+        if verbose:
+            console.print(f"[cyan]Downloading template from branch {repo_branch}...[/cyan]")
+        return [download_from_branch(ai_assistants[0], None, repo_owner, repo_name, repo_branch, script_types[0], verbose, verbose, client, debug, cache=cache, offline=offline)]
+    else:
+        release_data = fetch_release_data(client, repo_owner, repo_name, cache=cache, offline=offline, verbose=verbose, debug=debug)
+    assets = []
+    for ai in ai_assistants:
+        for script in script_types:
+            asset = find_template_asset(release_data, ai, script)
+            if asset not in assets:
+                assets.append(asset)
+
+    # Progress bars would interleave, so concurrent downloads report per asset instead
+    with ThreadPoolExecutor(max_workers=min(len(assets), HTTP_MAX_CONNECTIONS)) as pool:
+        futures = [
+            pool.submit(download_release_asset, client, asset, release_data["tag_name"], repo_owner, repo_name,
+                        manifest_asset=find_asset_manifest(release_data, asset), verbose=False, show_progress=False,
+                        cache=cache, offline=offline)
+            for asset in assets
+        ]
+        results = [future.result() for future in futures]
+    if verbose:
+        for _, meta in results:
+            console.print(f"{'Using cached' if meta['cache_hit'] else 'Downloaded'}: {meta['filename']}")
+    return results
 
-    # Parse template entries (ignore comments and empty lines)
-    template_lines = set(
-        line.strip()
-        for line in template_content.split('\n')
-        if line.strip() and not line.startswith('#')
-    )
 
-    # Read existing .gitignore if present
-    if project_gitignore.exists():
-        existing_content = project_gitignore.read_text(encoding='utf-8')
-        existing_lines = set(
-            line.strip()
-            for line in existing_content.split('\n')
-            if line.strip() and not line.startswith('#')
-        )
-    else:
-        existing_content = ""
-        existing_lines = set()
+MIRROR_LATEST = "latest.json"
 
-    # Find new entries that aren't already present
-    new_entries = template_lines - existing_lines
 
-    if new_entries:
-        # Append new entries
-        with open(project_gitignore, 'a', encoding='utf-8') as f:
-            if existing_content and not existing_content.endswith('\n'):
-                f.write('\n')
-            f.write('\n# Added by spec-kit\n')
-            for entry in sorted(new_entries):
-                f.write(f'{entry}\n')
-        if verbose and not tracker:
-            console.print(f"[cyan]Merged {len(new_entries)} entries into .gitignore[/cyan]")
-    elif verbose and not tracker:
-        console.print(f"[dim].gitignore already up to date[/dim]")
+def parse_template_source(source: str) -> str | Path:
+    """Return a template mirror's base URL (http/https) or local directory (a path or file:// URL)."""
+    if source.startswith(("http://", "https://")):
+        return source.rstrip("/")
+    if source.startswith("file://"):
+        from urllib.parse import urlparse
+        from urllib.request import url2pathname
 
+        return Path(url2pathname(urlparse(source).path))
+    return Path(source).expanduser()
 
-def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, repo_owner: str = None, repo_name: str = None, repo_branch: str = None, force: bool = False) -> Path:
-    """Download the latest release and extract it to create a new project.
-    Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+
+def mirror_releases_location(source: str | Path, repo_owner: str, repo_name: str) -> str | Path:
+    """Return where a mirror keeps one repo's releases: <source>/<owner>/<repo>/releases."""
+    if isinstance(source, Path):
+        return source / repo_owner / repo_name / "releases"
+    return f"{source}/{repo_owner}/{repo_name}/releases"
+
+
+def fetch_mirror_release(client: httpx.Client, template_source: str, repo_owner: str, repo_name: str, *, tag: str | None = None, offline: bool = False, debug: bool = False) -> dict:
+    """Return the latest (or the tagged) release JSON from a template mirror written by `specify mirror`.
+
+    Mirrored asset URLs are relative to the releases directory. For an HTTP
+    mirror they are resolved to absolute URLs; for a local mirror each asset
+    gets a "path" instead, so downloading it becomes reading the file in place.
     """
-    current_dir = Path.cwd()
-    
-    # Step: fetch + download combined
-    if tracker:
-        tracker.start("fetch", "contacting GitHub API")
+    releases = mirror_releases_location(parse_template_source(template_source), repo_owner, repo_name)
+    name = f"{tag}.json" if tag else MIRROR_LATEST
     try:
-        zip_path, meta = download_template_from_github(
-            ai_assistant,
-            current_dir,
-            script_type=script_type,
-            verbose=verbose and tracker is None,
-            show_progress=(tracker is None),
-            client=client,
-            debug=debug,
-            repo_owner=repo_owner,
-            repo_name=repo_name,
-            repo_branch=repo_branch
-        )
-        if tracker:
-            tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes)")
-            tracker.add("download", "Download template")
-            tracker.complete("download", meta['filename'])
-    except Exception as e:
-        if tracker:
-            tracker.error("fetch", str(e))
+        if isinstance(releases, Path):
+            release_data = json.loads((releases / name).read_text(encoding="utf-8"))
         else:
-            if verbose:
-                console.print(f"[red]Error downloading template:[/red] {e}")
-        raise
-    
-    if tracker:
-        tracker.add("extract", "Extract template")
-        tracker.start("extract")
-    elif verbose:
-        console.print("Extracting template...")
-    
-    try:
-        # Create project directory only if not using current directory
-        if not is_current_dir:
-            project_path.mkdir(parents=True)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # List all files in the ZIP for debugging
-            zip_contents = zip_ref.namelist()
-            if tracker:
-                tracker.start("zip-list")
-                tracker.complete("zip-list", f"{len(zip_contents)} entries")
-            elif verbose:
-                console.print(f"[cyan]ZIP contains {len(zip_contents)} items[/cyan]")
-            
-            # For current directory, extract to a temp location first
-            if is_current_dir:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    temp_path = Path(temp_dir)
-                    zip_ref.extractall(temp_path)
-                    
-                    # Check what was extracted
-                    extracted_items = list(temp_path.iterdir())
-                    if tracker:
-                        tracker.start("extracted-summary")
-                        tracker.complete("extracted-summary", f"temp {len(extracted_items)} items")
-                    elif verbose:
-                        console.print(f"[cyan]Extracted {len(extracted_items)} items to temp location[/cyan]")
-                    
-                    # Handle GitHub-style ZIP with a single root directory
-                    source_dir = temp_path
-                    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                        source_dir = extracted_items[0]
-                        if tracker:
-                            tracker.add("flatten", "Flatten nested directory")
-                            tracker.complete("flatten")
-                        elif verbose:
-                            console.print(f"[cyan]Found nested directory structure[/cyan]")
-                    
-                    # Only extract spec-kit's user-facing assets
-                    # Include both packaged (.spec-kit, .claude) and raw branch (memory, scripts, templates) structures
-                    ALLOWED_PATHS = {'.spec-kit', '.claude', 'specs', 'CONSTITUTION.md', 'memory', 'scripts', 'templates'}
-
-                    # Copy only allowed paths to current directory
-                    for item in source_dir.iterdir():
-                        # Filter: only process spec-kit namespaces
-                        if item.name not in ALLOWED_PATHS:
-                            continue
+            if offline:
+                raise RuntimeError(f"{template_source} is an HTTP mirror; --offline needs a local mirror directory")
+            response = http_get(client, f"{releases}/{name}")
+            if response.status_code != 200:
+                msg = f"Template mirror returned {response.status_code} for {releases}/{name}"
+                if debug:
+                    msg += f"\nResponse headers: {response.headers}\nBody (truncated 500): {response.text[:500]}"
+                raise RuntimeError(msg)
+            release_data = response.json()
+    except Exception as e:
+        console.print(f"[red]Error reading release information from template mirror[/red] {template_source}")
+        console.print(Panel(str(e), title="Mirror Error", border_style="red"))
+        console.print(f"[yellow]Tip:[/yellow] Populate the mirror with: specify mirror <dir> --repo-owner {repo_owner} --repo-name {repo_name}")
+        raise typer.Exit(1)
 
-                        dest_path = project_path / item.name
+    for asset in release_data.get("assets", []):
+        if isinstance(releases, Path):
+            asset["path"] = str(releases / asset["browser_download_url"])
+        else:
+            asset["browser_download_url"] = f"{releases}/{asset['browser_download_url']}"
+    return release_data
+
+
+def write_mirror_json(path: Path, data: dict) -> None:
+    """Atomically write a mirror release file, so concurrent readers see the old or the new version."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def select_mirror_assets(release_data: dict, ai_assistants: list[str] | None, script_types: list[str] | None) -> list[dict]:
+    """Return every release asset, or only the templates (and manifests) for the given assistants / script types."""
+    assets = release_data.get("assets", [])
+    if not ai_assistants and not script_types:
+        return list(assets)
+    patterns = [
+        f"spec-kit-template-{ai}-{script}"
+        for ai in ai_assistants or list(AI_CHOICES)
+        for script in script_types or list(SCRIPT_TYPE_CHOICES)
+    ]
+    return [asset for asset in assets if any(pattern in asset["name"] for pattern in patterns)]
 
-                        # Special handling for .spec-kit/
-                        if item.name == ".spec-kit":
-                            handle_specify_extraction(item, dest_path, force, verbose=verbose, tracker=tracker)
-                            continue
 
-                        # specs/ folder: preserve if exists (unless force)
-                        if item.name == "specs" and dest_path.exists() and not force:
-                            if verbose and not tracker:
-                                console.print(f"[cyan]Preserving existing specs folder[/cyan]")
-                            continue
+def mirror_release(client: httpx.Client, release_data: dict, root: Path, repo_owner: str, repo_name: str, *, ai_assistants: list[str] | None = None, script_types: list[str] | None = None, jobs: int | None = None) -> list[dict]:
+    """Copy one release's assets and metadata into a template mirror.
 
-                        # Default: replace other allowed paths
-                        if dest_path.exists():
-                            if dest_path.is_dir():
-                                shutil.rmtree(dest_path)
-                            else:
-                                dest_path.unlink()
-                        if item.is_dir():
-                            shutil.copytree(item, dest_path)
-                        else:
-                            shutil.copy2(item, dest_path)
+    Assets land in <root>/<owner>/<repo>/releases/<tag>/ and the release
+    JSON in releases/<tag>.json. Assets are immutable per tag, so files
+    already mirrored are kept. Template zips are verified against their
+    .manifest.json (fetched first). Every file is downloaded to a temp name
+    and renamed into place, and the release JSON is written only after its
+    assets, so concurrent readers never see a partial release.
 
-                    # Merge .gitignore from template
-                    merge_gitignore(project_path, source_dir, verbose=verbose, tracker=tracker)
-                    if verbose and not tracker:
-                        console.print(f"[cyan]Template files merged into current directory[/cyan]")
+    Returns one {"tag", "name", "size", "status"} row per asset; raises
+    RuntimeError when a download fails or does not verify.
+    """
+    tag = release_data["tag_name"]
+    releases_dir = mirror_releases_location(root, repo_owner, repo_name)
+    tag_dir = releases_dir / tag
+    tag_dir.mkdir(parents=True, exist_ok=True)
+    assets = select_mirror_assets(release_data, ai_assistants, script_types)
+
+    def fetch(asset: dict) -> dict:
+        dest = tag_dir / asset["name"]
+        row = {"tag": tag, "name": asset["name"], "size": asset["size"], "status": "present"}
+        if dest.is_file() and dest.stat().st_size == asset["size"]:
+            return row
+        manifest_path = tag_dir / f"{asset['name']}.manifest.json"
+        expected_sha256 = json.loads(manifest_path.read_text(encoding="utf-8")).get("sha256") if manifest_path.is_file() else None
+        tmp_path = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.part")
+        try:
+            _, sha256, _ = stream_download(client, asset["browser_download_url"], tmp_path, show_progress=False, label=asset["name"])
+            check_archive_digest(asset["name"], sha256, tmp_path.stat().st_size, expected_sha256, asset["size"])
+            os.replace(tmp_path, dest)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        row["status"] = "downloaded" if expected_sha256 is None else "verified"
+        return row
+
+    # Manifests (and other metadata) first, so the zips can be checked against them
+    rows = []
+    workers = min(jobs or HTTP_MAX_CONNECTIONS, HTTP_MAX_CONNECTIONS)
+    for batch in ([a for a in assets if not a["name"].endswith(".zip")], [a for a in assets if a["name"].endswith(".zip")]):
+        if batch:
+            with ThreadPoolExecutor(max_workers=min(len(batch), workers)) as pool:
+                rows += pool.map(fetch, batch)
+
+    # Keep assets an earlier, differently filtered run mirrored for this tag
+    index_path = releases_dir / f"{tag}.json"
+    try:
+        previous = json.loads(index_path.read_text(encoding="utf-8")).get("assets", [])
+    except (OSError, ValueError):
+        previous = []
+    names = {asset["name"] for asset in assets}
+    kept = [asset for asset in previous if asset["name"] not in names and (tag_dir / asset["name"]).is_file()]
+    write_mirror_json(index_path, {
+        "tag_name": tag,
+        "name": release_data.get("name"),
+        "published_at": release_data.get("published_at"),
+        "assets": kept + [
+            {"name": asset["name"], "size": asset["size"], "browser_download_url": f"{tag}/{asset['name']}"}
+            for asset in assets
+        ],
+    })
+    return sorted(rows, key=lambda row: row["name"])
+
+
+def update_mirror_latest(root: Path, repo_owner: str, repo_name: str) -> str | None:
+    """Point releases/latest.json at the most recently published mirrored release; returns its tag."""
+    releases_dir = mirror_releases_location(root, repo_owner, repo_name)
+    releases = []
+    for path in releases_dir.glob("*.json"):
+        if path.name == MIRROR_LATEST:
+            continue
+        try:
+            releases.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    if not releases:
+        return None
+    latest = max(releases, key=lambda release: (release.get("published_at") or "", release["tag_name"]))
+    write_mirror_json(releases_dir / MIRROR_LATEST, latest)
+    return latest["tag_name"]
+
+
+def archive_root_prefix(names: list[str]) -> str:
+    """Return the single top-level directory of a GitHub-style archive ('' if there is none)."""
+    tops = {name.split('/', 1)[0] for name in names}
+    if len(tops) == 1:
+        top = tops.pop()
+        # A release package holding only .specify/ is not wrapped in a root directory
+        if top != ".specify" and any(name.startswith(top + '/') for name in names):
+            return top + '/'
+    return ''
+
+
+def is_release_layout(zip_ref: zipfile.ZipFile, root: str) -> bool:
+    """True for release / mirror packages, which carry a .specify/ tree (branch archives never do)."""
+    return any(name[len(root):].startswith(".specify/") for name in zip_ref.namelist())
+
+
+def release_item(rel_name: str) -> str | None:
+    """Item a release package member belongs to: .specify/<name>, an assistant directory or GEMINI.md."""
+    if rel_name.startswith(".specify/"):
+        parts = rel_name.split('/', 2)
+        return f".specify/{parts[1]}" if parts[1] else None
+    for path in RELEASE_PATHS:
+        if rel_name == path or rel_name.startswith(f"{path}/"):
+            return path
+    return None
+
+
+def select_template_members(zip_ref: zipfile.ZipFile, root: str, script_types: list[str]) -> dict[str, list[ArchiveMember]]:
+    """Pick the archive members worth extracting, grouped by the item they are installed as.
+
+    Member names are matched by prefix after stripping the archive root, so
+    entries outside ALLOWED_PATHS (docs/, media/, .github/, src/ ...) and script
+    variants that were not selected are never decompressed. Release packages
+    keep RELEASE_PATHS instead, grouped per .specify/ subdirectory and
+    assistant directory (see release_item()).
+    """
+    rejected_scripts = tuple(
+        f"{prefix}scripts/{dirname}/" for variant, dirname in SCRIPT_VARIANT_DIRS.items() if variant not in script_types
+        for prefix in ("", ".specify/")
+    )
+    release = is_release_layout(zip_ref, root)
+    items: dict[str, list[ArchiveMember]] = {}
+    for info in zip_ref.infolist():
+        rel_name = info.filename[len(root):]
+        if release:
+            item = release_item(rel_name)
+        else:
+            item = rel_name.split('/', 1)[0]
+            item = item if item in ALLOWED_PATHS else None
+        if item is None or rel_name.startswith(rejected_scripts):
+            continue
+        items.setdefault(item, []).append((zip_ref, info, rel_name))
+    return items
+
+
+def merge_template_members(selections: list[dict[str, list[ArchiveMember]]]) -> dict[str, list[ArchiveMember]]:
+    """Combine member selections from several archives; the first archive providing a path wins."""
+    merged: dict[str, dict[str, ArchiveMember]] = {}
+    for items in selections:
+        for top, members in items.items():
+            group = merged.setdefault(top, {})
+            for member in members:
+                group.setdefault(member[2].rstrip('/'), member)
+    return {top: list(group.values()) for top, group in merged.items()}
+
+
+def member_target(dest_root: Path, rel_name: str) -> Path | None:
+    """Map an archive member name to a path under dest_root, rejecting unsafe names."""
+    parts = [p for p in rel_name.replace('\\', '/').split('/') if p not in ('', '.')]
+    if not parts or '..' in parts or ':' in parts[0]:
+        return None
+    return dest_root.joinpath(*parts)
+
+
+def write_zip_members(members: list[ArchiveMember], dest_root: Path, strip_prefix: str = "", *, unpacked: dict | None = None, link_mode: str = "copy", expected: dict | None = None) -> int:
+    """Stream archive members straight to their final paths under dest_root.
+
+    strip_prefix is removed from each member's root-relative name first.
+    Members whose archive has an unpacked cache copy in unpacked
+    ({zip_ref: directory}) are materialized from it with link_mode instead.
+    Streamed members listed in expected ({zip_ref: {name: sha256}}, from
+    the release manifest) are hashed as they are written and only replace
+    their target when the hash matches; a mismatch raises RuntimeError.
+    Returns the number of files written.
+    """
+    dest_root.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for zip_ref, info, rel_name in members:
+        target = member_target(dest_root, rel_name[len(strip_prefix):])
+        if target is None:
+            continue
+        if info.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source_dir = unpacked.get(zip_ref) if unpacked else None
+        if source_dir is not None:
+            materialize_file(source_dir / rel_name, target, link_mode, rel_name)
+        else:
+            expected_sha256 = expected.get(zip_ref, {}).get(rel_name) if expected else None
+            if expected_sha256:
+                # Written beside the target and renamed over it only once the hash matches
+                write_verified_member(zip_ref, info, target, expected_sha256, rel_name)
             else:
-                # Extract to temp location first, then filter
-                with tempfile.TemporaryDirectory() as temp_extract:
-                    temp_path = Path(temp_extract)
-                    zip_ref.extractall(temp_path)
-
-                    # Check what was extracted
-                    extracted_items = list(temp_path.iterdir())
-                    if tracker:
-                        tracker.start("extracted-summary")
-                        tracker.complete("extracted-summary", f"{len(extracted_items)} items")
-                    elif verbose:
-                        console.print(f"[cyan]Extracted {len(extracted_items)} items[/cyan]")
-
-                    # Handle GitHub-style ZIP with a single root directory
-                    source_dir = temp_path
-                    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                        source_dir = extracted_items[0]
-                        if tracker:
-                            tracker.add("flatten", "Flatten nested directory")
-                            tracker.complete("flatten")
-                        elif verbose:
-                            console.print(f"[cyan]Found nested directory structure[/cyan]")
-
-                    # Only copy spec-kit's user-facing assets
-                    # Include both packaged (.spec-kit, .claude) and raw branch (memory, scripts, templates) structures
-                    ALLOWED_PATHS = {'.spec-kit', '.claude', 'specs', 'CONSTITUTION.md', 'memory', 'scripts', 'templates'}
-
-                    for item in source_dir.iterdir():
-                        # Filter: only process spec-kit namespaces
-                        if item.name not in ALLOWED_PATHS:
-                            continue
+                if target.is_file() and target.stat().st_nlink > 1:
+                    target.unlink()  # never write through a hardlink into the cache
+                with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                    for chunk in iter(lambda: src.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        dst.write(chunk)
+        written += 1
+    return written
+
+
+def write_verified_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target: Path, expected_sha256: str, rel_name: str) -> None:
+    """Stream a member to a sibling of target, hashing it, and rename it over target only if the hash matches."""
+    staging = swap_sibling(target, "part")
+    digest = hashlib.sha256()
+    try:
+        with zip_ref.open(info) as src, open(staging, 'wb') as dst:
+            for chunk in iter(lambda: src.read(DOWNLOAD_CHUNK_SIZE), b""):
+                dst.write(chunk)
+                digest.update(chunk)
+        if digest.hexdigest() != expected_sha256:
+            raise RuntimeError(f"Integrity check failed for {rel_name}: content does not match the release manifest")
+        os.replace(staging, target)
+    finally:
+        staging.unlink(missing_ok=True)
 
-                        dest_path = project_path / item.name
 
-                        # Special handling for .spec-kit/
-                        if item.name == ".spec-kit":
-                            handle_specify_extraction(item, dest_path, force, verbose=verbose, tracker=tracker)
-                            continue
+def materialize_file(src: Path, dst: Path, link_mode: str, rel_name: str) -> None:
+    """Create dst from an unpacked cache file according to link_mode.
 
-                        # specs/ folder: preserve if exists (unlikely for new project)
-                        if item.name == "specs" and dest_path.exists() and not force:
-                            if verbose and not tracker:
-                                console.print(f"[cyan]Preserving existing specs folder[/cyan]")
-                            continue
+    "hardlink" links read-only template assets (HARDLINK_PREFIXES) to the
+    cache; everything else, and "reflink" mode, is cloned with clone_file().
+    Any existing dst is unlinked first so a hardlinked cache file is never
+    written through.
+    """
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    if link_mode == "hardlink" and rel_name.startswith(HARDLINK_PREFIXES):
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # e.g. cache on another filesystem
+    clone_file(src, dst)
 
-                        # Default: copy other allowed paths
-                        if dest_path.exists():
-                            if dest_path.is_dir():
-                                shutil.rmtree(dest_path)
-                            else:
-                                dest_path.unlink()
-                        if item.is_dir():
-                            shutil.copytree(item, dest_path)
-                        else:
-                            shutil.copy2(item, dest_path)
 
-                    # Merge .gitignore from template
-                    merge_gitignore(project_path, source_dir, verbose=verbose, tracker=tracker)
-                    
+def clone_file(src: Path, dst: Path) -> None:
+    """Copy src to dst as a reflink where the filesystem supports it.
+
+    Tries the FICLONE ioctl (btrfs, xfs, ...), then os.copy_file_range (which
+    can share extents in-kernel), then a plain copy. Filesystems that reject
+    FICLONE are remembered so the ioctl is not retried for every file.
+    """
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        fcntl = None
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        dev = os.fstat(fdst.fileno()).st_dev
+        if fcntl is not None and dev not in _reflink_unsupported:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                _reflink_unsupported.add(dev)
+        if hasattr(os, "copy_file_range"):
+            try:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+            except OSError:
+                pass  # e.g. EXDEV on older kernels
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst)
+
+
+
+def swap_sibling(dest: Path, tag: str) -> Path:
+    """Name a hidden sibling of dest used while swapping it (same directory, so renames stay atomic)."""
+    return dest.with_name(f".{dest.name}.{tag}-{os.getpid()}-{random.getrandbits(32):08x}")
+
+
+def recover_interrupted_swap(dest: Path, keep: tuple[str, ...] = ()) -> None:
+    """Finish or roll back a swap of dest that was interrupted (e.g. by a crash), then drop leftovers.
+
+    A swap renames dest aside (.<name>.old-*), moves the kept entries from
+    it into the staged tree (.<name>.new-*) and renames that into place. If
+    dest is missing, the staged tree is used once it holds the kept entries,
+    else the old tree is restored.
+    """
+    asides = sorted(dest.parent.glob(f".{dest.name}.old-*"))
+    staged = sorted(dest.parent.glob(f".{dest.name}.new-*"))
+    if not dest.exists() and asides:
+        aside = asides[-1]
+        moved = [new for new in staged if any((new / name).exists() and not (aside / name).exists() for name in keep)]
+        if moved:
+            os.rename(moved[-1], dest)
+        else:
+            os.rename(aside, dest)
+    for leftover in asides + staged:
+        if leftover.exists():
+            shutil.rmtree(leftover, ignore_errors=True)
+
+
+def swap_into_place(new: Path, dest: Path, keep: tuple[str, ...] = ()) -> None:
+    """Replace dest with the fully built tree at new using renames only.
+
+    Entries of the old dest named in keep are moved (never copied) into the
+    new tree, replacing the new tree's version. The old tree is renamed
+    aside and deleted only after the new one is in place; an error in
+    between puts everything back. Call recover_interrupted_swap(dest) before
+    staging the new tree.
+    """
+    kept = [name for name in keep if (dest / name).exists()]
+    for name in kept:
+        if (new / name).is_dir():
+            shutil.rmtree(new / name)
+        elif (new / name).exists():
+            (new / name).unlink()
+
+    aside = None
+    if dest.exists():
+        aside = swap_sibling(dest, "old")
+        os.rename(dest, aside)
+    try:
+        for name in kept:
+            os.rename(aside / name, new / name)
+        os.rename(new, dest)
+    except BaseException:
+        for name in kept:
+            if (new / name).exists() and not (aside / name).exists():
+                os.rename(new / name, aside / name)
+        if aside and not dest.exists():
+            os.rename(aside, dest)
+        raise
+    if aside:
+        shutil.rmtree(aside, ignore_errors=True)
+
+
+def handle_specify_extraction(write_tree: Callable[[Path], object], dest: Path, force: bool, verbose: bool = False, tracker: StepTracker | None = None) -> None:
+    """Extract .specify/ directory but preserve memory/ contents unless force=True
+
+    write_tree(path) materializes the new tree at path. It is written to a
+    sibling staging directory and swapped in with renames, carrying the old
+    memory/ over by rename, so the old .specify/ stays intact until the new
+    one is complete.
+    """
+    keep = () if force else ("memory",)
+    recover_interrupted_swap(dest, keep)
+    staging = swap_sibling(dest, "new")
+    staging.mkdir()
+    try:
+        write_tree(staging)
+        preserved = bool(keep) and (dest / "memory").is_dir()
+        swap_into_place(staging, dest, keep)
+        if verbose and not tracker:
+            console.print(f"[cyan]Extracted new .specify/[/cyan]")
+            if preserved:
+                console.print(f"[green]Preserved .specify/memory/[/green]")
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def merge_gitignore(project_path: Path, template_content: str | None, verbose: bool = False, tracker: StepTracker | None = None) -> None:
+    """Merge template .gitignore entries into project .gitignore"""
+    # If template has no .gitignore, nothing to merge
+    if template_content is None:
+        return
+
+    project_gitignore = project_path / ".gitignore"
+
+    # Parse template entries (ignore comments and empty lines)
+    template_lines = set(
+        line.strip()
+        for line in template_content.split('\n')
+        if line.strip() and not line.startswith('#')
+    )
+
+    # Read existing .gitignore if present
+    if project_gitignore.exists():
+        existing_content = project_gitignore.read_text(encoding='utf-8')
+        existing_lines = set(
+            line.strip()
+            for line in existing_content.split('\n')
+            if line.strip() and not line.startswith('#')
+        )
+    else:
+        existing_content = ""
+        existing_lines = set()
+
+    # Find new entries that aren't already present
+    new_entries = template_lines - existing_lines
+
+    if new_entries:
+        # Append new entries
+        with open(project_gitignore, 'a', encoding='utf-8') as f:
+            if existing_content and not existing_content.endswith('\n'):
+                f.write('\n')
+            f.write('\n# Added by spec-kit\n')
+            for entry in sorted(new_entries):
+                f.write(f'{entry}\n')
+        if verbose and not tracker:
+            console.print(f"[cyan]Merged {len(new_entries)} entries into .gitignore[/cyan]")
+    elif verbose and not tracker:
+        console.print(f"[dim].gitignore already up to date[/dim]")
+
+
+def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, repo_owner: str = None, repo_name: str = None, repo_branch: str = None, force: bool = False, cache: TemplateCache | None = None, offline: bool = False, template_source: str | None = None) -> Path:
+    """Download the latest release and extract it to create a new project.
+    Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+    """
+    return download_and_extract_templates(
+        project_path, [ai_assistant], [script_type], is_current_dir,
+        verbose=verbose, tracker=tracker, client=client, debug=debug, repo_owner=repo_owner, repo_name=repo_name,
+        repo_branch=repo_branch, force=force, cache=cache, offline=offline, template_source=template_source,
+    )
+
+
+def download_and_extract_templates(project_path: Path, ai_assistants: list[str], script_types: list[str], is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, repo_owner: str = None, repo_name: str = None, repo_branch: str = None, force: bool = False, cache: TemplateCache | None = None, offline: bool = False, link_mode: str = "copy", template_source: str | None = None) -> Path:
+    """Download the templates for one or more assistants / script types and merge them into one project.
+
+    See extract_templates() for how the archives are merged.
+    """
+    # Step: fetch + download combined
+    if tracker:
+        tracker.start("fetch", "reading template mirror" if template_source else "resolving from cache" if offline else "contacting GitHub API")
+    try:
+        downloads = download_templates(
+            ai_assistants,
+            script_types,
+            verbose=verbose and tracker is None,
+            client=client,
+            debug=debug,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            repo_branch=repo_branch,
+            cache=cache,
+            offline=offline,
+            template_source=template_source,
+        )
+        if tracker:
+            total_size = sum(meta['size'] for _, meta in downloads)
+            release = downloads[0][1]['release']
+            if len(downloads) == 1:
+                tracker.complete("fetch", f"release {release} ({total_size:,} bytes)")
+            else:
+                tracker.complete("fetch", f"release {release} ({len(downloads)} assets, {total_size:,} bytes)")
+            tracker.add("download", "Download template")
+            if len(downloads) == 1:
+                meta = downloads[0][1]
+                tracker.complete("download", f"{meta['filename']} (cached)" if meta.get("cache_hit") else meta['filename'])
+            else:
+                for _, meta in downloads:
+                    key = f"download:{meta['filename']}"
+                    tracker.add(key, meta['filename'], parent="download")
+                    tracker.complete(key, "cached" if meta.get("cache_hit") else f"{meta['size']:,} bytes")
+                tracker.complete("download", f"{len(downloads)} assets")
+    except Exception as e:
+        if tracker:
+            tracker.error("fetch", str(e))
+        else:
+            if verbose:
+                console.print(f"[red]Error downloading template:[/red] {e}")
+        raise
+    
+    try:
+        extract_templates(
+            project_path, downloads, ai_assistants, script_types, is_current_dir,
+            verbose=verbose, tracker=tracker, debug=debug, force=force, cache=cache, link_mode=link_mode,
+        )
+    finally:
+        if tracker:
+            tracker.add("cleanup", "Remove temporary archive")
+        # Release downloaded archives (cached archives stay for the next run)
+        if all(meta.get("cached") for _, meta in downloads):
+            if tracker:
+                tracker.skip("cleanup", "archive kept in mirror" if all(meta.get("mirror") for _, meta in downloads) else "archive kept in cache")
+        else:
+            if tracker:
+                tracker.start("cleanup")
+            for archive, meta in downloads:
+                if not meta.get("cached"):
+                    discard_archive(archive)
+                    if verbose and not tracker:
+                        console.print(f"Cleaned up: {meta['filename']}")
+            if tracker:
+                tracker.complete("cleanup")
+
+    return project_path
+
+
+def extract_templates(project_path: Path, downloads: list[Tuple[Path | BinaryIO, dict]], ai_assistants: list[str], script_types: list[str], is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, debug: bool = False, force: bool = False, cache: TemplateCache | None = None, link_mode: str = "copy") -> Path:
+    """Merge already-downloaded template archives into project_path and restructure branch layouts.
+
+    Archives are read from the cache (or an in-memory buffer) and only the
+    ALLOWED_PATHS members of branch archives, or the RELEASE_PATHS members of
+    release packages, are written, directly to their final location, in a
+    single pass over all archives. Selecting no members at all is an error. When several archives provide the same
+    file, the first assistant / script type listed wins. The archives are
+    only read; releasing them is left to the caller.
+
+    With link_mode "reflink" or "hardlink", cached archives are unpacked once
+    into the cache and files are cloned/linked from there (see
+    materialize_file()); archives outside the cache are always streamed.
+    """
+    if tracker:
+        tracker.add("extract", "Extract template")
+        tracker.start("extract")
+    elif verbose:
+        console.print("Extracting template...")
+    
+    try:
+        # Create project directory only if not using current directory
+        if not is_current_dir:
+            project_path.mkdir(parents=True)
+        
+        with ExitStack() as stack:
+            zip_refs = [stack.enter_context(zipfile.ZipFile(archive, 'r')) for archive, _ in downloads]
+            total_entries = sum(len(zip_ref.infolist()) for zip_ref in zip_refs)
+            if tracker:
+                tracker.start("zip-list")
+                tracker.complete("zip-list", f"{total_entries} entries")
+            elif verbose:
+                console.print(f"[cyan]ZIP contains {total_entries} items[/cyan]")
+
+            # Handle GitHub-style ZIP with a single root directory
+            roots = [archive_root_prefix(zip_ref.namelist()) for zip_ref in zip_refs]
+
+            # Unpack cached archives once so files can be cloned / linked instead of streamed
+            unpacked = {}
+            if link_mode != "copy" and cache:
+                for zip_ref, (archive, _) in zip(zip_refs, downloads):
+                    source_dir = cache.unpack(archive, zip_ref) if isinstance(archive, Path) else None
+                    if source_dir:
+                        unpacked[zip_ref] = source_dir
+
+            # Release manifests' per-file hashes, checked while members are written
+            expected = {zip_ref: meta["members"] for zip_ref, (_, meta) in zip(zip_refs, downloads) if meta.get("members")}
+
+            # Only spec-kit namespaces (and the selected script variants) are extracted
+            items = merge_template_members([
+                select_template_members(zip_ref, root, script_types) for zip_ref, root in zip(zip_refs, roots)
+            ])
+            selected = sum(len(group) for group in items.values())
+            if not selected:
+                names = ", ".join(meta["filename"] for _, meta in downloads)
+                raise RuntimeError(f"No template files found in {names} ({total_entries} entries, none under {', '.join(sorted(ALLOWED_PATHS))} or {', '.join(RELEASE_PATHS)})")
+            release = any(is_release_layout(zip_ref, root) for zip_ref, root in zip(zip_refs, roots))
+
+            if tracker:
+                tracker.start("extracted-summary")
+                tracker.complete("extracted-summary", f"{len(items)} items, {selected} of {total_entries} entries selected")
+                if any(roots):
+                    tracker.add("flatten", "Flatten nested directory")
+                    tracker.complete("flatten")
+            elif verbose:
+                console.print(f"[cyan]Selected {selected} of {total_entries} entries ({len(items)} items)[/cyan]")
+                if any(roots):
+                    console.print(f"[cyan]Found nested directory structure[/cyan]")
+
+            for name, item_members in items.items():
+                dest_path = project_path / name
+
+                # Special handling for .spec-kit/
+                if name == ".spec-kit":
+                    handle_specify_extraction(
+                        lambda dest, group=item_members, prefix=f"{name}/": write_zip_members(group, dest, prefix, unpacked=unpacked, link_mode=link_mode, expected=expected),
+                        dest_path, force, verbose=verbose, tracker=tracker,
+                    )
+                    continue
+
+                # specs/ folder: preserve if exists (unless force)
+                if name == "specs" and dest_path.exists() and not force:
+                    if verbose and not tracker:
+                        console.print(f"[cyan]Preserving existing specs folder[/cyan]")
+                    continue
+
+                # Release .specify/memory/: the constitution is kept unless force
+                if name == ".specify/memory" and dest_path.is_dir() and not force:
+                    if verbose and not tracker:
+                        console.print("[green]Preserved .specify/memory/[/green]")
+                    continue
+
+                # Assistant directories: write the template files next to whatever else is there
+                if name in MERGED_PATHS:
+                    write_zip_members(item_members, project_path, unpacked=unpacked, link_mode=link_mode, expected=expected)
+                    continue
+
+                # Release .specify/ subdirectories are staged and swapped in, leaving the rest of .specify/ alone
+                if name.startswith(".specify/") and dest_path.is_dir():
+                    recover_interrupted_swap(dest_path)
+                    staging = swap_sibling(dest_path, "new")
+                    try:
+                        write_zip_members(item_members, staging, f"{name}/", unpacked=unpacked, link_mode=link_mode, expected=expected)
+                        swap_into_place(staging, dest_path)
+                    finally:
+                        if staging.exists():
+                            shutil.rmtree(staging, ignore_errors=True)
+                    continue
+
+                # Default: replace other allowed paths
+                if dest_path.exists():
+                    if dest_path.is_dir():
+                        shutil.rmtree(dest_path)
+                    else:
+                        dest_path.unlink()
+                write_zip_members(item_members, project_path, unpacked=unpacked, link_mode=link_mode, expected=expected)
+
+            # Merge .gitignore entries from every template
+            template_gitignores = []
+            for zip_ref, root in zip(zip_refs, roots):
+                try:
+                    template_gitignores.append(zip_ref.read(f"{root}.gitignore").decode('utf-8'))
+                except KeyError:
+                    pass
+            merge_gitignore(project_path, "\n".join(template_gitignores) if template_gitignores else None, verbose=verbose, tracker=tracker)
+            if is_current_dir and verbose and not tracker:
+                console.print(f"[cyan]Template files merged into current directory[/cyan]")
+
     except Exception as e:
         if tracker:
             tracker.error("extract", str(e))
@@ -899,20 +2090,14 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
     else:
         if tracker:
             tracker.complete("extract")
-    finally:
+    # Transform branch structure if needed (release packages are laid out already)
+    if release:
         if tracker:
-            tracker.add("cleanup", "Remove temporary archive")
-        # Clean up downloaded ZIP file
-        if zip_path.exists():
-            zip_path.unlink()
-            if tracker:
-                tracker.complete("cleanup")
-            elif verbose:
-                console.print(f"Cleaned up: {zip_path.name}")
-
-    # Transform branch structure if needed (detect if this was a branch download)
+            tracker.add("transform", "Transform branch structure")
+            tracker.skip("transform", "release package")
+        return project_path
     try:
-        transform_branch_structure(project_path, ai_assistant, script_type, tracker)
+        transform_branch_structure(project_path, ai_assistants, script_types, tracker, force=force)
     except Exception as e:
         if verbose and not tracker:
             console.print(f"[yellow]Warning: Could not transform branch structure: {e}[/yellow]")
@@ -927,6 +2112,8 @@ def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None =
     scripts_root = project_path / ".specify" / "scripts"
     if not scripts_root.is_dir():
         return
+    if tracker:
+        tracker.start("chmod")
     failures: list[str] = []
     updated = 0
     for script in scripts_root.rglob("*.sh"):
@@ -1005,8 +2192,13 @@ def move_claude_commands(project_path: Path, tracker: StepTracker | None = None)
             tracker.skip("claude-cmds", "no commands found in template")
 
 
-def transform_branch_structure(project_path: Path, ai_assistant: str, script_type: str, tracker: StepTracker | None = None) -> None:
-    """Transform raw branch download structure to match release package structure."""
+def transform_branch_structure(project_path: Path, ai_assistants: list[str], script_types: list[str], tracker: StepTracker | None = None, force: bool = False) -> None:
+    """Transform raw branch download structure to match release package structure.
+
+    Commands are generated for every assistant in ai_assistants; the first
+    script type is the one referenced from the generated commands. An
+    existing .specify/memory/ is kept unless force=True.
+    """
     if tracker:
         tracker.add("transform", "Transform branch structure")
         tracker.start("transform")
@@ -1023,41 +2215,36 @@ def transform_branch_structure(project_path: Path, ai_assistant: str, script_typ
         specify_dir = project_path / ".specify"
         specify_dir.mkdir(exist_ok=True)
 
-        # Move directories to .specify/
+        # Move directories to .specify/ (swapped in by rename; existing memory/ wins unless force)
         for dirname in ["memory", "scripts", "templates"]:
             src_dir = project_path / dirname
             if src_dir.exists():
                 dest_dir = specify_dir / dirname
-                if dest_dir.exists():
-                    shutil.rmtree(dest_dir)
-                src_dir.rename(dest_dir)
+                if dirname == "memory" and dest_dir.is_dir() and not force:
+                    shutil.rmtree(src_dir)
+                else:
+                    recover_interrupted_swap(dest_dir)
+                    swap_into_place(src_dir, dest_dir)
 
         # Filter scripts by variant and restructure
         scripts_dir = specify_dir / "scripts"
         if scripts_dir.exists():
-            # Keep only the relevant script variant
-            if script_type == "sh":
-                # Keep bash subdirectory, remove powershell
-                bash_dir = scripts_dir / "bash"
-                powershell_dir = scripts_dir / "powershell"
-                if powershell_dir.exists():
-                    shutil.rmtree(powershell_dir)
-            else:  # ps
-                # Keep powershell subdirectory, remove bash
-                bash_dir = scripts_dir / "bash"
-                powershell_dir = scripts_dir / "powershell"
-                if bash_dir.exists():
-                    shutil.rmtree(bash_dir)
+            # Keep only the selected script variants
+            for variant, dirname in SCRIPT_VARIANT_DIRS.items():
+                variant_dir = scripts_dir / dirname
+                if variant not in script_types and variant_dir.exists():
+                    shutil.rmtree(variant_dir)
 
         # Generate AI-specific commands from templates
         templates_dir = specify_dir / "templates"
         commands_dir = templates_dir / "commands" if templates_dir.exists() else None
 
         if commands_dir and commands_dir.exists() and list(commands_dir.glob("*.md")):
-            generate_ai_commands(project_path, ai_assistant, script_type, commands_dir)
+            for ai_assistant in ai_assistants:
+                generate_ai_commands(project_path, ai_assistant, script_types[0], commands_dir)
 
         if tracker:
-            tracker.complete("transform", f"restructured for {ai_assistant}")
+            tracker.complete("transform", f"restructured for {', '.join(ai_assistants)}")
 
     except Exception as e:
         if tracker:
@@ -1067,60 +2254,96 @@ def transform_branch_structure(project_path: Path, ai_assistant: str, script_typ
         raise
 
 
-def generate_ai_commands(project_path: Path, ai_assistant: str, script_type: str, commands_dir: Path) -> None:
-    """Generate AI-specific commands from templates/commands/*.md files."""
-
-    def rewrite_paths(content: str) -> str:
-        """Rewrite paths to use .specify/ prefix (idempotent)."""
-        # Use negative lookbehind to avoid doubling .specify/ prefix
-        content = re.sub(r'(?<!\.specify/)memory/', r'.specify/memory/', content)
-        content = re.sub(r'(?<!\.specify/)scripts/', r'.specify/scripts/', content)
-        content = re.sub(r'(?<!\.specify/)templates/', r'.specify/templates/', content)
-        return content
+class CommandTemplate:
+    """A templates/commands/*.md file compiled once for rendering per (agent, script).
 
-    def extract_yaml_field(content: str, field: str) -> str:
-        """Extract a field from YAML frontmatter."""
-        pattern = rf'^{field}:\s*(.+)$'
-        match = re.search(pattern, content, re.MULTILINE)
-        return match.group(1).strip() if match else ""
-
-    def extract_script_command(content: str, script_variant: str) -> str:
-        """Extract script command for specific variant from YAML frontmatter."""
-        pattern = rf'^\s*{script_variant}:\s*(.+)$'
-        match = re.search(pattern, content, re.MULTILINE)
-        return match.group(1).strip() if match else f"(Missing script command for {script_variant})"
-
-    def clean_yaml_frontmatter(content: str) -> str:
-        """Remove scripts section from YAML frontmatter."""
-        lines = content.split('\n')
+    Compiling parses the frontmatter (description, per-variant script
+    commands), drops the scripts: block and splits the body into literal and
+    placeholder segments. render() then fills the slots with one join and
+    rewrites path prefixes with one combined regex pass. Outputs are
+    memoized, and compiled templates are shared by content hash (see
+    compile_command_template()).
+    """
+    PLACEHOLDER_RE = re.compile(r'(\{SCRIPT\}|\{ARGS\}|__AGENT__)')
+    # Prefix memory/, scripts/ and templates/ with .specify/ (idempotent)
+    PATH_PREFIX_RE = re.compile(r'(?<!\.specify/)(memory/|scripts/|templates/)')
+    DESCRIPTION_RE = re.compile(r'^description:\s*(.+)$', re.MULTILINE)
+    SCRIPT_RES = {variant: re.compile(rf'^\s*{variant}:\s*(.+)$', re.MULTILINE) for variant in SCRIPT_TYPE_CHOICES}
+    TOP_LEVEL_KEY_RE = re.compile(r'^[a-zA-Z].*:')
+
+    def __init__(self, content: str):
+        description = self.DESCRIPTION_RE.search(content)
+        self.description = description.group(1).strip() if description else ""
+        # First "<variant>: <command>" line wins, per variant
+        self.scripts: dict[str, list[str]] = {}
+        for variant, pattern in self.SCRIPT_RES.items():
+            match = pattern.search(content)
+            if match:
+                self.scripts[variant] = self.PLACEHOLDER_RE.split(match.group(1).strip())
+        self.segments = self.PLACEHOLDER_RE.split(self.strip_scripts_block(content))
+        self._rendered: dict[tuple, str] = {}
+
+    @classmethod
+    def strip_scripts_block(cls, content: str) -> str:
+        """Remove the scripts: section (and its indented entries) from the YAML frontmatter."""
         result = []
         in_frontmatter = False
         skip_scripts = False
         dash_count = 0
-
-        for line in lines:
+        for line in content.split('\n'):
             if line == '---':
                 dash_count += 1
-                if dash_count == 1:
-                    in_frontmatter = True
-                elif dash_count == 2:
-                    in_frontmatter = False
+                in_frontmatter = dash_count == 1
                 result.append(line)
                 continue
+            if in_frontmatter:
+                if line == 'scripts:':
+                    skip_scripts = True
+                    continue
+                if skip_scripts and cls.TOP_LEVEL_KEY_RE.match(line):
+                    skip_scripts = False
+                if skip_scripts and line[:1].isspace():
+                    continue
+            result.append(line)
+        return '\n'.join(result)
 
-            if in_frontmatter and line == 'scripts:':
-                skip_scripts = True
-                continue
+    @staticmethod
+    def fill(segments: list[str], values: dict[str, str]) -> str:
+        """Join literal segments with slot values (odd indexes are placeholders)."""
+        return "".join(values[part] if i % 2 else part for i, part in enumerate(segments))
+
+    def render(self, ai_assistant: str, script_type: str, arg_format: str, ext: str = "md") -> str:
+        """Render the command file for one agent / script variant (TOML when ext is "toml")."""
+        key = (ai_assistant, script_type, arg_format, ext)
+        rendered = self._rendered.get(key)
+        if rendered is not None:
+            return rendered
+
+        values = {"{ARGS}": arg_format, "__AGENT__": ai_assistant}
+        script = self.scripts.get(script_type)
+        values["{SCRIPT}"] = self.fill(script, values) if script else f"(Missing script command for {script_type})"
+        content = self.PATH_PREFIX_RE.sub(r'.specify/\1', self.fill(self.segments, values))
+        if ext == "toml":
+            content = f'description = "{self.description}"\n\nprompt = """\n{content}\n"""'
+        self._rendered[key] = content
+        return content
 
-            if in_frontmatter and skip_scripts and re.match(r'^[a-zA-Z].*:', line):
-                skip_scripts = False
 
-            if in_frontmatter and skip_scripts and re.match(r'^\s+', line):
-                continue
+# Compiled command templates by content hash (shared across agents, projects and builds)
+_command_templates: dict[str, CommandTemplate] = {}
 
-            result.append(line)
 
-        return '\n'.join(result)
+def compile_command_template(content: str) -> CommandTemplate:
+    """Return the compiled template for content, compiling it only the first time it is seen."""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    template = _command_templates.get(digest)
+    if template is None:
+        template = _command_templates[digest] = CommandTemplate(content)
+    return template
+
+
+def generate_ai_commands(project_path: Path, ai_assistant: str, script_type: str, commands_dir: Path) -> None:
+    """Generate AI-specific commands from templates/commands/*.md files."""
 
     # Create appropriate directory structure for each AI assistant
     if ai_assistant == "claude":
@@ -1166,45 +2389,2232 @@ def generate_ai_commands(project_path: Path, ai_assistant: str, script_type: str
         arg_format = "$ARGUMENTS"
         ext = "md"
     else:
-        return
-
-    # Process each command template
-    for template_file in commands_dir.glob("*.md"):
-        try:
-            content = template_file.read_text(encoding='utf-8')
-            name = template_file.stem
-
-            # Extract metadata
-            description = extract_yaml_field(content, 'description')
-            script_command = extract_script_command(content, script_type)
-
-            # Apply substitutions
-            content = content.replace('{SCRIPT}', script_command)
-            content = content.replace('{ARGS}', arg_format)
-            content = content.replace('__AGENT__', ai_assistant)
-            content = rewrite_paths(content)
-            content = clean_yaml_frontmatter(content)
-
-            # Write command file in appropriate format
-            output_file = target_dir / f"{name}.{ext}"
-            if ext == "toml":
-                # TOML format for Gemini
-                toml_content = f'description = "{description}"\n\nprompt = """\n{content}\n"""'
-                output_file.write_text(toml_content, encoding='utf-8')
-            else:
-                # Markdown format for others
-                output_file.write_text(content, encoding='utf-8')
+        return
+
+    # Process each command template (compiled once per content, rendered per agent / script)
+    for template_file in commands_dir.glob("*.md"):
+        try:
+            template = compile_command_template(template_file.read_text(encoding='utf-8'))
+            output_file = target_dir / f"{template_file.stem}.{ext}"
+            output_file.write_text(template.render(ai_assistant, script_type, arg_format, ext), encoding='utf-8')
+        except Exception as e:
+            console.print(f"[yellow]Warning: Failed to process command template {template_file.name}: {e}[/yellow]")
+            continue
+
+
+# Where each assistant's generated commands live: (directory, file pattern)
+AGENT_COMMAND_DIRS = {
+    "claude": (".claude/commands/spec-kit", "*.md"),
+    "gemini": (".gemini/commands", "*.toml"),
+    "copilot": (".github/prompts", "*.prompt.md"),
+    "cursor": (".cursor/commands", "*.md"),
+}
+# Record of the template files installed in a project (relative path -> sha256)
+TEMPLATE_MANIFEST = ".specify/template-manifest.json"
+# Machine-local caches kept inside a project (feature index, ...); ignored by git and upgrades
+PROJECT_CACHE_DIR = ".specify/cache"
+# Never touched by upgrades: project memory, specs, local caches and the manifest itself
+UPGRADE_PRESERVED = (".specify/memory/", "specs/", f"{PROJECT_CACHE_DIR}/", TEMPLATE_MANIFEST)
+# Stat caches don't trust entries modified this close to when they were recorded
+# (the file could change again within one coarse filesystem timestamp tick)
+RACY_MTIME_NS = 2_000_000_000
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def managed_template_paths(project_path: Path, ai_assistants: list[str]) -> list[str]:
+    """List the template-managed files of a project: .specify/ (minus memory/) and the agents' command files.
+
+    Returns posix paths relative to project_path.
+    """
+    paths: list[Path] = []
+    specify_dir = project_path / ".specify"
+    if specify_dir.is_dir():
+        paths.extend(p for p in specify_dir.rglob("*") if p.is_file())
+    for ai in ai_assistants:
+        if ai in AGENT_COMMAND_DIRS:
+            directory, pattern = AGENT_COMMAND_DIRS[ai]
+            paths.extend(p for p in (project_path / directory).glob(pattern) if p.is_file())
+        if ai == "gemini" and (project_path / "GEMINI.md").is_file():
+            paths.append(project_path / "GEMINI.md")
+    rels = (path.relative_to(project_path).as_posix() for path in paths)
+    return [rel for rel in rels if not rel.startswith(UPGRADE_PRESERVED)]
+
+
+def managed_template_files(project_path: Path, ai_assistants: list[str]) -> dict[str, str]:
+    """Hash the template-managed files of a project. Returns {posix relative path: sha256}."""
+    return {rel: file_sha256(project_path / rel) for rel in managed_template_paths(project_path, ai_assistants)}
+
+
+def load_template_manifest(project_path: Path) -> dict | None:
+    """Read the installed-template manifest, or None if the project has none (or it is unreadable)."""
+    try:
+        data = json.loads((project_path / TEMPLATE_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and isinstance(data.get("files"), dict) else None
+
+
+def write_template_manifest(project_path: Path, files: dict[str, str], ai_assistants: list[str], script_types: list[str]) -> None:
+    """Record which template files are installed, so a later upgrade can tell template edits from local ones."""
+    manifest_path = project_path / TEMPLATE_MANIFEST
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"version": 1, "ai": ai_assistants, "script": script_types, "files": dict(sorted(files.items()))}
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+
+
+def record_template_manifest(project_path: Path, ai_assistants: list[str], script_types: list[str]) -> None:
+    """Hash the freshly installed template files and write the manifest."""
+    write_template_manifest(project_path, managed_template_files(project_path, ai_assistants), ai_assistants, script_types)
+
+
+def detect_installed_agents(project_path: Path) -> list[str]:
+    """Guess the assistants a project was initialized for from their command directories."""
+    return [ai for ai, (directory, pattern) in AGENT_COMMAND_DIRS.items() if any((project_path / directory).glob(pattern))]
+
+
+def detect_installed_scripts(project_path: Path) -> list[str]:
+    """Guess the script variants a project uses from .specify/scripts/."""
+    scripts_dir = project_path / ".specify" / "scripts"
+    return [variant for variant, dirname in SCRIPT_VARIANT_DIRS.items() if (scripts_dir / dirname).is_dir()]
+
+
+def plan_template_upgrade(project_path: Path, new_files: dict[str, str], old_files: dict[str, str] | None, *, force: bool = False) -> dict[str, list[str]]:
+    """Diff a new template manifest against what is installed.
+
+    Returns {"added", "updated", "removed", "unchanged", "conflicts"} path
+    lists. Without an old manifest every differing file counts as updated
+    and nothing is removed. A file that differs from both the old and the new
+    template was edited locally: it becomes a conflict (kept) unless force.
+    Obsolete files are removed only while they still match the old template.
+    """
+    plan = {"added": [], "updated": [], "removed": [], "unchanged": [], "conflicts": []}
+    old_files = old_files or {}
+    for rel, sha in sorted(new_files.items()):
+        path = project_path / rel
+        if not path.is_file():
+            plan["added"].append(rel)
+            continue
+        current = file_sha256(path)
+        if current == sha:
+            plan["unchanged"].append(rel)
+        elif rel in old_files and current != old_files[rel] and not force:
+            plan["conflicts"].append(rel)
+        else:
+            plan["updated"].append(rel)
+    for rel, sha in sorted(old_files.items()):
+        if rel in new_files or rel.startswith(UPGRADE_PRESERVED):
+            continue
+        path = project_path / rel
+        if not path.is_file():
+            continue
+        if force or file_sha256(path) == sha:
+            plan["removed"].append(rel)
+        else:
+            plan["conflicts"].append(rel)
+    return plan
+
+
+def verify_cache_path(project_path: Path) -> Path:
+    """Per-project stat cache for `specify verify`, kept in the user cache (stat data is machine-local)."""
+    key = hashlib.sha256(str(project_path).encode("utf-8")).hexdigest()[:16]
+    return get_cache_dir() / "verify" / f"{key}.json"
+
+
+def load_verify_cache(project_path: Path) -> dict[str, list]:
+    """Return {path: [size, mtime_ns, sha256]} from the last verify.
+
+    Entries whose mtime falls within RACY_MTIME_NS of when the cache was
+    written are dropped: the file could have changed again within the same
+    timestamp tick, so it has to be hashed (git's "racily clean" rule).
+    """
+    try:
+        data = json.loads(verify_cache_path(project_path).read_text(encoding="utf-8"))
+        written_ns = int(data["written_ns"])
+        entries = data["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    return {rel: entry for rel, entry in entries.items() if entry[1] + RACY_MTIME_NS < written_ns}
+
+
+def save_verify_cache(project_path: Path, entries: dict[str, list]) -> None:
+    cache_path = verify_cache_path(project_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"version": 1, "written_ns": time.time_ns(), "files": entries}), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # the cache only speeds up the next run
+
+
+def verify_template_files(project_path: Path, files: dict[str, str], stat_cache: dict[str, list]) -> tuple[dict[str, list[str]], dict[str, list], int]:
+    """Check installed files against their recorded hashes.
+
+    A file whose size and mtime match the stat cache reuses the cached
+    digest; every other file is hashed (concurrently). Returns
+    ({"ok", "modified", "missing"} path lists, refreshed stat cache,
+    number of files hashed).
+    """
+    stats = {}
+    results = {"ok": [], "modified": [], "missing": []}
+    for rel in sorted(files):
+        try:
+            stats[rel] = (project_path / rel).stat()
+        except OSError:
+            results["missing"].append(rel)
+
+    digests = {}
+    to_hash = []
+    for rel, st in stats.items():
+        cached = stat_cache.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            digests[rel] = cached[2]
+        else:
+            to_hash.append(rel)
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=min(len(to_hash), os.cpu_count() or 4)) as pool:
+            digests.update(zip(to_hash, pool.map(lambda rel: file_sha256(project_path / rel), to_hash)))
+
+    entries = {}
+    for rel, st in stats.items():
+        entries[rel] = [st.st_size, st.st_mtime_ns, digests[rel]]
+        results["ok" if digests[rel] == files[rel] else "modified"].append(rel)
+    return results, entries, len(to_hash)
+
+
+def apply_template_upgrade(project_path: Path, staging_path: Path, plan: dict[str, list[str]]) -> None:
+    """Write added/updated files from staging (atomically, keeping modes) and delete removed ones."""
+    for rel in plan["added"] + plan["updated"]:
+        src, dest = staging_path / rel, project_path / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst, open(src, "rb") as f:
+                shutil.copyfileobj(f, dst)
+            shutil.copymode(src, tmp_name)
+            os.replace(tmp_name, dest)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    for rel in plan["removed"]:
+        path = project_path / rel
+        path.unlink()
+        # Drop directories the removal left empty, up to the project root
+        parent = path.parent
+        while parent != project_path and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+
+# Release asset formats per assistant: (command file extension, argument placeholder)
+AGENT_COMMAND_FORMATS = {
+    "claude": ("md", "$ARGUMENTS"),
+    "gemini": ("toml", "{{args}}"),
+    "copilot": ("prompt.md", "$ARGUMENTS"),
+    "cursor": ("md", "$ARGUMENTS"),
+}
+RELEASE_VERSION_RE = re.compile(r'^v\d+\.\d+\.\d+$')
+# Timestamp stamped on every release zip entry (the earliest a zip can store)
+RELEASE_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+# "<!-- VARIANT:sh <line> -->" comments in plan-template.md
+PLAN_VARIANT_RE = re.compile(r'<!--\s*VARIANT:(\w+)\s+(.*?)\s*-->')
+
+
+def release_asset_name(ai_assistant: str, script_type: str, version: str) -> str:
+    """File name of the release zip for an assistant/script pair (matched by find_template_asset())."""
+    return f"spec-kit-template-{ai_assistant}-{script_type}-{version}.zip"
+
+
+def release_zip_timestamp() -> tuple[int, ...]:
+    """Entry timestamp for release zips: SOURCE_DATE_EPOCH when set, else RELEASE_ZIP_EPOCH."""
+    epoch = os.getenv("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return RELEASE_ZIP_EPOCH
+    return max(tuple(time.gmtime(int(epoch))[:6]), RELEASE_ZIP_EPOCH)
+
+
+def load_release_sources(source_path: Path) -> dict[str, tuple[bytes, int]]:
+    """Read memory/, scripts/, templates/ and agent_templates/ once: {posix path: (content, mode)}.
+
+    Modes are normalized to 0755/0644 from the executable bit so the
+    builder's umask and checkout never leak into the archives.
+    """
+    sources = {}
+    for dirname in ("memory", "scripts", "templates", "agent_templates"):
+        root = source_path / dirname
+        if not root.is_dir():
+            continue
+        for path in root.rglob("*"):
+            if path.is_file():
+                mode = 0o755 if path.stat().st_mode & 0o111 else 0o644
+                sources[path.relative_to(source_path).as_posix()] = (path.read_bytes(), mode)
+    return sources
+
+
+def inject_plan_variant(content: str, ai_assistant: str, script_type: str) -> str:
+    """Fill VARIANT-INJECT in plan-template.md with the script variant's line and drop the VARIANT comments."""
+    content = content.replace("\r", "")
+    variants = {}
+    for match in PLAN_VARIANT_RE.finditer(content):
+        variants.setdefault(match.group(1), match.group(2))
+    if script_type not in variants:
+        console.print(f"[yellow]Warning: no plan-template variant for {script_type}[/yellow]")
+        return content
+    content = content.replace("VARIANT-INJECT", variants[script_type]).replace("__AGENT__", ai_assistant)
+    return "\n".join(line for line in content.split("\n") if not PLAN_VARIANT_RE.search(line))
+
+
+def release_package_files(sources: dict[str, tuple[bytes, int]], ai_assistant: str, script_type: str) -> dict[str, tuple[bytes, int]]:
+    """Lay out one release package in memory: {archive path: (content, mode)}.
+
+    Same layout as a branch install: memory/, the selected script variant
+    (plus top-level scripts) and templates/ (minus commands/) under .specify/,
+    and the assistant's commands rendered by CommandTemplate.
+    """
+    variant_prefix = f"scripts/{SCRIPT_VARIANT_DIRS[script_type]}/"
+    files = {}
+    for rel, (content, mode) in sources.items():
+        if rel.startswith("memory/") or rel.startswith(variant_prefix):
+            files[f".specify/{rel}"] = (content, mode)
+        elif rel.startswith("scripts/") and rel.count("/") == 1:
+            files[f".specify/{rel}"] = (content, mode)
+        elif rel.startswith("templates/") and not rel.startswith("templates/commands/"):
+            if rel == "templates/plan-template.md":
+                content = inject_plan_variant(content.decode("utf-8"), ai_assistant, script_type).encode("utf-8")
+            files[f".specify/{rel}"] = (content, mode)
+
+    directory, _ = AGENT_COMMAND_DIRS[ai_assistant]
+    ext, arg_format = AGENT_COMMAND_FORMATS[ai_assistant]
+    for rel, (content, _) in sources.items():
+        if rel.startswith("templates/commands/") and rel.endswith(".md") and rel.count("/") == 2:
+            # Universal newlines, as Path.read_text() gives generate_ai_commands()
+            text = content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+            rendered = compile_command_template(text).render(ai_assistant, script_type, arg_format, ext)
+            files[f"{directory}/{Path(rel).stem}.{ext}"] = (rendered.encode("utf-8"), 0o644)
+    if ai_assistant == "gemini" and "agent_templates/gemini/GEMINI.md" in sources:
+        files["GEMINI.md"] = sources["agent_templates/gemini/GEMINI.md"]
+    return files
+
+
+def write_reproducible_zip(zip_path: Path, files: dict[str, tuple[bytes, int]]) -> None:
+    """Write files to zip_path so identical inputs give identical bytes.
+
+    Entries are sorted, carry a fixed timestamp and normalized Unix modes,
+    and are deflated at a fixed level. The zip is written next to its final
+    path and renamed into place.
+    """
+    date_time = release_zip_timestamp()
+    tmp_path = zip_path.with_name(f".{zip_path.name}.tmp")
+    try:
+        with zipfile.ZipFile(tmp_path, "w") as zip_ref:
+            for name in sorted(files):
+                content, mode = files[name]
+                info = zipfile.ZipInfo(name, date_time=date_time)
+                info.create_system = 3
+                info.external_attr = (0o100000 | mode) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zip_ref.writestr(info, content, compresslevel=9)
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def build_release_package(sources: dict[str, tuple[bytes, int]], ai_assistant: str, script_type: str, version: str, output_dir: Path) -> dict:
+    """Build one release zip and its manifest (<asset>.manifest.json); returns the manifest."""
+    files = release_package_files(sources, ai_assistant, script_type)
+    asset = release_asset_name(ai_assistant, script_type, version)
+    zip_path = output_dir / asset
+    write_reproducible_zip(zip_path, files)
+    manifest = {
+        "version": 1,
+        "asset": asset,
+        "release": version,
+        "ai": ai_assistant,
+        "script": script_type,
+        "size": zip_path.stat().st_size,
+        "sha256": file_sha256(zip_path),
+        "files": {name: hashlib.sha256(files[name][0]).hexdigest() for name in sorted(files)},
+    }
+    manifest_path = output_dir / f"{asset}.manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def build_release_packages(source_path: Path, version: str, ai_assistants: list[str], script_types: list[str], output_dir: Path, *, jobs: int | None = None) -> list[dict]:
+    """Build every assistant × script release package concurrently from one read of the sources.
+
+    Compression runs outside the GIL, so the variants build in parallel
+    threads. Returns the manifests in assistant, script order.
+    """
+    sources = load_release_sources(source_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    variants = [(ai, script) for ai in ai_assistants for script in script_types]
+    with ThreadPoolExecutor(max_workers=jobs or min(len(variants), os.cpu_count() or 4)) as pool:
+        futures = [pool.submit(build_release_package, sources, ai, script, version, output_dir) for ai, script in variants]
+        return [future.result() for future in futures]
+
+
+MANIFEST_DEFAULT_KEYS = {"ai", "script"}
+MANIFEST_REPO_KEYS = {"path", "ai", "script"}
+
+
+def load_init_manifest(manifest_path: Path) -> tuple[dict, list[dict]]:
+    """Parse a bulk-init manifest into (defaults, repos).
+
+    The manifest is a small YAML subset, read without a YAML dependency:
+
+        defaults:
+          ai: claude
+          script: sh
+        repos:
+          - path: ../backend-api
+            ai: claude,copilot
+          - ../frontend          # a bare entry is a path
+
+    Relative paths resolve against the manifest's directory. Raises
+    ValueError on anything outside that subset.
+    """
+    defaults: dict = {}
+    repos: list[dict] = []
+    section = None
+    entry = None
+    base_dir = manifest_path.resolve().parent
+
+    def key_value(text: str, allowed: set, lineno: int) -> tuple[str, str]:
+        match = re.match(r'^([A-Za-z_][\w-]*):\s*(.*)$', text)
+        if not match:
+            raise ValueError(f"line {lineno}: expected 'key: value', got '{text}'")
+        key, value = match.group(1), match.group(2).strip().strip('"\'')
+        if key not in allowed:
+            raise ValueError(f"line {lineno}: unknown key '{key}' (expected one of: {', '.join(sorted(allowed))})")
+        return key, value
+
+    for lineno, raw in enumerate(manifest_path.read_text(encoding="utf-8").splitlines(), 1):
+        line = re.sub(r'(^|\s)#.*$', '', raw).rstrip()
+        if not line.strip():
+            continue
+        text = line.strip()
+        if not line[0].isspace():
+            if text not in ("defaults:", "repos:"):
+                raise ValueError(f"line {lineno}: expected 'defaults:' or 'repos:', got '{text}'")
+            section, entry = text[:-1], None
+        elif section == "defaults":
+            key, value = key_value(text, MANIFEST_DEFAULT_KEYS, lineno)
+            defaults[key] = value
+        elif section == "repos" and text.startswith("- "):
+            item = text[2:].strip()
+            entry = dict([key_value(item, MANIFEST_REPO_KEYS, lineno)]) if re.match(r'^[\w-]+:(\s|$)', item) else {"path": item.strip('"\'')}
+            repos.append(entry)
+        elif section == "repos" and entry is not None:
+            key, value = key_value(text, MANIFEST_REPO_KEYS, lineno)
+            entry[key] = value
+        else:
+            raise ValueError(f"line {lineno}: unexpected '{text}'")
+
+    for index, repo in enumerate(repos, 1):
+        if not repo.get("path"):
+            raise ValueError(f"repo #{index} has no path")
+        repo["path"] = (base_dir / Path(repo["path"]).expanduser()).resolve()
+    return defaults, repos
+
+
+def check_agent_tools(ai_assistants: list[str]) -> bool:
+    """Check the CLI tools the selected assistants need; print an error for each missing one."""
+    agent_tool_missing = False
+    if "claude" in ai_assistants:
+        if not check_tool("claude", "Install from: https://docs.anthropic.com/en/docs/claude-code/setup"):
+            console.print("[red]Error:[/red] Claude CLI is required for Claude Code projects")
+            agent_tool_missing = True
+    if "gemini" in ai_assistants:
+        if not check_tool("gemini", "Install from: https://github.com/google-gemini/gemini-cli"):
+            console.print("[red]Error:[/red] Gemini CLI is required for Gemini projects")
+            agent_tool_missing = True
+    return not agent_tool_missing
+
+
+def init_repo_from_downloads(project_path: Path, downloads: list[Tuple[Path | bytes, dict]], ai_assistants: list[str], script_types: list[str], *, force: bool, no_git: bool, git_available: bool, debug: bool, cache: TemplateCache | None = None, link_mode: str = "copy") -> StepTracker:
+    """Set up one repo from shared, already-downloaded archives (runs on a worker thread).
+
+    Each call opens its own readers over the archives, so workers never share
+    a file position. Failures are recorded on the returned tracker.
+    """
+    tracker = StepTracker(project_path.name)
+    archives = [(archive if isinstance(archive, Path) else io.BytesIO(archive), meta) for archive, meta in downloads]
+    try:
+        extract_templates(project_path, archives, ai_assistants, script_types, project_path.exists(), verbose=False, tracker=tracker, debug=debug, force=force, cache=cache, link_mode=link_mode)
+        ensure_executable_scripts(project_path, tracker=tracker)
+        if "claude" in ai_assistants:
+            move_claude_commands(project_path, tracker=tracker)
+        record_template_manifest(project_path, ai_assistants, script_types)
+
+        if no_git:
+            tracker.skip("git", "--no-git flag")
+        elif is_git_repo(project_path):
+            tracker.complete("git", "existing repo detected")
+        elif not git_available:
+            tracker.skip("git", "git not available")
+        elif init_git_repo(project_path, quiet=True):
+            tracker.complete("git", "initialized")
+        else:
+            tracker.error("git", "init failed")
+    except typer.Exit:
+        pass  # extract_templates already recorded the error
+    except Exception as e:
+        tracker.error("final", str(e))
+    return tracker
+
+
+def init_repos_parallel(plans: list[tuple[Path, tuple, tuple]], *, jobs: int | None, force: bool, no_git: bool, git_available: bool, skip_tls: bool, debug: bool, repo_owner: str | None, repo_name: str | None, repo_branch: str | None, offline: bool, link_mode: str = "copy", template_source: str | None = None) -> dict[Path, StepTracker]:
+    """Set up each (path, ai_assistants, script_types) plan on a thread pool.
+
+    Each distinct template set is resolved and downloaded once and shared by
+    every repo that uses it. Returns the per-repo trackers; raises
+    typer.Exit(1) if a template cannot be downloaded.
+    """
+    template_sets = list(dict.fromkeys((ais, scripts) for _, ais, scripts in plans))
+    client = get_http_client(verify=not skip_tls)
+    cache = TemplateCache()
+    shared: dict[tuple, list] = {}
+    try:
+        with console.status(f"Fetching {len(template_sets)} template set(s)..."):
+            for ais, scripts in template_sets:
+                shared[(ais, scripts)] = download_templates(
+                    list(ais), list(scripts), verbose=False, client=client, debug=debug,
+                    repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch, cache=cache, offline=offline,
+                    template_source=template_source,
+                )
+    except Exception as e:
+        console.print(Panel(f"Template download failed: {e}", title="Download Error", border_style="red"))
+        for downloads in shared.values():
+            for archive, meta in downloads:
+                if not meta.get("cached"):
+                    discard_archive(archive)
+        raise typer.Exit(1)
+
+    # Workers get cached archive paths or an immutable copy of in-memory archives
+    worker_downloads = {}
+    for key, downloads in shared.items():
+        worker_downloads[key] = []
+        for archive, meta in downloads:
+            if not isinstance(archive, Path):
+                archive.seek(0)
+                data = archive.read()
+                discard_archive(archive)
+                archive = data
+            worker_downloads[key].append((archive, meta))
+
+    jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+    results: dict[Path, StepTracker] = {}
+    with ThreadPoolExecutor(max_workers=min(jobs, len(plans))) as pool:
+        futures = {
+            pool.submit(init_repo_from_downloads, path, worker_downloads[(ais, scripts)], list(ais), list(scripts),
+                        force=force, no_git=no_git, git_available=git_available, debug=debug, cache=cache, link_mode=link_mode): path
+            for path, ais, scripts in plans
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            results[path] = future.result()
+            failed = any(step["status"] == "error" for step in results[path].iter_steps())
+            console.print(f"{'[red]✗[/red]' if failed else '[green]✓[/green]'} {path}")
+    return results
+
+
+def print_init_summary(title: str, plans: list[tuple[Path, tuple, tuple]], results: dict[Path, StepTracker]) -> int:
+    """Print a per-repo summary table for a parallel init; returns the number of failed repos."""
+    from rich.table import Table
+
+    table = Table(title=title, show_lines=False)
+    table.add_column("Repository", style="cyan")
+    table.add_column("AI")
+    table.add_column("Script")
+    table.add_column("Result")
+    table.add_column("Details", style="bright_black")
+    failures = 0
+    for path, ais, scripts in plans:
+        tracker = results[path]
+        errors = [f"{step['label']}: {step['detail']}" for step in tracker.iter_steps() if step["status"] == "error"]
+        if errors:
+            failures += 1
+            table.add_row(str(path), ", ".join(ais), ", ".join(scripts), "[red]failed[/red]", "; ".join(errors))
+        else:
+            git_detail = (tracker.get("git") or {}).get("detail", "")
+            table.add_row(str(path), ", ".join(ais), ", ".join(scripts), "[green]ready[/green]", f"git: {git_detail}" if git_detail else "")
+    console.print()
+    console.print(table)
+    return failures
+
+
+def init_from_manifest(manifest_path: Path, ai_assistant: str | None, script_type: str | None, *, jobs: int | None, force: bool, no_git: bool, ignore_agent_tools: bool, skip_tls: bool, debug: bool, repo_owner: str | None, repo_name: str | None, repo_branch: str | None, offline: bool, link_mode: str = "copy", template_source: str | None = None) -> None:
+    """Initialize every repo listed in a manifest.
+
+    Each distinct template set is resolved and downloaded once; extraction,
+    script permissions, Claude command layout and git init then fan out over
+    a thread pool, and a per-repo summary table is printed at the end.
+    """
+    try:
+        defaults, repos = load_init_manifest(manifest_path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        console.print(Panel(f"Could not read manifest {manifest_path}: {e}", title="Manifest Error", border_style="red"))
+        raise typer.Exit(1)
+    if not repos:
+        console.print(f"[yellow]No repos listed in {manifest_path}[/yellow]")
+        raise typer.Exit(0)
+
+    # Per-repo values win over --ai / --script, which win over the manifest defaults
+    default_script = "ps" if os.name == "nt" else "sh"
+    plans = []
+    for repo in repos:
+        ai_value = repo.get("ai") or ai_assistant or defaults.get("ai")
+        if not ai_value:
+            console.print(f"[red]Error:[/red] No AI assistant for {repo['path']} (set it per repo, in defaults, or with --ai)")
+            raise typer.Exit(1)
+        ais = parse_choice_list(ai_value, AI_CHOICES, "AI assistant")
+        scripts = parse_choice_list(repo.get("script") or script_type or defaults.get("script") or default_script, SCRIPT_TYPE_CHOICES, "script type")
+        plans.append((repo["path"], tuple(ais), tuple(scripts)))
+
+    console.print(Panel.fit(
+        "[bold cyan]Bulk Project Setup[/bold cyan]\n"
+        f"Manifest: [green]{manifest_path}[/green] ({len(plans)} repos)",
+        border_style="cyan"
+    ))
+
+    git_available = no_git or check_tool("git", "https://git-scm.com/downloads")
+    if not git_available:
+        console.print("[yellow]Git not found - will skip repository initialization[/yellow]")
+    if not ignore_agent_tools and not check_agent_tools(sorted({ai for _, ais, _ in plans for ai in ais})):
+        console.print("\n[red]Required AI tool is missing![/red]")
+        console.print("[yellow]Tip:[/yellow] Use --ignore-agent-tools to skip this check")
+        raise typer.Exit(1)
+
+    results = init_repos_parallel(
+        plans, jobs=jobs, force=force, no_git=no_git, git_available=git_available, skip_tls=skip_tls, debug=debug,
+        repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch, offline=offline, link_mode=link_mode,
+        template_source=template_source,
+    )
+    failures = print_init_summary("Bulk initialization summary", plans, results)
+    if failures:
+        console.print(f"\n[red]{failures} of {len(plans)} repos failed[/red]")
+        raise typer.Exit(1)
+    console.print(f"\n[bold green]{len(plans)} repos ready.[/bold green]")
+
+
+# Directories never searched for repositories during workspace discovery
+WORKSPACE_PRUNE_DIRS = {"node_modules", "vendor", "bower_components", ".venv", "venv", "__pycache__", ".tox"}
+
+WORKSPACE_SPECS_README = """# Workspace Specifications
+
+This directory contains feature specifications that target one or more repositories in this workspace.
+
+## Convention-Based Targeting
+
+Specs are automatically routed to target repositories based on naming conventions:
+
+- `backend-*` → Backend repository
+- `frontend-*` → Frontend repository
+- `fullstack-*` → All repositories
+- `*-api` → API/backend repository
+- `*-ui` → UI/frontend repository
+
+See `.specify/workspace.yml` for full convention configuration.
+
+## Creating a New Spec
+
+From anywhere in the workspace:
+
+```bash
+# Convention-based (auto-detects target repo from spec name)
+/specify backend-user-auth
+
+# Explicit target repo
+/specify --repo=attun-backend user-auth
+
+# Multi-repo feature
+/specify fullstack-dashboard
+```
+
+## Capabilities
+
+Capabilities are single-repository implementations. When creating a capability
+for a multi-repo parent spec, you'll be prompted to select the target repository:
+
+```bash
+/plan --capability cap-001
+```
+
+## Workspace Structure
+
+```
+workspace-root/
+  .specify/
+    workspace.yml          # Workspace configuration
+  specs/                   # Centralized specifications
+    feature-id/
+      spec.md
+      plan.md
+      cap-001-name/        # Single-repo capability
+        spec.md
+        plan.md
+  repo-1/                  # Git repository
+  repo-2/                  # Git repository
+```
+"""
+
+
+def find_git_repos(root: Path, max_depth: int = 2) -> list[Path]:
+    """Find git repositories below root (the root itself excluded), sorted by path.
+
+    max_depth counts the .git entry, like `find -maxdepth 2 -name .git`, so
+    the default finds the root's direct children. A .git *file* (worktree or
+    submodule) marks a repo too. Dependency trees in WORKSPACE_PRUNE_DIRS,
+    hidden directories and the inside of a found repo are never descended.
+    """
+    repos: list[Path] = []
+
+    def walk(directory: Path, depth: int) -> None:
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith('.') or entry.name in WORKSPACE_PRUNE_DIRS:
+                continue
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            path = Path(entry.path)
+            if os.path.lexists(os.path.join(entry.path, ".git")):
+                repos.append(path)
+            elif depth + 1 < max_depth:
+                walk(path, depth + 1)
+
+    walk(root, 1)
+    return sorted(repos)
+
+
+def git_dir(repo_path: Path) -> Path | None:
+    """Resolve a checkout's own git directory, following a worktree's .git file."""
+    git_entry = repo_path / ".git"
+    if git_entry.is_dir():
+        return git_entry
+    try:
+        content = git_entry.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    return (repo_path / content[len("gitdir:"):].strip()).resolve()
+
+
+def git_head_branch(repo_path: Path) -> str | None:
+    """Current branch of a checkout read from its HEAD file (None when detached or not a repo)."""
+    directory = git_dir(repo_path)
+    try:
+        head = (directory / "HEAD").read_text(encoding="utf-8").strip() if directory else ""
+    except OSError:
+        return None
+    return head[len("ref: refs/heads/"):] if head.startswith("ref: refs/heads/") else None
+
+
+def git_common_dir(repo_path: Path) -> Path | None:
+    """Resolve the directory holding a repo's shared config, following worktree .git files."""
+    directory = git_dir(repo_path)
+    if directory is None:
+        return None
+    commondir = directory / "commondir"
+    if commondir.is_file():
+        return (directory / commondir.read_text(encoding="utf-8").strip()).resolve()
+    return directory
+
+
+def git_remote_url(repo_path: Path, remote: str = "origin") -> str:
+    """Return a remote's URL by reading the repo's git config directly (no git subprocess)."""
+    common = git_common_dir(repo_path)
+    if common is None:
+        return ""
+    try:
+        config = (common / "config").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
+    in_remote = False
+    for line in config.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            in_remote = re.match(rf'^\[remote\s+"{re.escape(remote)}"\]$', line) is not None
+        elif in_remote:
+            match = re.match(r'^url\s*=\s*(.+)$', line)
+            if match:
+                return match.group(1).strip().strip('"')
+    return ""
+
+
+def github_host(remote_url: str) -> str:
+    """Extract the GitHub host (github.com or an enterprise github.<domain>) from a remote URL."""
+    match = re.search(r'github\.([a-zA-Z0-9.-]+)\.(com|net|org|io)', remote_url)
+    if match:
+        return f"github.{match.group(1)}.{match.group(2)}"
+    match = re.search(r'github\.(com|net|org|io)', remote_url)
+    if match:
+        return f"github.{match.group(1)}"
+    return "unknown"
+
+
+def requires_jira_key(host: str) -> bool:
+    """Jira keys are required on any non-standard GitHub host."""
+    return host not in ("github.com", "unknown")
+
+
+def build_workspace_config(workspace_root: Path, repos: list[Path]) -> str:
+    """Render .specify/workspace.yml for the discovered repos.
+
+    Remote hosts come from each repo's git config file, so no git process is
+    spawned per repo.
+    """
+    lines = [
+        "workspace:",
+        f"  name: {workspace_root.name}",
+        f"  root: {workspace_root}",
+        "  version: 1.0.0",
+        "",
+        "repos:",
+    ]
+    for repo_path in repos:
+        repo_name = repo_path.name
+        host = github_host(git_remote_url(repo_path))
+        # Aliases come from the repo name: the part before the last dash, and the suffix after it
+        base_name, suffix = repo_name.rsplit("-", 1)[0], repo_name.rsplit("-", 1)[-1]
+        lines += [
+            f"  - name: {repo_name}",
+            f"    path: ./{repo_path.relative_to(workspace_root).as_posix()}",
+            f"    aliases: [{base_name}, {suffix}]",
+            f"    github_host: {host}",
+            f"    require_jira: {'true' if requires_jira_key(host) else 'false'}",
+        ]
+    lines += [
+        "",
+        "conventions:",
+        "  prefix_rules:",
+        "    backend-: [attun-backend]",
+        "    frontend-: [attun-frontend]",
+        "    fullstack-: [attun-backend, attun-frontend]",
+        "",
+        "  suffix_rules:",
+        "    -api: [attun-backend]",
+        "    -ui: [attun-frontend]",
+        "",
+        "  defaults:",
+        "    ambiguous_prompt: true",
+        "    default_repo: null",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def init_workspace(workspace_path: Path, *, force: bool, auto_init: bool, ai_assistant: str | None, script_type: str | None, jobs: int | None, skip_tls: bool, debug: bool, repo_owner: str | None, repo_name: str | None, repo_branch: str | None, offline: bool, link_mode: str = "copy", template_source: str | None = None) -> None:
+    """Initialize a multi-repo workspace: discover repos, write workspace.yml and specs/.
+
+    With auto_init, repos without .specify/ are initialized concurrently from
+    one shared template download.
+    """
+    config_file = workspace_path / ".specify" / "workspace.yml"
+    if not workspace_path.is_dir():
+        console.print(f"[red]Error:[/red] Workspace directory not found: {workspace_path}")
+        raise typer.Exit(1)
+    if config_file.exists() and not force:
+        console.print(f"[red]Error:[/red] Workspace already initialized at {workspace_path}")
+        console.print("[yellow]Use --force to reinitialize[/yellow]")
+        raise typer.Exit(1)
+
+    repos = find_git_repos(workspace_path)
+    if not repos:
+        console.print(f"[red]Error:[/red] No git repositories found in {workspace_path}")
+        console.print("Make sure the workspace directory contains at least one git repository.")
+        raise typer.Exit(1)
+
+    console.print(f"[cyan]Found {len(repos)} repositories:[/cyan]")
+    for repo in repos:
+        console.print(f"  - {repo.name}")
+    console.print()
+
+    config = build_workspace_config(workspace_path, repos)
+    config_file.parent.mkdir(parents=True, exist_ok=True)
+    config_file.write_text(config, encoding="utf-8")
+    console.print(f"[green]✓[/green] Created {config_file}")
+
+    specs_dir = workspace_path / "specs"
+    specs_dir.mkdir(exist_ok=True)
+    console.print(f"[green]✓[/green] Created workspace specs directory: {specs_dir}")
+
+    console.print(Panel(config.rstrip(), title="Generated workspace configuration", border_style="cyan"))
+    console.print(f"You can customize the convention rules in {config_file}\nto match your repository naming patterns.\n")
+
+    failures = 0
+    if auto_init:
+        pending = [repo for repo in repos if not (repo / ".specify").exists()]
+        for repo in repos:
+            if repo not in pending:
+                console.print(f"  ⊙ {repo.name} (already initialized)")
+        if pending:
+            ais = tuple(parse_choice_list(ai_assistant or "claude", AI_CHOICES, "AI assistant"))
+            scripts = tuple(parse_choice_list(script_type or ("ps" if os.name == "nt" else "sh"), SCRIPT_TYPE_CHOICES, "script type"))
+            console.print(f"[cyan]Initializing .specify/ in {len(pending)} repositories...[/cyan]")
+            plans = [(repo, ais, scripts) for repo in pending]
+            results = init_repos_parallel(
+                plans, jobs=jobs, force=False, no_git=False, git_available=True, skip_tls=skip_tls, debug=debug,
+                repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch, offline=offline, link_mode=link_mode,
+                template_source=template_source,
+            )
+            failures = print_init_summary("Workspace auto-init summary", plans, results)
+        console.print()
+
+    # Keep workspace config out of the workspace's own repo, if it is one
+    if (workspace_path / ".git").is_dir():
+        gitignore = workspace_path / ".gitignore"
+        existing = gitignore.read_text(encoding="utf-8").splitlines() if gitignore.exists() else []
+        if ".specify/" not in existing:
+            with open(gitignore, "a", encoding="utf-8") as f:
+                f.write("\n# spec-kit workspace configuration\n.specify/\n")
+            console.print("[green]✓[/green] Added .specify/ to .gitignore")
+
+    specs_readme = specs_dir / "README.md"
+    if not specs_readme.exists():
+        specs_readme.write_text(WORKSPACE_SPECS_README, encoding="utf-8")
+        console.print(f"[green]✓[/green] Created {specs_readme}")
+
+    steps_lines = [
+        f"1. Review and customize [cyan]{config_file}[/cyan]",
+        "2. Create your first spec: [bold cyan]/specify <feature-name>[/]",
+        "3. Specs will be routed to repos based on naming conventions",
+    ]
+    console.print(Panel("\n".join(steps_lines), title="Next steps", border_style="cyan", padding=(1,2)))
+    if failures:
+        console.print(f"[red]{failures} of {len(repos)} repos failed to initialize[/red]")
+        raise typer.Exit(1)
+    console.print("\n[green]✅ Workspace initialization complete![/green]")
+
+
+FEATURE_INDEX = f"{PROJECT_CACHE_DIR}/feature-index.json"
+WORKSPACE_SNAPSHOT = f"{PROJECT_CACHE_DIR}/workspace.json"
+# Capability directories inside a feature: cap-001-<name> (or a bare cap-001)
+CAPABILITY_DIR_RE = re.compile(r'^(cap-\d{3}[a-z]?)(?:-|$)')
+# Capability branches / feature IDs: <parent feature ID>-cap-001
+CAPABILITY_ID_RE = re.compile(r'^(.+)-(cap-\d{3}[a-z]?)$')
+
+
+def find_checkout_root(start: Path) -> Path | None:
+    """Nearest directory at or above start that has a .git entry (the worktree itself, in a worktree)."""
+    return next((directory for directory in (start, *start.parents) if (directory / ".git").exists()), None)
+
+
+def find_repo_root(start: Path) -> Path | None:
+    """Repo root for start; inside a worktree, the parent repo's root (as get_repo_root in common.sh)."""
+    checkout = find_checkout_root(start)
+    if checkout is None or (checkout / ".git").is_dir():
+        return checkout
+    common = git_common_dir(checkout)
+    return common.parent if common is not None and common.name == ".git" else checkout
+
+
+def find_workspace_root(start: Path) -> Path | None:
+    """Nearest directory with .specify/workspace.yml, searching up from the parent repo inside a worktree."""
+    checkout = find_checkout_root(start)
+    if checkout is not None and (checkout / ".git").is_file():
+        start = find_repo_root(start)
+    return next((directory for directory in (start, *start.parents) if (directory / ".specify" / "workspace.yml").is_file()), None)
+
+
+def find_specs_root(start: Path) -> Path:
+    """Directory whose specs/ holds the features: the workspace root, else the repo root, else start."""
+    return find_workspace_root(start) or find_repo_root(start) or start
+
+
+def feature_id_from_branch(branch: str) -> str:
+    """Feature ID for a branch name: the part after the last '/' (as get_feature_id in common.sh)."""
+    return branch.rsplit("/", 1)[-1]
+
+
+def ensure_project_cache_dir(cache_dir: Path) -> None:
+    """Create .specify/cache/ with a .gitignore that ignores the directory itself."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("# Machine-local caches written by specify\n*\n", encoding="utf-8")
+
+
+def write_project_cache(path: Path, data: dict) -> None:
+    """Atomically write a compact JSON cache file under .specify/cache/ (which ignores itself in git)."""
+    ensure_project_cache_dir(path.parent)
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class FeatureIndex:
+    """Persistent index of the features and capabilities under specs/.
+
+    Stored as compact JSON in .specify/cache/feature-index.json. Each
+    feature records its directory, parent feature, capability ID (for
+    cap-XXX-* directories) and [size, mtime_ns, sha256] per artifact (files
+    in the feature directory and contracts/). Capabilities are keyed like
+    their branches' feature IDs (<parent>-cap-001), so a lookup is one dict
+    access. Updates are incremental: a directory is re-listed only when its
+    mtime changed and a file is re-hashed only when its size or mtime did.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / FEATURE_INDEX
+        self.dirs: dict[str, dict] = {}
+        self.features: dict[str, dict] = {}
+        self.written_ns = 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != self.VERSION:
+                raise ValueError("feature index version mismatch")
+            self.dirs, self.features, self.written_ns = data["dirs"], data["features"], int(data["written_ns"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def save(self) -> None:
+        """Write the index atomically; the cache directory ignores itself in git."""
+        self.written_ns = time.time_ns()
+        write_project_cache(self.path, {"version": self.VERSION, "written_ns": self.written_ns, "dirs": self.dirs, "features": self.features})
+
+    def _trusted(self, mtime_ns: int) -> bool:
+        # Recorded stat data is only trusted when it predates the last save by more than a timestamp tick
+        return mtime_ns + RACY_MTIME_NS < self.written_ns
+
+    def _listing(self, rel: str, dirs: dict, counts: dict) -> dict | None:
+        """{"mtime", "files", "dirs"} for root/rel, reusing the recorded listing while the mtime is unchanged."""
+        try:
+            mtime_ns = (self.root / rel).stat().st_mtime_ns
+        except OSError:
+            return None
+        listing = self.dirs.get(rel)
+        if not (listing and listing["mtime"] == mtime_ns and self._trusted(mtime_ns)):
+            files, subdirs = [], []
+            with os.scandir(self.root / rel) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+            listing = {"mtime": mtime_ns, "files": sorted(files), "dirs": sorted(subdirs)}
+            counts["scanned"] += 1
+        dirs[rel] = listing
+        return listing
+
+    def _artifacts(self, rel: str, listing: dict, old_artifacts: dict, dirs: dict, counts: dict) -> dict[str, list]:
+        names = list(listing["files"])
+        if "contracts" in listing["dirs"]:
+            contracts = self._listing(f"{rel}/contracts", dirs, counts)
+            names.extend(f"contracts/{name}" for name in (contracts["files"] if contracts else []))
+        artifacts = {}
+        for name in names:
+            path = self.root / rel / name
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            old = old_artifacts.get(name)
+            if old and old[0] == st.st_size and old[1] == st.st_mtime_ns and self._trusted(st.st_mtime_ns):
+                artifacts[name] = old
+            else:
+                artifacts[name] = [st.st_size, st.st_mtime_ns, file_sha256(path)]
+                counts["hashed"] += 1
+        return artifacts
+
+    def _index_feature(self, rel: str, feature_id: str, parent: str | None, capability: str | None, dirs: dict, features: dict, counts: dict) -> None:
+        listing = self._listing(rel, dirs, counts)
+        if listing is None:
+            return
+        old = self.features.get(feature_id) or {}
+        old_artifacts = old.get("artifacts", {}) if old.get("path") == rel else {}
+        entry = {
+            "path": rel,
+            "parent": parent,
+            "capability": capability,
+            "artifacts": self._artifacts(rel, listing, old_artifacts, dirs, counts),
+        }
+        if parent is None:
+            entry["capabilities"] = []
+            for name in listing["dirs"]:
+                match = CAPABILITY_DIR_RE.match(name)
+                if match:
+                    capability_id = f"{feature_id}-{match.group(1)}"
+                    self._index_feature(f"{rel}/{name}", capability_id, feature_id, match.group(1), dirs, features, counts)
+                    entry["capabilities"].append(capability_id)
+        features[feature_id] = entry
+
+    def update(self, rebuild: bool = False) -> dict[str, int]:
+        """Bring the whole index up to date and save it. Returns {"scanned", "hashed"} counts."""
+        if rebuild:
+            self.dirs, self.features = {}, {}
+        counts = {"scanned": 0, "hashed": 0}
+        dirs, features = {}, {}
+        listing = self._listing("specs", dirs, counts)
+        for name in listing["dirs"] if listing else []:
+            self._index_feature(f"specs/{name}", name, None, None, dirs, features, counts)
+        self.dirs, self.features = dirs, features
+        # Nothing re-listed or re-hashed means nothing changed (racy entries always get re-checked)
+        if counts["scanned"] or counts["hashed"] or rebuild:
+            self.save()
+        return counts
+
+    def get(self, feature: str) -> dict | None:
+        """Look up a feature ID or branch name, re-checking only that feature's directory.
+
+        Unknown IDs trigger an incremental update only when specs/ (or the
+        capability's parent feature) changed since the last save.
+        """
+        feature_id = feature_id_from_branch(feature)
+        counts = {"scanned": 0, "hashed": 0}
+        entry = self.features.get(feature_id)
+        if entry is None:
+            match = CAPABILITY_ID_RE.match(feature_id)
+            parent = self.features.get(match.group(1)) if match else None
+            if parent is not None:
+                self._refresh(match.group(1), parent, counts)
+            else:
+                specs = self.dirs.get("specs")
+                try:
+                    unchanged = specs and specs["mtime"] == (self.root / "specs").stat().st_mtime_ns and self._trusted(specs["mtime"])
+                except OSError:
+                    unchanged = not specs
+                if not unchanged:
+                    self.update()
+                    return self.features.get(feature_id)
+        else:
+            self._refresh(entry["parent"] or feature_id, self.features.get(entry["parent"]) if entry["parent"] else entry, counts)
+        if counts["scanned"] or counts["hashed"]:
+            self.save()
+        return self.features.get(feature_id)
+
+    def _refresh(self, feature_id: str, entry: dict, counts: dict) -> None:
+        """Re-index one top-level feature (and its capabilities) in place."""
+        old_capabilities = entry.get("capabilities", [])
+        features: dict[str, dict] = {}
+        self._index_feature(entry["path"], feature_id, None, None, self.dirs, features, counts)
+        for stale in [feature_id, *old_capabilities]:
+            if stale not in features:
+                self.features.pop(stale, None)
+        self.features.update(features)
+        if feature_id not in features:
+            counts["scanned"] += 1  # the feature disappeared: persist its removal
+
+
+PLAN_METADATA_CACHE = f"{PROJECT_CACHE_DIR}/plan-metadata.json"
+AGENT_FILE_TEMPLATE = ".specify/templates/agent-file-template.md"
+# Agent context files kept in sync with the plans: agent key -> path relative to the repo root
+AGENT_CONTEXT_FILES = {
+    "claude": "CLAUDE.md",
+    "gemini": "GEMINI.md",
+    "copilot": ".github/copilot-instructions.md",
+}
+# Technical Context fields of plan.md read into the agent files: key -> bold label
+PLAN_METADATA_FIELDS = {
+    "language": "Language/Version",
+    "dependencies": "Primary Dependencies",
+    "storage": "Storage",
+    "testing": "Testing",
+    "project_type": "Project Type",
+}
+PLAN_FIELD_RE = re.compile(r'^\*\*(' + "|".join(re.escape(label) for label in PLAN_METADATA_FIELDS.values()) + r')\*\*:[ \t]*(.*?)\s*$', re.MULTILINE)
+# Build/test commands suggested for the languages in use (first matching keyword wins)
+LANGUAGE_COMMANDS = (
+    ("Python", "cd src && pytest && ruff check ."),
+    ("Rust", "cargo test && cargo clippy"),
+    ("JavaScript", "npm test && npm run lint"),
+    ("TypeScript", "npm test && npm run lint"),
+)
+AGENT_CONTEXT_RECENT = 3
+
+
+def parse_plan_metadata(text: str) -> dict[str, str]:
+    """Technical Context fields of a plan; unanswered values (NEEDS CLARIFICATION, N/A, [placeholders]) are empty."""
+    labels = {label: key for key, label in PLAN_METADATA_FIELDS.items()}
+    metadata = dict.fromkeys(PLAN_METADATA_FIELDS, "")
+    for label, value in PLAN_FIELD_RE.findall(text):
+        key = labels[label]
+        if metadata[key] or "NEEDS CLARIFICATION" in value or value in ("N/A", "") or value.startswith("["):
+            continue
+        metadata[key] = value
+    return metadata
+
+
+def collect_plan_metadata(root: Path, index: FeatureIndex | None = None) -> list[dict]:
+    """Metadata of every feature and capability plan under root/specs, oldest plan first.
+
+    The feature index finds the plans and their hashes incrementally; parsed
+    metadata is cached per plan hash in .specify/cache/plan-metadata.json, so
+    only new or edited plans are read.
+    """
+    index = index or FeatureIndex(root)
+    index.update()
+    cache_path = root / PLAN_METADATA_CACHE
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("version") != 1:
+            raise ValueError("plan metadata cache version mismatch")
+        cached = cached["plans"]
+    except (OSError, ValueError, KeyError, TypeError):
+        cached = {}
+
+    plans: dict[str, list] = {}
+    results = []
+    for feature_id, entry in index.features.items():
+        artifact = entry["artifacts"].get("plan.md")
+        if artifact is None:
+            continue
+        _, mtime_ns, sha256 = artifact
+        hit = cached.get(feature_id)
+        if hit and hit[0] == sha256:
+            metadata = hit[1]
+        else:
+            try:
+                metadata = parse_plan_metadata((root / entry["path"] / "plan.md").read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                continue
+        plans[feature_id] = [sha256, metadata]
+        results.append({"feature_id": feature_id, "mtime_ns": mtime_ns, **metadata})
+    if plans != cached:
+        write_project_cache(cache_path, {"version": 1, "plans": plans})
+    results.sort(key=lambda plan: (plan["mtime_ns"], plan["feature_id"]))
+    return results
+
+
+def plan_technology(plan: dict) -> str:
+    return " + ".join(value for value in (plan["language"], plan["dependencies"]) if value)
+
+
+def agent_context_sections(plans: list[dict]) -> dict[str, str]:
+    """Generated content of each agent-file placeholder, aggregated over all plans."""
+    technologies: dict[str, list[str]] = {}
+    for plan in plans:
+        for tech in (plan_technology(plan), plan["storage"]):
+            if tech:
+                technologies.setdefault(tech, []).append(plan["feature_id"])
+    languages = list(dict.fromkeys(plan["language"] for plan in plans if plan["language"]))
+    commands = []
+    for language in languages:
+        command = next((cmd for keyword, cmd in LANGUAGE_COMMANDS if keyword in language), f"# Add commands for {language}")
+        if command not in commands:
+            commands.append(command)
+    web = any("web" in plan["project_type"].lower() for plan in plans)
+    recent = [plan for plan in reversed(plans) if plan_technology(plan)][:AGENT_CONTEXT_RECENT]
+    return {
+        "[EXTRACTED FROM ALL PLAN.MD FILES]": "\n".join(f"- {tech} ({', '.join(features)})" for tech, features in technologies.items()),
+        "[ACTUAL STRUCTURE FROM PLANS]": "backend/\nfrontend/\ntests/" if web else "src/\ntests/",
+        "[ONLY COMMANDS FOR ACTIVE TECHNOLOGIES]": "\n".join(commands),
+        "[LANGUAGE-SPECIFIC, ONLY FOR LANGUAGES IN USE]": "\n".join(f"{language}: Follow standard conventions" for language in languages),
+        "[LAST 3 FEATURES AND WHAT THEY ADDED]": "\n".join(f"- {plan['feature_id']}: Added {plan_technology(plan)}" for plan in recent),
+    }
+
+
+def replace_markdown_section(content: str, heading: str, body: str) -> str:
+    """Replace the body of a `## heading` section (up to the next heading or HTML comment), if present."""
+    pattern = re.compile(rf'^(## {re.escape(heading)}\n)(.*?)(?=^## |^<!-- |\Z)', re.MULTILINE | re.DOTALL)
+    return pattern.sub(lambda m: f"{m.group(1)}{body}\n\n" if body else f"{m.group(1)}\n", content, count=1)
+
+
+def render_agent_context(existing: str | None, template: str | None, project_name: str, sections: dict[str, str], today: str) -> str | None:
+    """New content of an agent context file, or None when it is already current.
+
+    A new file is rendered from the agent-file template. In an existing file
+    only the Active Technologies and Recent Changes sections are regenerated;
+    everything else, manual additions included, is left as written. The
+    Last updated date only moves when a section changed.
+    """
+    if existing is None:
+        if template is None:
+            raise FileNotFoundError(f"Agent file template not found: {AGENT_FILE_TEMPLATE}")
+        content = template.replace("[PROJECT NAME]", project_name).replace("[DATE]", today)
+        for placeholder, value in sections.items():
+            content = content.replace(placeholder, value)
+        return content
+    content = replace_markdown_section(existing, "Active Technologies", sections["[EXTRACTED FROM ALL PLAN.MD FILES]"])
+    content = replace_markdown_section(content, "Recent Changes", sections["[LAST 3 FEATURES AND WHAT THEY ADDED]"])
+    if content == existing:
+        return None
+    return re.sub(r'Last updated: \d{4}-\d{2}-\d{2}', f"Last updated: {today}", content)
+
+
+def update_agent_context(repo_root: Path, specs_root: Path, agents: list[str]) -> tuple[list[dict], dict[str, str]]:
+    """Regenerate the given agents' context files from all plans in one pass.
+
+    Returns (one {"agent", "path", "status"} per file with status created,
+    updated or unchanged, the generated sections). Files are written atomically.
+    """
+    plans = collect_plan_metadata(specs_root)
+    sections = agent_context_sections(plans)
+    template_path = repo_root / AGENT_FILE_TEMPLATE
+    template = template_path.read_text(encoding="utf-8") if template_path.is_file() else None
+    today = time.strftime("%Y-%m-%d")
+    results = []
+    for agent in agents:
+        path = repo_root / AGENT_CONTEXT_FILES[agent]
+        existing = path.read_text(encoding="utf-8") if path.is_file() else None
+        content = render_agent_context(existing, template, repo_root.name, sections, today)
+        if content is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, path)
+        status = "unchanged" if content is None else "created" if existing is None else "updated"
+        results.append({"agent": agent, "path": str(path), "status": status})
+    return results, sections
+
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_INDEX = f"{ARCHIVE_DIR}/index.json"
+ARCHIVE_COMPRESSION = {"deflate": zipfile.ZIP_DEFLATED, "lzma": zipfile.ZIP_LZMA}
+COMPLETION_REPORT = "completion-report.md"
+LEGACY_ARCHIVE_RE = re.compile(r'^(.+)-(\d{8}-\d{6})$')
+TASK_CHECKBOX_RE = re.compile(r'^\s*[-*] \[([ xX])\]', re.MULTILINE)
+
+
+def feature_tasks_complete(feature_dir: Path) -> bool:
+    """True when the feature (or its capabilities) has tasks.md checkboxes and every one is ticked."""
+    found = False
+    for tasks in [feature_dir / "tasks.md", *sorted(feature_dir.glob("cap-*/tasks.md"))]:
+        try:
+            marks = TASK_CHECKBOX_RE.findall(tasks.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            continue
+        if " " in marks:
+            return False
+        found = found or bool(marks)
+    return found
+
+
+def render_completion_report(feature_id: str, titles: dict[str, str], total_files: int, archived_at: str, archive_name: str) -> str:
+    """The completion-report.md stored in a feature archive (as archive-feature.sh writes it)."""
+    lines = [
+        f"# Feature Completion Report: {feature_id}",
+        "",
+        f"**Archived**: {archived_at or 'unknown'}",
+        f"**Original Location**: specs/{feature_id}/",
+        f"**Archive Location**: {ARCHIVE_DIR}/{archive_name}",
+        "",
+        "## Summary",
+        "",
+        "Feature development completed and archived for historical reference.",
+        "",
+        "## Artifacts Archived",
+        "",
+        f"**Total Files**: {total_files}",
+        f"**Markdown Files**: {len(titles)}",
+        "",
+        "### Contents",
+        "```",
+        *titles,
+        "```",
+        "",
+        "## Specification Files",
+        "",
+        *(f"- **{name.rsplit('/', 1)[-1]}**: {title}" for name, title in titles.items()),
+        "",
+        "## Status",
+        "",
+        "✅ Feature development completed",
+        "✅ Specification archived",
+        "✅ Available for historical reference",
+        "",
+        "## Notes",
+        "",
+        "- All specification artifacts preserved",
+        "- Git history maintained in repository",
+        "- Can be referenced in future related work",
+        f"- To restore: `specify archive extract {feature_id}`",
+        "",
+        "---",
+        "",
+        "*Generated by spec-kit archive command*",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def pack_directory(source_dir: Path, target: Path, meta: dict, *, compression: str = "deflate", completion_report: bool = True) -> None:
+    """Pack source_dir into the zip target and remove the directory.
+
+    Members are named relative to source_dir, next to a generated
+    completion-report.md when completion_report is set (replacing one
+    restored from an earlier archive); the zip comment
+    records meta (feature ID, archive time, source) so the index can be
+    rebuilt from the archives alone. The zip is written under a temp name
+    and renamed into place before the directory is removed, so an
+    interrupted run never loses a feature.
+    """
+    if target.exists():
+        raise FileExistsError(f"{target} already exists")
+    paths = sorted(
+        (Path(dirpath, filename).relative_to(source_dir).as_posix(), Path(dirpath, filename))
+        for dirpath, _, filenames in os.walk(source_dir)
+        for filename in filenames
+    )
+    if completion_report:
+        # A report restored from an earlier archive is regenerated, not stored twice
+        paths = [(rel, path) for rel, path in paths if rel != COMPLETION_REPORT]
+    titles = {}
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with zipfile.ZipFile(tmp_path, "w", ARCHIVE_COMPRESSION[compression], compresslevel=9 if compression == "deflate" else None) as zf:
+            for rel, path in paths:
+                zf.write(path, rel)
+                if completion_report and rel.endswith(".md"):
+                    with open(path, encoding="utf-8", errors="replace") as f:
+                        titles[rel] = f.readline().strip().removeprefix("# ")
+            if completion_report:
+                zf.writestr(COMPLETION_REPORT, render_completion_report(meta["feature_id"], titles, len(paths), meta["archived_at"], target.name))
+            zf.comment = json.dumps(meta).encode()
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    shutil.rmtree(source_dir)
+
+
+def pack_feature(root: Path, feature_id: str, *, timestamp: str, compression: str = "deflate") -> tuple[str, dict]:
+    """Archive specs/<feature_id> as archive/<feature_id>-<timestamp>.zip; returns (archive name, index entry)."""
+    archive_dir = root / ARCHIVE_DIR
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    target = archive_dir / f"{feature_id}-{timestamp}.zip"
+    meta = {"feature_id": feature_id, "archived_at": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()), "source": f"specs/{feature_id}"}
+    pack_directory(root / "specs" / feature_id, target, meta, compression=compression)
+    return target.name, archive_entry(target)
+
+
+def pack_legacy_archive(root: Path, dirname: str, *, compression: str = "deflate") -> tuple[str, dict]:
+    """Compress an archive/<feature_id>-<timestamp>/ directory left by archive-feature.sh into a zip of the same name."""
+    source_dir = root / ARCHIVE_DIR / dirname
+    match = LEGACY_ARCHIVE_RE.match(dirname)
+    try:
+        report = (source_dir / COMPLETION_REPORT).read_text(encoding="utf-8")
+        archived = re.search(r'^\*\*Archived\*\*:\s*(.+?)\s*$', report, re.MULTILINE)
+    except (OSError, UnicodeDecodeError):
+        archived = None
+    feature_id = match.group(1)
+    meta = {"feature_id": feature_id, "archived_at": archived.group(1) if archived else None, "source": f"specs/{feature_id}"}
+    target = source_dir.with_name(f"{dirname}.zip")
+    pack_directory(source_dir, target, meta, compression=compression, completion_report=not (source_dir / COMPLETION_REPORT).is_file())
+    return target.name, archive_entry(target)
+
+
+def legacy_archive_dirs(root: Path) -> list[str]:
+    """Names of the uncompressed archive/<feature_id>-<timestamp>/ directories."""
+    try:
+        return sorted(entry.name for entry in os.scandir(root / ARCHIVE_DIR) if entry.is_dir() and LEGACY_ARCHIVE_RE.match(entry.name))
+    except OSError:
+        return []
+
+
+def archive_entry(archive: Path) -> dict:
+    """Index entry for a feature archive, read from its zip comment and central directory only."""
+    with zipfile.ZipFile(archive) as zf:
+        try:
+            meta = json.loads(zf.comment or b"{}")
+        except ValueError:
+            meta = {}
+        files = {info.filename: [info.file_size, info.compress_size] for info in zf.infolist() if not info.is_dir()}
+    feature_id = meta.get("feature_id") or archive.stem.rsplit("-", 2)[0]
+    return {
+        "feature_id": feature_id,
+        "archived_at": meta.get("archived_at"),
+        "source": meta.get("source") or f"specs/{feature_id}",
+        "bytes": archive.stat().st_size,
+        "files": files,
+    }
+
+
+class ArchiveIndex:
+    """Index of the feature archives under archive/, kept in archive/index.json.
+
+    Maps each archive file name to its feature ID, archive time, size and
+    per-file [size, compressed size], so archives can be listed and searched
+    without opening them. The index is reconciled with the *.zip files on
+    load (new archives are read from their central directory, vanished ones
+    dropped), so it stays correct when archives are added by hand or by
+    concurrent runs.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.dir = root / ARCHIVE_DIR
+        self.path = root / ARCHIVE_INDEX
+        self.archives: dict[str, dict] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != self.VERSION:
+                raise ValueError("archive index version mismatch")
+            self.archives = data["archives"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self.changed = self._sync()
+
+    def _sync(self) -> bool:
+        try:
+            names = {entry.name for entry in os.scandir(self.dir) if entry.name.endswith(".zip") and not entry.name.startswith(".")}
+        except OSError:
+            names = set()
+        changed = False
+        for name in list(self.archives):
+            if name not in names:
+                del self.archives[name]
+                changed = True
+        for name in names - self.archives.keys():
+            try:
+                self.archives[name] = archive_entry(self.dir / name)
+                changed = True
+            except (OSError, zipfile.BadZipFile):
+                continue
+        return changed
+
+    def add(self, name: str, entry: dict) -> None:
+        self.archives[name] = entry
+        self.changed = True
+
+    def save(self) -> None:
+        """Write the index atomically, one sorted line per archive so it diffs well when committed."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        lines = [f"  {json.dumps(name)}: {json.dumps(self.archives[name], sort_keys=True)}" for name in sorted(self.archives)]
+        tmp_path = self.path.with_name(f".index.{os.getpid()}.tmp")
+        tmp_path.write_text(f'{{"version": {self.VERSION}, "archives": {{\n' + ",\n".join(lines) + "\n}}\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+    def find(self, feature: str) -> str | None:
+        """Archive name for an archive file name, or the most recent archive of a feature ID / branch name."""
+        if feature in self.archives:
+            return feature
+        feature_id = feature_id_from_branch(feature)
+        names = [name for name, entry in self.archives.items() if entry["feature_id"] == feature_id]
+        return max(names) if names else None
+
+
+SEARCH_INDEX = f"{PROJECT_CACHE_DIR}/search.sqlite"
+SEARCH_SCOPES = {"all": "%", "specs": "specs/%", "archive": f"{ARCHIVE_DIR}/%"}
+# Requirement, success-criterion and task IDs (FR-001, SC-002, T014) and Jira-style keys
+SPEC_ID_RE = re.compile(r'\b([A-Z]{1,10})-?(\d{3,})\b')
+MARKDOWN_HEADING_RE = re.compile(r'^#{1,6}[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+SEARCH_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+SEARCH_WORD_RE = re.compile(r'\w+')
+# bm25() weights of the path, title, headings, ids and body columns
+SEARCH_RANK = "bm25(2.0, 8.0, 4.0, 6.0, 1.0)"
+SEARCH_SNIPPET_WIDTH = 160
+# Longest a query refreshes by directory mtimes alone before every file is stat'ed again
+SEARCH_RESCAN_SECONDS = 300
+
+
+def search_fields(rel: str, text: str) -> tuple[str, str, str]:
+    """(title, headings, normalized IDs) of a markdown document for the search index."""
+    headings = MARKDOWN_HEADING_RE.findall(text)
+    ids = dict.fromkeys(f"{prefix.lower()}{number}" for prefix, number in SPEC_ID_RE.findall(text))
+    return (headings[0] if headings else rel.rsplit("/", 1)[-1]), "\n".join(headings), " ".join(ids)
+
+
+def search_feature(rel: str) -> str | None:
+    """Feature ID a document belongs to: specs/<id>/..., archive/<id>-<timestamp>[.zip]/..."""
+    parts = rel.split("/", 2)
+    if parts[0] == "specs" and len(parts) > 2:
+        return parts[1]
+    if parts[0] == ARCHIVE_DIR and len(parts) > 1:
+        match = LEGACY_ARCHIVE_RE.match(parts[1].split(":", 1)[0].removesuffix(".zip"))
+        return match.group(1) if match else None
+    return None
+
+
+def search_match_expression(query: str) -> str:
+    """Translate a user query into an FTS5 MATCH expression where every term must match.
+
+    Words and "quoted phrases" match as phrases (a trailing * makes a
+    prefix search); IDs such as FR-001 or t014 also match the normalized
+    ids column, so they rank above documents that merely mention them.
+    """
+    terms = []
+    for phrase, word in SEARCH_TERM_RE.findall(query):
+        prefix = not phrase and word.endswith("*")
+        tokens = SEARCH_WORD_RE.findall(phrase or word)
+        if not tokens:
+            continue
+        expression = f'"{" ".join(tokens)}"' + ("*" if prefix else "")
+        spec_id = None if phrase or prefix else SPEC_ID_RE.fullmatch(word.upper())
+        if spec_id:
+            expression = f'(ids : "{spec_id.group(1).lower()}{spec_id.group(2)}" OR {expression})'
+        terms.append(expression)
+    return " AND ".join(terms)
+
+
+def search_snippet(body: str) -> tuple[int | None, str]:
+    """(line number, trimmed line) of the first highlight in a body marked with \\x02/\\x03."""
+    mark = body.find("\x02")
+    if mark < 0:
+        first = next((line.strip() for line in body.splitlines() if line.strip()), "")
+        return None, first[:SEARCH_SNIPPET_WIDTH]
+    start = body.rfind("\n", 0, mark) + 1
+    end = body.find("\n", mark)
+    line = body[start:end if end >= 0 else len(body)]
+    offset = mark - start
+    if len(line) > SEARCH_SNIPPET_WIDTH:
+        cut = max(0, min(offset - SEARCH_SNIPPET_WIDTH // 4, len(line) - SEARCH_SNIPPET_WIDTH))
+        line = ("…" if cut else "") + line[cut:cut + SEARCH_SNIPPET_WIDTH] + ("…" if cut + SEARCH_SNIPPET_WIDTH < len(line) else "")
+    # Close a highlight cut off by the line end or the trim (and drop a dangling close)
+    opened = 0
+    chars = []
+    for char in line:
+        if char == "\x03" and not opened:
+            continue
+        opened += {"\x02": 1, "\x03": -1}.get(char, 0)
+        chars.append(char)
+    return body.count("\n", 0, mark) + 1, "".join(chars).strip() + "\x03" * opened
+
+
+class SearchIndex:
+    """Full-text index of the markdown under specs/ and archive/, including zipped archives.
+
+    Stored in .specify/cache/search.sqlite as an SQLite FTS5 table (path,
+    title, headings, normalized requirement/task IDs and body columns) next
+    to a docs table recording size, mtime_ns and a digest per document
+    (sha256 for files, CRC-32 for zip members) and a dirs table recording
+    each directory's mtime and subdirectories. refresh() re-lists only the
+    directories whose mtime changed (as FeatureIndex does), re-reads a file
+    only when its size or mtime changed and re-indexes it only when its
+    digest did; an unchanged zip is not opened at all. Queries are answered
+    from the inverted index, so their cost follows the number of matching
+    documents rather than the size of the corpus.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root: Path, *, reset: bool = False):
+        import sqlite3
+
+        self.root = root
+        self.path = root / SEARCH_INDEX
+        ensure_project_cache_dir(self.path.parent)
+        self.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self._open(reset)
+        except sqlite3.OperationalError as e:
+            self.db.close()
+            raise RuntimeError(f"Cannot open search index {self.path}: {e}")
+
+    def _version(self) -> int | None:
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except self.db.OperationalError:
+            return None
+        return int(row[0]) if row else None
+
+    def _open(self, reset: bool) -> None:
+        if reset or self._version() != self.VERSION:
+            with self._transaction():
+                # Re-checked under the write lock, so concurrent runs create the schema once
+                if reset or self._version() != self.VERSION:
+                    # One statement at a time: executescript() would commit the write lock away
+                    for statement in f"""
+                        DROP TABLE IF EXISTS fts;
+                        DROP TABLE IF EXISTS docs;
+                        DROP TABLE IF EXISTS containers;
+                        DROP TABLE IF EXISTS dirs;
+                        DROP TABLE IF EXISTS meta;
+                        CREATE TABLE meta(key TEXT PRIMARY KEY, value);
+                        CREATE TABLE docs(id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, dir TEXT, container TEXT, size INTEGER, mtime_ns INTEGER, digest TEXT, title TEXT, feature TEXT);
+                        CREATE INDEX docs_dir ON docs(dir);
+                        CREATE INDEX docs_container ON docs(container);
+                        CREATE TABLE dirs(path TEXT PRIMARY KEY, mtime_ns INTEGER, subdirs TEXT);
+                        CREATE TABLE containers(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER);
+                        CREATE VIRTUAL TABLE fts USING fts5(path, title, headings, ids, body, tokenize='unicode61 remove_diacritics 2');
+                        INSERT INTO fts(fts, rank) VALUES('rank', '{SEARCH_RANK}');
+                        INSERT INTO meta VALUES('version', {self.VERSION}), ('written_ns', 0), ('rescanned_ns', 0)
+                    """.split(";"):
+                        self.db.execute(statement)
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        self.written_ns, self.rescanned_ns = int(meta["written_ns"]), int(meta["rescanned_ns"])
+
+    @contextmanager
+    def _transaction(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _trusted(self, mtime_ns: int) -> bool:
+        # Recorded stat data is only trusted when it predates the last write by more than a timestamp tick
+        return mtime_ns + RACY_MTIME_NS < self.written_ns
+
+    def rescan_due(self) -> bool:
+        """True when the last refresh that stat'ed every file is more than SEARCH_RESCAN_SECONDS old."""
+        return time.time_ns() - self.rescanned_ns > SEARCH_RESCAN_SECONDS * 1_000_000_000
+
+    def refresh(self, *, full: bool = False) -> dict[str, int]:
+        """Bring the index up to date. Returns {"documents", "scanned", "read", "indexed", "removed"} counts.
+
+        Costs one stat per directory under specs/ and archive/: only
+        directories whose mtime changed are re-listed ("scanned"), their
+        markdown files stat'ed, and the zips only when archive/ changed.
+        That sees files created, deleted, renamed or saved by replacing
+        them (as git and most editors do). A file rewritten in place leaves
+        its directory's mtime alone, so full=True re-lists every directory
+        and stats every file and zip as well.
+        """
+        recorded = {row[0]: row[1:] for row in self.db.execute("SELECT path, mtime_ns, subdirs FROM dirs")}
+        counts = {"documents": 0, "scanned": 0, "read": 0, "indexed": 0, "removed": 0}
+        changes, removed, stat_updates, container_updates = [], [], [], []
+        listed, gone = [], []
+        archives = None  # zips in archive/, only when it was re-listed
+        base = os.fspath(self.root)  # plain strings: Path objects cost more than the stat itself
+
+        pending = ["specs", ARCHIVE_DIR]
+        while pending:
+            rel_dir = pending.pop()
+            old_dir = recorded.get(rel_dir)
+            try:
+                mtime_ns = os.stat(f"{base}/{rel_dir}").st_mtime_ns
+            except OSError:
+                if old_dir:
+                    gone.append(rel_dir)
+                if rel_dir == ARCHIVE_DIR:
+                    archives = []
+                continue
+            if old_dir and not full and old_dir[0] == mtime_ns and self._trusted(mtime_ns):
+                pending.extend(f"{rel_dir}/{name}" for name in old_dir[1].split("/") if name)
+                continue
+            files, subdirs, zips = {}, [], []
+            try:
+                with os.scandir(f"{base}/{rel_dir}") as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.name.endswith(".md"):
+                            files[f"{rel_dir}/{entry.name}"] = entry
+                        elif entry.name.endswith(".zip"):
+                            zips.append(entry)
+            except OSError:
+                continue
+            counts["scanned"] += 1
+            listed.append((rel_dir, mtime_ns, "/".join(sorted(subdirs))))
+            gone.extend(f"{rel_dir}/{name}" for name in (old_dir[1].split("/") if old_dir else []) if name and name not in subdirs)
+            pending.extend(f"{rel_dir}/{name}" for name in subdirs)
+            if rel_dir == ARCHIVE_DIR:
+                archives = zips
+
+            known = {row[0]: row[1:] for row in self.db.execute("SELECT path, size, mtime_ns, digest FROM docs WHERE dir = ?", (rel_dir,))}
+            removed.extend(rel for rel in known if rel not in files)
+            for rel, entry in files.items():
+                old = known.get(rel)
+                try:
+                    st = entry.stat()
+                    if old and old[0] == st.st_size and old[1] == st.st_mtime_ns and self._trusted(st.st_mtime_ns):
+                        continue
+                    with open(entry.path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    if old:
+                        removed.append(rel)
+                    continue
+                counts["read"] += 1
+                digest = hashlib.sha256(data).hexdigest()
+                if old and old[2] == digest:
+                    stat_updates.append((st.st_size, st.st_mtime_ns, rel))
+                else:
+                    changes.append((rel, rel_dir, None, st.st_size, st.st_mtime_ns, digest, data.decode("utf-8", errors="replace")))
+
+        # Directories that vanished take everything recorded below them along
+        for rel_dir in gone:
+            below = (rel_dir, f"{rel_dir}/", f"{rel_dir}0")  # '0' sorts right after '/'
+            removed.extend(row[0] for row in self.db.execute("SELECT path FROM docs WHERE dir = ? OR (dir >= ? AND dir < ?)", below))
+
+        known_containers = {}
+        if archives is not None:
+            known_containers = {row[0]: row[1:] for row in self.db.execute("SELECT path, size, mtime_ns FROM containers")}
+        for entry in archives or []:
+            container = f"{ARCHIVE_DIR}/{entry.name}"
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            old = known_containers.pop(container, None)
+            if old and old == (st.st_size, st.st_mtime_ns) and self._trusted(st.st_mtime_ns):
+                continue
+            members = dict(self.db.execute("SELECT path, digest FROM docs WHERE container = ?", (container,)))
+            try:
+                with zipfile.ZipFile(entry.path) as zf:
+                    counts["read"] += 1
+                    for info in zf.infolist():
+                        if info.is_dir() or not info.filename.endswith(".md"):
+                            continue
+                        rel = f"{container}:{info.filename}"
+                        digest = f"crc32:{info.CRC:08x}:{info.file_size}"
+                        if members.pop(rel, None) != digest:
+                            changes.append((rel, None, container, info.file_size, None, digest, zf.read(info).decode("utf-8", errors="replace")))
+            except (OSError, zipfile.BadZipFile):
+                # Unreadable (e.g. being replaced): drop its members and retry on the next refresh
+                known_containers[container] = None
+                continue
+            removed.extend(members)
+            container_updates.append((container, st.st_size, st.st_mtime_ns))
+
+        # Whatever is left of known_containers vanished (or could not be read)
+        for container in known_containers:
+            removed.extend(row[0] for row in self.db.execute("SELECT path FROM docs WHERE container = ?", (container,)))
+        counts.update(indexed=len(changes), removed=len(removed))
+        if changes or removed or stat_updates or container_updates or known_containers or listed or gone or full:
+            with self._transaction():
+                for rel in removed:
+                    self._delete(rel)
+                for rel, rel_dir, container, size, mtime_ns, digest, text in changes:
+                    self._delete(rel)
+                    title, headings, ids = search_fields(rel, text)
+                    doc_id = self.db.execute(
+                        "INSERT INTO docs(path, dir, container, size, mtime_ns, digest, title, feature) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (rel, rel_dir, container, size, mtime_ns, digest, title, search_feature(rel)),
+                    ).lastrowid
+                    self.db.execute("INSERT INTO fts(rowid, path, title, headings, ids, body) VALUES (?, ?, ?, ?, ?, ?)", (doc_id, rel, title, headings, ids, text))
+                self.db.executemany("UPDATE docs SET size = ?, mtime_ns = ? WHERE path = ?", stat_updates)
+                self.db.executemany("INSERT OR REPLACE INTO containers VALUES (?, ?, ?)", container_updates)
+                self.db.executemany("DELETE FROM containers WHERE path = ?", [(container,) for container in known_containers])
+                self.db.executemany("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", [(rel_dir, f"{rel_dir}/", f"{rel_dir}0") for rel_dir in gone])
+                self.db.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", listed)
+                self.written_ns = time.time_ns()
+                self.db.execute("UPDATE meta SET value = ? WHERE key = 'written_ns'", (self.written_ns,))
+                if full:
+                    self.rescanned_ns = self.written_ns
+                    self.db.execute("UPDATE meta SET value = ? WHERE key = 'rescanned_ns'", (self.rescanned_ns,))
+        counts["documents"] = self.db.execute("SELECT count(*) FROM docs").fetchone()[0]
+        return counts
+
+    def _delete(self, rel: str) -> None:
+        row = self.db.execute("SELECT id FROM docs WHERE path = ?", (rel,)).fetchone()
+        if row:
+            self.db.execute("DELETE FROM fts WHERE rowid = ?", row)
+            self.db.execute("DELETE FROM docs WHERE id = ?", row)
+
+    def search(self, query: str, *, limit: int = 10, scope: str = "all") -> list[dict]:
+        """Best-ranked documents matching every term of query, with the first matching line of each.
+
+        Snippets mark matched terms with \\x02 ... \\x03.
+        """
+        expression = search_match_expression(query)
+        if not expression:
+            return []
+        rows = self.db.execute(
+            "SELECT fts.rowid, d.path, d.title, d.feature, d.container, fts.rank FROM fts JOIN docs d ON d.id = fts.rowid "
+            "WHERE fts MATCH ? AND d.path LIKE ? ORDER BY fts.rank LIMIT ?",
+            (expression, SEARCH_SCOPES[scope], limit),
+        ).fetchall()
+        results = []
+        for doc_id, rel, title, feature, container, rank in rows:
+            # Highlighting reads the stored body, so it is only done for the rows returned
+            body = self.db.execute("SELECT highlight(fts, 4, char(2), char(3)) FROM fts WHERE fts MATCH ? AND rowid = ?", (expression, doc_id)).fetchone()[0]
+            line, snippet = search_snippet(body)
+            result = {"path": rel, "line": line, "title": title, "feature": feature, "score": round(-rank, 3), "snippet": snippet}
+            if container:
+                result.update(archive=container.split("/", 1)[1], member=rel.split(":", 1)[1])
+            results.append(result)
+        return results
+
+
+WORKSPACE_CONFIG = ".specify/workspace.yml"
+# Jira key prefix stripped from spec IDs before convention matching (proj-123.backend-api -> backend-api)
+JIRA_PREFIX_RE = re.compile(r'^[a-z]+-[0-9]+\.(.+)$')
+WORKSPACE_SECTION_RE = re.compile(r'^([A-Za-z_][\w-]*):\s*$')
+WORKSPACE_KEY_RE = re.compile(r'^(\s+)(-\s+)?([^:#]+?):\s*(.*?)\s*$')
+# Artifact variables of a feature directory, in the order common.sh prints them
+FEATURE_FILE_VARS = (
+    ("FEATURE_SPEC", "spec.md"),
+    ("IMPL_PLAN", "plan.md"),
+    ("TASKS", "tasks.md"),
+    ("RESEARCH", "research.md"),
+    ("DATA_MODEL", "data-model.md"),
+    ("QUICKSTART", "quickstart.md"),
+    ("CONTRACTS_DIR", "contracts"),
+)
+
+
+def parse_workspace_value(value: str):
+    """Scalar or [a, b] flow-list value of the workspace.yml subset."""
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [item.strip().strip("'\"") for item in value[1:-1].split(",") if item.strip()]
+    if value in ("true", "false"):
+        return value == "true"
+    if value in ("null", "~", ""):
+        return None
+    return value.strip("'\"")
+
+
+def parse_workspace_config(text: str) -> dict:
+    """Parse the workspace.yml layout written by build_workspace_config() (no YAML dependency).
+
+    Returns {"workspace": {...}, "repos": [{"name", "path", ...}],
+    "prefix_rules": [(pattern, [repos])], "suffix_rules": [...],
+    "defaults": {...}}. Rule order is kept.
+    """
+    config = {"workspace": {}, "repos": [], "prefix_rules": [], "suffix_rules": [], "defaults": {}}
+    section = subsection = None
+    for raw in text.splitlines():
+        line = raw.split(" #", 1)[0].rstrip() if not raw.lstrip().startswith("#") else ""
+        if not line.strip():
+            continue
+        top = WORKSPACE_SECTION_RE.match(line)
+        if top:
+            section, subsection = top.group(1), None
+            continue
+        match = WORKSPACE_KEY_RE.match(line)
+        if not match:
+            continue
+        indent, dash, key, value = len(match.group(1)), match.group(2), match.group(3).strip(), match.group(4)
+        if section == "workspace":
+            config["workspace"][key] = parse_workspace_value(value)
+        elif section == "repos":
+            if dash:
+                config["repos"].append({})
+            if config["repos"]:
+                config["repos"][-1][key] = parse_workspace_value(value)
+        elif section == "conventions":
+            if indent <= 2 and not value:
+                subsection = key
+            elif subsection in ("prefix_rules", "suffix_rules"):
+                targets = parse_workspace_value(value)
+                config[subsection].append((key.strip("'\""), targets if isinstance(targets, list) else [targets] if targets else []))
+            elif subsection == "defaults":
+                config["defaults"][key] = parse_workspace_value(value)
+    return config
+
+
+def compile_rule_trie(rules: list, reverse: bool = False) -> dict:
+    """Character trie of convention patterns; a node's "" key holds the repos of a pattern ending there.
+
+    Suffix rules are compiled over the reversed patterns, so both kinds are
+    matched with one walk over the name, independent of the number of rules.
+    """
+    root: dict = {}
+    for pattern, targets in rules:
+        node = root
+        for char in (pattern[::-1] if reverse else pattern):
+            node = node.setdefault(char, {})
+        node.setdefault("", []).extend(target for target in targets if target not in node.get("", ()))
+    return root
+
+
+def match_rule_trie(trie: dict, name: str, matched: set) -> None:
+    """Add the repos of every pattern in trie that is a prefix of name."""
+    node = trie
+    for char in name:
+        matched.update(node.get("", ()))
+        node = node.get(char)
+        if node is None:
+            return
+    matched.update(node.get("", ()))
+
+
+class WorkspaceRouter:
+    """Parsed workspace.yml with the convention rules compiled into tries.
+
+    load() keeps a JSON snapshot in .specify/cache/workspace.json, keyed by
+    the config's mtime and size, so the YAML is only re-parsed after it
+    changes. Routing a spec walks its name once through the prefix trie and
+    once through the suffix trie.
+    """
+
+    VERSION = 1
+
+    def __init__(self, workspace_root: Path, config: dict, prefix_trie: dict | None = None, suffix_trie: dict | None = None):
+        self.root = workspace_root
+        self.config = config
+        self.repos = {repo["name"]: repo for repo in config["repos"] if repo.get("name")}
+        self.prefix_trie = compile_rule_trie(config["prefix_rules"]) if prefix_trie is None else prefix_trie
+        self.suffix_trie = compile_rule_trie(config["suffix_rules"], reverse=True) if suffix_trie is None else suffix_trie
+
+    @classmethod
+    def load(cls, workspace_root: Path) -> "WorkspaceRouter":
+        """Router for a workspace, from the snapshot while workspace.yml is unchanged."""
+        config_path = workspace_root / WORKSPACE_CONFIG
+        snapshot_path = workspace_root / WORKSPACE_SNAPSHOT
+        st = config_path.stat()
+        key = [st.st_mtime_ns, st.st_size]
+        try:
+            data = json.loads(snapshot_path.read_text(encoding="utf-8"))
+            # A config rewritten within one timestamp tick of the snapshot could keep its key
+            if data.get("version") == cls.VERSION and data["key"] == key and st.st_mtime_ns + RACY_MTIME_NS < data["written_ns"]:
+                return cls(workspace_root, data["config"], data["prefix_trie"], data["suffix_trie"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        router = cls(workspace_root, parse_workspace_config(config_path.read_text(encoding="utf-8")))
+        try:
+            write_project_cache(snapshot_path, {
+                "version": cls.VERSION,
+                "key": key,
+                "written_ns": time.time_ns(),
+                "config": router.config,
+                "prefix_trie": router.prefix_trie,
+                "suffix_trie": router.suffix_trie,
+            })
+        except OSError:
+            pass
+        return router
+
+    def matched_repos(self, spec_id: str) -> list[str]:
+        """Repos the prefix/suffix conventions assign to a spec (Jira key stripped), sorted."""
+        jira = JIRA_PREFIX_RE.match(spec_id)
+        feature_name = jira.group(1) if jira else spec_id
+        matched: set[str] = set()
+        match_rule_trie(self.prefix_trie, feature_name, matched)
+        match_rule_trie(self.suffix_trie, feature_name[::-1], matched)
+        return sorted(matched)
+
+    def target_repos(self, spec_id: str) -> list[str]:
+        """Matched repos, else every repo (get_target_repos_for_spec)."""
+        return self.matched_repos(spec_id) or list(self.repos)
+
+    def repo_path(self, repo_name: str) -> str | None:
+        """Configured path of a repo, ./relative paths resolved against the workspace root."""
+        path = self.repos.get(repo_name, {}).get("path")
+        if not path:
+            return None
+        return f"{self.root}/{path[2:]}" if path.startswith("./") else path
+
+    def require_jira(self, repo_name: str) -> bool:
+        return self.repos.get(repo_name, {}).get("require_jira") is True
+
+    def route(self, spec_id: str) -> dict:
+        """Target repos of a spec with their paths and Jira requirement."""
+        matched = self.matched_repos(spec_id)
+        return {
+            "spec_id": spec_id,
+            "matched": bool(matched),
+            "repos": [
+                {"name": name, "path": self.repo_path(name), "require_jira": self.require_jira(name)}
+                for name in (matched or self.repos)
+            ],
+        }
+
+
+def parse_git_status_v2(output: str) -> dict:
+    """Summarize `git status --porcelain=v2 --branch` output.
+
+    Returns {"branch", "oid", "upstream", "ahead", "behind", "staged",
+    "unstaged", "untracked", "conflicts"}; branch is None when detached and
+    ahead/behind are None without an upstream.
+    """
+    status = {"branch": None, "oid": None, "upstream": None, "ahead": None, "behind": None,
+              "staged": 0, "unstaged": 0, "untracked": 0, "conflicts": 0}
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            status["branch"] = None if head == "(detached)" else head
+        elif line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+            status["oid"] = None if oid == "(initial)" else oid
+        elif line.startswith("# branch.upstream "):
+            status["upstream"] = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line[len("# branch.ab "):].split()
+            status["ahead"], status["behind"] = int(ahead), abs(int(behind))
+        elif line.startswith(("1 ", "2 ")):
+            xy = line[2:4]
+            status["staged"] += xy[0] != "."
+            status["unstaged"] += xy[1] != "."
+        elif line.startswith("u "):
+            status["conflicts"] += 1
+        elif line.startswith("? "):
+            status["untracked"] += 1
+    return status
+
+
+def git_repo_status(repo_path: Path) -> dict:
+    """Branch, upstream divergence and change counts of one checkout from a single porcelain v2 status."""
+    if not (repo_path / ".git").exists():
+        return {"error": "not a git repository"}
+    try:
+        # Optional locks off (as --no-optional-locks): concurrent status runs must not contend for index.lock
+        result = traced_run(
+            ["git", "status", "--porcelain=v2", "--branch"],
+            cwd=repo_path, env={**os.environ, "GIT_OPTIONAL_LOCKS": "0"},
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+    except OSError as e:
+        return {"error": str(e)}
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"git status exited {result.returncode}"}
+    return parse_git_status_v2(result.stdout)
+
+
+def workspace_status(router: WorkspaceRouter, *, jobs: int | None = None) -> list[dict]:
+    """Query every workspace repo's git status concurrently, in workspace.yml order.
+
+    Each entry has the repo name and path, the parse_git_status_v2() fields
+    (or "error"), the branch's feature ID and whether specs/ holds it.
+    """
+    repos = [(name, router.repo_path(name)) for name in router.repos]
+    jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+    statuses: dict[str, dict] = {name: {"error": "path not configured"} for name, path in repos if not path}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(repos)))) as pool:
+        futures = {pool.submit(git_repo_status, Path(path)): name for name, path in repos if path}
+        for future, name in futures.items():
+            statuses[name] = future.result()
+
+    index = FeatureIndex(router.root)
+    results = []
+    for name, path in repos:
+        status = statuses[name]
+        branch = status.get("branch")
+        feature_id = feature_id_from_branch(branch) if branch else None
+        results.append({
+            "name": name,
+            "path": path,
+            **status,
+            "feature_id": feature_id,
+            "has_spec": bool(feature_id) and index.get(feature_id) is not None,
+        })
+    return results
+
+
+def git_context(cwd: Path) -> dict[str, str]:
+    """Repo facts common.sh gathers with several `git rev-parse` forks, from a single one.
+
+    Returns {"toplevel", "git_dir", "common_dir", "branch"} as absolute paths
+    and the abbreviated branch ("HEAD" when detached or unborn); all empty
+    outside a repo.
+    """
+    try:
+        result = traced_run(
+            ["git", "rev-parse", "--show-toplevel", "--git-dir", "--git-common-dir", "--abbrev-ref", "HEAD"],
+            cwd=cwd, capture_output=True, text=True,
+        )
+    except OSError:
+        result = None
+    lines = result.stdout.splitlines() if result else []
+    if len(lines) < 3:
+        return {"toplevel": "", "git_dir": "", "common_dir": "", "branch": ""}
+    # An unborn HEAD still prints "HEAD" before rev-parse fails on it, as the bash capture sees it
+    return {
+        "toplevel": lines[0],
+        "git_dir": str((cwd / lines[1]).resolve()),
+        "common_dir": str((cwd / lines[2]).resolve()),
+        "branch": lines[3] if len(lines) > 3 else "",
+    }
+
+
+def find_capability_dir(parent_dir: str, capability_id: str) -> str:
+    """First cap-XXX-* directory for a capability, or the bare cap-XXX path while none exists yet."""
+    try:
+        names = sorted(entry.name for entry in os.scandir(parent_dir) if entry.is_dir() and entry.name.startswith(f"{capability_id}-"))
+    except OSError:
+        names = []
+    return f"{parent_dir}/{names[0] if names else capability_id}"
+
+
+def feature_paths(cwd: Path, *, target_repo: str | None = None, workspace: bool = True, branch: str | None = None) -> tuple[dict[str, str], list[str]]:
+    """Resolve the feature path variables of get_feature_paths_smart (or get_feature_paths with workspace=False).
+
+    Returns (variables in common.sh order, warnings). Paths are joined as
+    strings, exactly as the bash functions print them. Raises ValueError
+    when a workspace spec matches no repo.
+    """
+    git = git_context(cwd)
+    in_worktree = bool(git["git_dir"]) and git["git_dir"] != git["common_dir"]
+    repo_root = str(Path(git["common_dir"]).parent) if in_worktree else git["toplevel"]
+    current_branch = git["branch"] if branch is None else branch
+    feature_id = feature_id_from_branch(current_branch)
+    warnings: list[str] = []
+
+    variables: dict[str, str] = {}
+    workspace_root = None
+    if workspace:
+        start = Path(repo_root) if in_worktree else cwd
+        workspace_root = next((d for d in (start, *start.parents) if (d / WORKSPACE_CONFIG).is_file()), None)
+    if workspace_root is not None:
+        router = WorkspaceRouter.load(workspace_root)
+        if not target_repo:
+            repos = router.target_repos(feature_id)
+            if not repos:
+                raise ValueError(f"No target repo found for spec: {feature_id}")
+            target_repo = repos[0]
+            if len(repos) > 1:
+                warnings.append(f"Multiple target repos found, using {target_repo}")
+        repo_path = router.repo_path(target_repo)
+        if repo_path is None:
+            warnings.append(f"Repo not found in workspace config: {target_repo}")
+        specs_dir = f"{workspace_root}/specs"
+        variables.update({
+            "WORKSPACE_ROOT": str(workspace_root),
+            "TARGET_REPO": target_repo,
+            "REPO_PATH": repo_path or "",
+        })
+        repo_root = repo_path or ""
+    else:
+        specs_dir = f"{repo_root}/specs"
 
-        except Exception as e:
-            console.print(f"[yellow]Warning: Failed to process command template {template_file.name}: {e}[/yellow]")
+    capability = CAPABILITY_ID_RE.match(feature_id)
+    if capability:
+        parent_id, capability_id = capability.groups()
+        parent_dir = f"{specs_dir}/{parent_id}"
+        feature_dir = find_capability_dir(parent_dir, capability_id)
+    else:
+        parent_id = capability_id = parent_dir = ""
+        feature_dir = f"{specs_dir}/{feature_id}"
+
+    variables.update({
+        "REPO_ROOT": repo_root,
+        "CURRENT_BRANCH": current_branch,
+        "CAPABILITY_ID": capability_id,
+        "PARENT_FEATURE_ID": parent_id,
+        "PARENT_FEATURE_DIR": parent_dir,
+        "FEATURE_DIR": feature_dir,
+    })
+    for name, filename in FEATURE_FILE_VARS:
+        variables[name] = f"{feature_dir}/{filename}"
+    return variables, warnings
+
+
+def parse_choice_list(value: str, choices: dict, kind: str) -> list[str]:
+    """Split a comma-separated option value, validating each entry against choices (order kept, duplicates dropped)."""
+    selected = []
+    for item in (part.strip() for part in value.split(",")):
+        if not item or item in selected:
             continue
+        if item not in choices:
+            console.print(f"[red]Error:[/red] Invalid {kind} '{item}'. Choose from: {', '.join(choices.keys())}")
+            raise typer.Exit(1)
+        selected.append(item)
+    if not selected:
+        console.print(f"[red]Error:[/red] No {kind} given. Choose from: {', '.join(choices.keys())}")
+        raise typer.Exit(1)
+    return selected
 
 
 @app.command()
 def init(
+    ctx: typer.Context,
     project_name: str = typer.Argument(None, help="Name for your new project directory (optional if using --here or --workspace)"),
-    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, or cursor"),
-    script_type: str = typer.Option(None, "--script", help="Script type to use: sh or ps"),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant(s) to use: claude, gemini, copilot, or cursor (comma-separated for several, e.g. claude,copilot)"),
+    script_type: str = typer.Option(None, "--script", help="Script type(s) to use: sh or ps (comma-separated for both, e.g. sh,ps)"),
     ignore_agent_tools: bool = typer.Option(False, "--ignore-agent-tools", help="Skip checks for AI agent tools like Claude Code"),
     no_git: bool = typer.Option(False, "--no-git", help="Skip git repository initialization"),
     here: bool = typer.Option(False, "--here", help="Initialize project in the current directory instead of creating a new one"),
@@ -1215,7 +4625,14 @@ def init(
     debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
     repo_owner: str = typer.Option(None, "--repo-owner", help="GitHub repository owner (default: 'github')"),
     repo_name: str = typer.Option(None, "--repo-name", help="GitHub repository name (default: 'spec-kit')"),
-    repo_branch: str = typer.Option(None, "--repo-branch", help="GitHub repository branch to download from (uses releases by default)"),
+    repo_branch: str = typer.Option(None, "--repo-branch", help="GitHub repository branch to download from (default: SPECIFY_REPO_BRANCH, the uvx --from branch, or main; --template-source uses mirrored releases instead)"),
+    offline: bool = typer.Option(False, "--offline", help="Resolve the template from the local cache only (no network access)"),
+    template_source: str = typer.Option(None, "--template-source", help="Template mirror written by 'specify mirror' (directory, file:// or http(s):// URL) to use instead of GitHub (env: SPECIFY_TEMPLATE_SOURCE)"),
+    from_manifest: Path = typer.Option(None, "--from-manifest", help="Initialize every repo listed in a manifest file (see docs for the format)"),
+    link_mode: str = typer.Option(None, "--link-mode", help="How template files are materialized: copy (default), reflink (clone from the unpacked cache), or hardlink (reflink + hardlink read-only templates)"),
+    jobs: int = typer.Option(None, "--jobs", "-j", min=1, help="Parallel workers for --from-manifest and --workspace --auto-init (default: CPU count + 4, max 32)"),
+    timings: bool = typer.Option(False, "--timings", help="Show step durations in the progress tree and a summary of the slowest HTTP and subprocess calls"),
+    trace_file: Path = typer.Option(None, "--trace-file", help="Write a Chrome trace (chrome://tracing, Perfetto) of the steps, HTTP requests and subprocesses to this file"),
 ):
     """
     Initialize a new Specify project from the latest template.
@@ -1234,50 +4651,75 @@ def init(
     3. Create workspace-level specs/ directory
     4. Optionally initialize .specify/ in each repo (with --auto-init)
 
+    Bulk mode (--from-manifest):
+    Downloads each distinct template once, then sets up every listed repo in
+    parallel (--jobs) and prints a per-repo summary. No prompts are shown.
+
     Examples:
         specify init my-project
         specify init my-project --ai claude
         specify init --here --ai claude
+        specify init my-project --ai claude,copilot --script sh,ps  # Several assistants in one project
         specify init --workspace --auto-init  # Initialize multi-repo workspace
         specify init --workspace ~/git/my-workspace --force
+        specify init my-project --ai claude --offline  # Use cached template only
+        specify init --from-manifest repos.yaml --jobs 8  # Bulk rollout
+        specify init my-project --ai claude --template-source /mnt/spec-kit-mirror  # Air-gapped
+        specify init my-project --ai claude --timings --trace-file init-trace.json
     """
     # Show banner first
     show_banner()
 
-    # Workspace mode: delegate to init-workspace.sh
-    if workspace:
-        workspace_dir = project_name if project_name else str(Path.cwd())
-        workspace_path = Path(workspace_dir).resolve()
+    if timings or trace_file:
+        start_tracing(timings=timings)
+        # Runs on every exit path, including typer.Exit after a failure
+        ctx.call_on_close(lambda: finish_tracing("specify init", trace_file, timings))
+
+    link_mode = link_mode or os.getenv("SPECIFY_LINK_MODE") or "copy"
+    if link_mode not in LINK_MODES:
+        console.print(f"[red]Error:[/red] Invalid link mode '{link_mode}'. Choose from: {', '.join(LINK_MODES)}")
+        raise typer.Exit(1)
+    template_source = template_source or os.getenv("SPECIFY_TEMPLATE_SOURCE")
+
+    if workspace and from_manifest:
+        console.print("[red]Error:[/red] Cannot use --workspace together with --from-manifest")
+        raise typer.Exit(1)
 
+    # Workspace mode: discover repos and write the workspace config
+    if workspace:
+        workspace_path = Path(project_name or Path.cwd()).resolve()
         console.print(Panel.fit(
             "[bold cyan]Multi-Repo Workspace Initialization[/bold cyan]\n"
             f"Workspace directory: [green]{workspace_path}[/green]",
             border_style="cyan"
         ))
+        init_workspace(
+            workspace_path, force=force, auto_init=auto_init, ai_assistant=ai_assistant, script_type=script_type,
+            jobs=jobs, skip_tls=skip_tls, debug=debug,
+            repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch, offline=offline, link_mode=link_mode,
+            template_source=template_source,
+        )
+        return
 
-        # Find init-workspace.sh script from package resources
-        script_resource = files("specify_cli").joinpath("scripts", "bash", "init-workspace.sh")
-        if not script_resource.is_file():
-            console.print(f"[red]Error:[/red] init-workspace.sh not found in package resources")
+    # Bulk mode: every repo listed in the manifest
+    if from_manifest:
+        if project_name or here:
+            console.print("[red]Error:[/red] --from-manifest cannot be combined with a project name or --here")
             raise typer.Exit(1)
-        script_path = Path(str(script_resource))
-
-        # Build command
-        cmd = ["bash", str(script_path), str(workspace_path)]
-        if force:
-            cmd.append("--force")
         if auto_init:
-            cmd.append("--auto-init")
-
-        # Execute workspace initialization
-        try:
-            result = subprocess.run(cmd, check=True)
-            if result.returncode == 0:
-                console.print("\n[green]✅ Workspace initialization complete![/green]")
-            raise typer.Exit(result.returncode)
-        except subprocess.CalledProcessError as e:
-            console.print(f"[red]Error:[/red] Workspace initialization failed: {e}")
+            console.print("[red]Error:[/red] --auto-init can only be used with --workspace flag")
             raise typer.Exit(1)
+        init_from_manifest(
+            from_manifest, ai_assistant, script_type, jobs=jobs, force=force, no_git=no_git,
+            ignore_agent_tools=ignore_agent_tools, skip_tls=skip_tls, debug=debug,
+            repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch, offline=offline, link_mode=link_mode,
+            template_source=template_source,
+        )
+        return
+
+    if jobs is not None:
+        console.print("[red]Error:[/red] --jobs can only be used with --from-manifest or --workspace")
+        raise typer.Exit(1)
 
     # Validate arguments for single-repo mode
     if here and project_name:
@@ -1340,41 +4782,26 @@ def init(
 
     # AI assistant selection
     if ai_assistant:
-        if ai_assistant not in AI_CHOICES:
-            console.print(f"[red]Error:[/red] Invalid AI assistant '{ai_assistant}'. Choose from: {', '.join(AI_CHOICES.keys())}")
-            raise typer.Exit(1)
-        selected_ai = ai_assistant
+        selected_ais = parse_choice_list(ai_assistant, AI_CHOICES, "AI assistant")
     else:
         # Use arrow-key selection interface
-        selected_ai = select_with_arrows(
+        selected_ais = [select_with_arrows(
             AI_CHOICES, 
             "Choose your AI assistant:", 
             "copilot"
-        )
+        )]
+    selected_ai = selected_ais[0]
     
     # Check agent tools unless ignored
     if not ignore_agent_tools:
-        agent_tool_missing = False
-        if selected_ai == "claude":
-            if not check_tool("claude", "Install from: https://docs.anthropic.com/en/docs/claude-code/setup"):
-                console.print("[red]Error:[/red] Claude CLI is required for Claude Code projects")
-                agent_tool_missing = True
-        elif selected_ai == "gemini":
-            if not check_tool("gemini", "Install from: https://github.com/google-gemini/gemini-cli"):
-                console.print("[red]Error:[/red] Gemini CLI is required for Gemini projects")
-                agent_tool_missing = True
-
-        if agent_tool_missing:
+        if not check_agent_tools(selected_ais):
             console.print("\n[red]Required AI tool is missing![/red]")
             console.print("[yellow]Tip:[/yellow] Use --ignore-agent-tools to skip this check")
             raise typer.Exit(1)
     
     # Determine script type (explicit, interactive, or OS default)
     if script_type:
-        if script_type not in SCRIPT_TYPE_CHOICES:
-            console.print(f"[red]Error:[/red] Invalid script type '{script_type}'. Choose from: {', '.join(SCRIPT_TYPE_CHOICES.keys())}")
-            raise typer.Exit(1)
-        selected_script = script_type
+        selected_scripts = parse_choice_list(script_type, SCRIPT_TYPE_CHOICES, "script type")
     else:
         # Auto-detect default
         default_script = "ps" if os.name == "nt" else "sh"
@@ -1383,9 +4810,10 @@ def init(
             selected_script = select_with_arrows(SCRIPT_TYPE_CHOICES, "Choose script type (or press Enter)", default_script)
         else:
             selected_script = default_script
+        selected_scripts = [selected_script]
     
-    console.print(f"[cyan]Selected AI assistant:[/cyan] {selected_ai}")
-    console.print(f"[cyan]Selected script type:[/cyan] {selected_script}")
+    console.print(f"[cyan]Selected AI assistant:[/cyan] {', '.join(selected_ais)}")
+    console.print(f"[cyan]Selected script type:[/cyan] {', '.join(selected_scripts)}")
     
     # Download and set up project
     # New tree-based progress (no emojis); include earlier substeps
@@ -1396,9 +4824,9 @@ def init(
     tracker.add("precheck", "Check required tools")
     tracker.complete("precheck", "ok")
     tracker.add("ai-select", "Select AI assistant")
-    tracker.complete("ai-select", f"{selected_ai}")
+    tracker.complete("ai-select", ", ".join(selected_ais))
     tracker.add("script-select", "Select script type")
-    tracker.complete("script-select", selected_script)
+    tracker.complete("script-select", ", ".join(selected_scripts))
     for key, label in [
         ("fetch", "Fetch latest release"),
         ("download", "Download template"),
@@ -1414,25 +4842,28 @@ def init(
         tracker.add(key, label)
 
     # Use transient so live tree is replaced by the final static render (avoids duplicate output)
-    with Live(tracker.render(), console=console, refresh_per_second=8, transient=True) as live:
-        tracker.attach_refresh(lambda: live.update(tracker.render()))
+    from rich.live import Live
+
+    # Live polls the tracker on its own refresh tick, so bursts of step updates cost one render
+    with Live(console=console, refresh_per_second=8, transient=True, get_renderable=tracker.render):
         try:
-            # Create a httpx client with verify based on skip_tls
-            verify = not skip_tls
-            local_ssl_context = ssl_context if verify else False
-            local_client = httpx.Client(verify=local_ssl_context)
+            # Shared pooled client with verify based on skip_tls
+            local_client = get_http_client(verify=not skip_tls)
 
-            download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch, force=force)
+            download_and_extract_templates(project_path, selected_ais, selected_scripts, here, verbose=False, tracker=tracker, client=local_client, debug=debug, repo_owner=repo_owner, repo_name=repo_name, repo_branch=repo_branch, force=force, cache=TemplateCache(), offline=offline, link_mode=link_mode, template_source=template_source)
 
             # Ensure scripts are executable (POSIX)
             ensure_executable_scripts(project_path, tracker=tracker)
 
             # Move Claude commands if Claude is selected
-            if selected_ai == "claude":
+            if "claude" in selected_ais:
                 tracker.start("claude-cmds")
                 move_claude_commands(project_path, tracker=tracker)
             else:
-                tracker.skip("claude-cmds", f"not using Claude (using {selected_ai})")
+                tracker.skip("claude-cmds", f"not using Claude (using {', '.join(selected_ais)})")
+
+            # Record installed template files for incremental upgrades
+            record_template_manifest(project_path, selected_ais, selected_scripts)
 
             # Git step
             if not no_git:
@@ -1482,24 +4913,26 @@ def init(
         steps_lines.append("1. You're already in the project directory!")
         step_num = 2
 
-    if selected_ai == "claude":
-        steps_lines.append(f"{step_num}. Open in Visual Studio Code and start using / commands with Claude Code")
-        steps_lines.append("   - Claude commands installed to .claude/commands/spec-kit")
-        steps_lines.append("   - Type / in any file to see available commands")
-        steps_lines.append("   - Use /specify to create specifications")
-        steps_lines.append("   - Use /plan to create implementation plans")
-        steps_lines.append("   - Use /tasks to generate tasks")
-    elif selected_ai == "gemini":
-        steps_lines.append(f"{step_num}. Use / commands with Gemini CLI")
-        steps_lines.append("   - Run gemini /specify to create specifications")
-        steps_lines.append("   - Run gemini /plan to create implementation plans")
-        steps_lines.append("   - Run gemini /tasks to generate tasks")
-        steps_lines.append("   - See GEMINI.md for all available commands")
-    elif selected_ai == "copilot":
-        steps_lines.append(f"{step_num}. Open in Visual Studio Code and use [bold cyan]/specify[/], [bold cyan]/plan[/], [bold cyan]/tasks[/] commands with GitHub Copilot")
+    for selected_ai in selected_ais:
+        if selected_ai == "claude":
+            steps_lines.append(f"{step_num}. Open in Visual Studio Code and start using / commands with Claude Code")
+            steps_lines.append("   - Claude commands installed to .claude/commands/spec-kit")
+            steps_lines.append("   - Type / in any file to see available commands")
+            steps_lines.append("   - Use /specify to create specifications")
+            steps_lines.append("   - Use /plan to create implementation plans")
+            steps_lines.append("   - Use /tasks to generate tasks")
+        elif selected_ai == "gemini":
+            steps_lines.append(f"{step_num}. Use / commands with Gemini CLI")
+            steps_lines.append("   - Run gemini /specify to create specifications")
+            steps_lines.append("   - Run gemini /plan to create implementation plans")
+            steps_lines.append("   - Run gemini /tasks to generate tasks")
+            steps_lines.append("   - See GEMINI.md for all available commands")
+        elif selected_ai == "copilot":
+            steps_lines.append(f"{step_num}. Open in Visual Studio Code and use [bold cyan]/specify[/], [bold cyan]/plan[/], [bold cyan]/tasks[/] commands with GitHub Copilot")
+        if selected_ai in ("claude", "gemini", "copilot"):
+            step_num += 1
 
     # Removed script variant step (scripts are transparent to users)
-    step_num += 1
     steps_lines.append(f"{step_num}. Update [bold magenta]CONSTITUTION.md[/bold magenta] with your project's non-negotiable principles")
 
     steps_panel = Panel("\n".join(steps_lines), title="Next steps", border_style="cyan", padding=(1,2))
@@ -1509,6 +4942,904 @@ def init(
     # Removed farewell line per user request
 
 
+@app.command()
+def upgrade(
+    project_dir: str = typer.Argument(None, help="Project to upgrade (default: current directory)"),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant(s) to upgrade commands for (default: detected from the project)"),
+    script_type: str = typer.Option(None, "--script", help="Script type(s) to install (default: detected from the project)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would change without writing anything"),
+    force: bool = typer.Option(False, "--force", help="Also overwrite/remove template files you edited locally"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
+    repo_owner: str = typer.Option(None, "--repo-owner", help="GitHub repository owner (default: SPECIFY_REPO_OWNER, the uvx --from owner, or hcnimi)"),
+    repo_name: str = typer.Option(None, "--repo-name", help="GitHub repository name (default: SPECIFY_REPO_NAME, the uvx --from repo, or spec-kit)"),
+    repo_branch: str = typer.Option(None, "--repo-branch", help="GitHub repository branch to download from (default: SPECIFY_REPO_BRANCH, the uvx --from branch, or main; --template-source uses mirrored releases instead)"),
+    offline: bool = typer.Option(False, "--offline", help="Resolve the template from the local cache only (no network access)"),
+    template_source: str = typer.Option(None, "--template-source", help="Template mirror written by 'specify mirror' (directory, file:// or http(s):// URL) to use instead of GitHub (env: SPECIFY_TEMPLATE_SOURCE)"),
+):
+    """
+    Upgrade an existing project to the latest template, rewriting only files that changed.
+
+    The new template is rendered into a staging directory and its file hashes
+    are compared with the installed files and with the manifest recorded by
+    the last init/upgrade (.specify/template-manifest.json). Only added and
+    changed files are written; obsolete template files are removed.
+    .specify/memory/ and specs/ are never touched, and template files you
+    edited locally are kept (reported as conflicts) unless --force.
+
+    Examples:
+        specify upgrade
+        specify upgrade --dry-run
+        specify upgrade ../other-repo --ai claude,copilot
+    """
+    show_banner()
+
+    project_path = Path(project_dir or Path.cwd()).resolve()
+    if not (project_path / ".specify").is_dir():
+        console.print(f"[red]Error:[/red] {project_path} has no .specify/ directory")
+        console.print("[yellow]Tip:[/yellow] Use 'specify init --here' to set up a project first")
+        raise typer.Exit(1)
+    template_source = template_source or os.getenv("SPECIFY_TEMPLATE_SOURCE")
+
+    old_manifest = load_template_manifest(project_path)
+    if ai_assistant:
+        selected_ais = parse_choice_list(ai_assistant, AI_CHOICES, "AI assistant")
+    else:
+        selected_ais = (old_manifest or {}).get("ai") or detect_installed_agents(project_path)
+    if not selected_ais:
+        console.print("[red]Error:[/red] Could not detect the project's AI assistant; pass --ai")
+        raise typer.Exit(1)
+    if script_type:
+        selected_scripts = parse_choice_list(script_type, SCRIPT_TYPE_CHOICES, "script type")
+    else:
+        selected_scripts = (old_manifest or {}).get("script") or detect_installed_scripts(project_path) or ["ps" if os.name == "nt" else "sh"]
+
+    console.print(Panel.fit(
+        "[bold cyan]Specify Project Upgrade[/bold cyan]\n"
+        f"Project: [green]{project_path}[/green]\n"
+        f"[dim]AI: {', '.join(selected_ais)} · script: {', '.join(selected_scripts)}"
+        + (" · dry run" if dry_run else "") + "[/dim]",
+        border_style="cyan"
+    ))
+
+    tracker = StepTracker("Upgrade Specify Project")
+    for key, label in [
+        ("fetch", "Fetch latest release"),
+        ("download", "Download template"),
+        ("extract", "Render template (staging)"),
+        ("zip-list", "Archive contents"),
+        ("extracted-summary", "Extraction summary"),
+        ("chmod", "Ensure scripts executable"),
+        ("claude-cmds", "Organize Claude commands"),
+        ("diff", "Compare with installed files"),
+        ("apply", "Write changed files"),
+        ("final", "Finalize"),
+    ]:
+        tracker.add(key, label)
+
+    from rich.live import Live
+
+    with tempfile.TemporaryDirectory(prefix="specify-upgrade-") as staging_root:
+        staging_path = Path(staging_root) / project_path.name
+        with Live(console=console, refresh_per_second=8, transient=True, get_renderable=tracker.render):
+            try:
+                download_and_extract_templates(
+                    staging_path, selected_ais, selected_scripts, False, verbose=False, tracker=tracker,
+                    client=get_http_client(verify=not skip_tls), debug=debug, repo_owner=repo_owner, repo_name=repo_name,
+                    repo_branch=repo_branch, cache=TemplateCache(), offline=offline, template_source=template_source,
+                )
+                ensure_executable_scripts(staging_path, tracker=tracker)
+                if "claude" in selected_ais:
+                    move_claude_commands(staging_path, tracker=tracker)
+                else:
+                    tracker.skip("claude-cmds", f"not using Claude (using {', '.join(selected_ais)})")
+
+                tracker.start("diff")
+                new_files = managed_template_files(staging_path, selected_ais)
+                plan = plan_template_upgrade(project_path, new_files, old_manifest and old_manifest["files"], force=force)
+                changes = len(plan["added"]) + len(plan["updated"]) + len(plan["removed"])
+                tracker.complete("diff", f"{changes} to change, {len(plan['unchanged'])} unchanged, {len(plan['conflicts'])} conflicts")
+
+                if dry_run:
+                    tracker.skip("apply", "--dry-run")
+                else:
+                    tracker.start("apply")
+                    apply_template_upgrade(project_path, staging_path, plan)
+                    gitignore = staging_path / ".gitignore"
+                    merge_gitignore(project_path, gitignore.read_text(encoding="utf-8") if gitignore.exists() else None, tracker=tracker)
+                    # Conflicted files keep the old template's hash so they stay flagged as local edits
+                    old_files = (old_manifest or {}).get("files", {})
+                    recorded = dict(new_files)
+                    for rel in plan["conflicts"]:
+                        if rel in old_files:
+                            recorded[rel] = old_files[rel]
+                        else:
+                            recorded.pop(rel, None)
+                    write_template_manifest(project_path, recorded, selected_ais, selected_scripts)
+                    tracker.complete("apply", f"{changes} files")
+                tracker.complete("final", "dry run complete" if dry_run else "project upgraded")
+            except Exception as e:
+                tracker.error("final", str(e))
+                console.print(Panel(f"Upgrade failed: {e}", title="Failure", border_style="red"))
+                raise typer.Exit(1)
+
+    console.print(tracker.render())
+
+    labels = [("added", "green", "+"), ("updated", "yellow", "~"), ("removed", "red", "-"), ("conflicts", "magenta", "!")]
+    lines = [f"[{color}]{mark} {rel}[/{color}]" for key, color, mark in labels for rel in plan[key]]
+    if lines:
+        title = "Changes (dry run)" if dry_run else "Changes"
+        console.print(Panel("\n".join(lines), title=title, border_style="cyan", padding=(1, 2)))
+    console.print(
+        f"\n[bold]{len(plan['added'])} added, {len(plan['updated'])} updated, {len(plan['removed'])} removed, "
+        f"{len(plan['unchanged'])} unchanged[/bold]"
+    )
+    if plan["conflicts"]:
+        console.print(f"[magenta]{len(plan['conflicts'])} locally modified template files were kept; use --force to replace them[/magenta]")
+    if old_manifest is None and not dry_run:
+        console.print("[dim]No previous template manifest found; one has been recorded for future upgrades[/dim]")
+
+
+@app.command()
+def verify(
+    project_dir: str = typer.Argument(None, help="Project to verify (default: current directory)"),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant(s) whose command files are checked for untracked files (default: from the manifest)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the result as JSON"),
+):
+    """
+    Check installed template files against the hashes recorded at init/upgrade.
+
+    Reads .specify/template-manifest.json and reports template files that
+    were modified or deleted, plus untracked files in template-managed
+    directories. Files unchanged since the last verify (same size and
+    mtime) are not re-read, so repeated checks only stat the tree. Exits
+    with status 1 when drift is found.
+
+    Examples:
+        specify verify
+        specify verify ../backend-api --json
+    """
+    project_path = Path(project_dir or Path.cwd()).resolve()
+    manifest = load_template_manifest(project_path)
+    if manifest is None:
+        console.print(f"[red]Error:[/red] {project_path} has no template manifest ({TEMPLATE_MANIFEST})")
+        console.print("[yellow]Tip:[/yellow] Run 'specify upgrade' once to record one")
+        raise typer.Exit(1)
+    selected_ais = parse_choice_list(ai_assistant, AI_CHOICES, "AI assistant") if ai_assistant else manifest.get("ai") or detect_installed_agents(project_path)
+
+    files = manifest["files"]
+    results, entries, hashed = verify_template_files(project_path, files, load_verify_cache(project_path))
+    save_verify_cache(project_path, entries)
+    results["untracked"] = sorted(set(managed_template_paths(project_path, selected_ais)) - set(files))
+    drift = bool(results["modified"] or results["missing"])
+
+    if json_output:
+        print(json.dumps({
+            "project": str(project_path),
+            "ok": not drift,
+            "checked": len(files),
+            "hashed": hashed,
+            "modified": results["modified"],
+            "missing": results["missing"],
+            "untracked": results["untracked"],
+        }, indent=2))
+        raise typer.Exit(1 if drift else 0)
+
+    show_banner()
+    labels = [("modified", "yellow", "~"), ("missing", "red", "-"), ("untracked", "cyan", "?")]
+    lines = [f"[{color}]{mark} {rel}[/{color}]" for key, color, mark in labels for rel in results[key]]
+    if lines:
+        console.print(Panel("\n".join(lines), title="Template Drift", border_style="yellow" if drift else "cyan", padding=(1, 2)))
+    console.print(
+        f"\n[bold]{len(results['ok'])} ok, {len(results['modified'])} modified, {len(results['missing'])} missing, "
+        f"{len(results['untracked'])} untracked[/bold] [dim]({hashed} of {len(files)} files hashed)[/dim]"
+    )
+    if drift:
+        console.print("[yellow]Run 'specify upgrade --force' to restore the template files[/yellow]")
+        raise typer.Exit(1)
+    console.print("[green]Installed template files match the manifest[/green]")
+
+
+@app.command("build-templates")
+def build_templates(
+    version: str = typer.Argument(..., help="Release version, with leading 'v' (e.g. v0.2.0)"),
+    ai_assistant: str = typer.Option(",".join(AI_CHOICES), "--ai", help="AI assistant(s) to build packages for (default: all)"),
+    script_type: str = typer.Option(",".join(SCRIPT_TYPE_CHOICES), "--script", help="Script type(s) to build packages for (default: all)"),
+    source: str = typer.Option(".", "--source", help="Spec Kit checkout containing memory/, scripts/ and templates/"),
+    output: str = typer.Option(".", "--output", "-o", help="Directory to write the zips and manifests to"),
+    jobs: int = typer.Option(None, "--jobs", "-j", min=1, help="Packages to build concurrently (default: one per CPU)"),
+):
+    """
+    Build the release template packages (one zip per assistant × script type).
+
+    Commands are rendered with the same code 'specify init' uses for branch
+    installs, and every variant is built concurrently. Zips are
+    reproducible: entries are sorted with fixed timestamps (SOURCE_DATE_EPOCH
+    if set) and normalized modes, so identical inputs give identical bytes.
+    Each zip gets an <asset>.manifest.json with its SHA-256 and per-file hashes.
+
+    Examples:
+        specify build-templates v0.2.0
+        specify build-templates v0.2.0 --ai claude --script sh -o dist
+    """
+    if not RELEASE_VERSION_RE.match(version):
+        console.print(f"[red]Error:[/red] Version must look like v0.0.0 (got '{version}')")
+        raise typer.Exit(1)
+    selected_ais = parse_choice_list(ai_assistant, AI_CHOICES, "AI assistant")
+    selected_scripts = parse_choice_list(script_type, SCRIPT_TYPE_CHOICES, "script type")
+    source_path = Path(source).resolve()
+    if not (source_path / "templates" / "commands").is_dir():
+        console.print(f"[red]Error:[/red] {source_path} has no templates/commands/ directory")
+        raise typer.Exit(1)
+    output_dir = Path(output).resolve()
+
+    start = time.perf_counter()
+    try:
+        manifests = build_release_packages(source_path, version, selected_ais, selected_scripts, output_dir, jobs=jobs)
+    except (OSError, UnicodeDecodeError) as e:
+        console.print(Panel(f"Build failed: {e}", title="Failure", border_style="red"))
+        raise typer.Exit(1)
+    elapsed = time.perf_counter() - start
+
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style="cyan", box=None, padding=(0, 2))
+    table.add_column("Asset", no_wrap=True)
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("SHA-256")
+    for manifest in manifests:
+        table.add_row(manifest["asset"], str(len(manifest["files"])), f"{manifest['size']:,}", manifest["sha256"][:16])
+    console.print(table)
+    console.print(f"\n[bold green]Built {len(manifests)} packages[/bold green] in {output_dir} [dim]({elapsed:.2f}s)[/dim]")
+
+
+@app.command()
+def mirror(
+    directory: str = typer.Argument(..., help="Mirror directory (created if missing)"),
+    tags: list[str] = typer.Option(None, "--tag", "-t", help="Release tag to mirror (repeat for several; default: the latest release)"),
+    ai_assistant: str = typer.Option(None, "--ai", help="Only mirror the templates for these AI assistant(s), comma-separated (default: every asset)"),
+    script_type: str = typer.Option(None, "--script", help="Only mirror the templates for these script type(s), comma-separated"),
+    repo_owner: str = typer.Option(None, "--repo-owner", help="GitHub repository owner"),
+    repo_name: str = typer.Option(None, "--repo-name", help="GitHub repository name"),
+    jobs: int = typer.Option(None, "--jobs", "-j", min=1, help=f"Concurrent downloads (default and max: {HTTP_MAX_CONNECTIONS})"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network failures"),
+    json_output: bool = typer.Option(False, "--json", help="Print the mirrored assets as JSON"),
+):
+    """
+    Copy release assets and their metadata into a directory for air-gapped installs.
+
+    Writes <dir>/<owner>/<repo>/releases/<tag>.json, the assets under
+    releases/<tag>/ and releases/latest.json (the most recently published
+    mirrored release). Assets already mirrored are kept and template zips are
+    verified against their release manifests. Files are renamed into place
+    and release JSON is written last, so 'specify init' can read the mirror
+    while it is being updated.
+
+    Serve the directory as is (any static HTTP server) or share it on disk,
+    then point 'specify init --template-source' (or SPECIFY_TEMPLATE_SOURCE)
+    at it.
+
+    Examples:
+        specify mirror /mnt/spec-kit-mirror
+        specify mirror ./mirror --tag v0.3.0 --tag v0.4.0 --ai claude,copilot --script sh
+    """
+    selected_ais = parse_choice_list(ai_assistant, AI_CHOICES, "AI assistant") if ai_assistant else None
+    selected_scripts = parse_choice_list(script_type, SCRIPT_TYPE_CHOICES, "script type") if script_type else None
+    repo_owner, repo_name, _ = resolve_repo(repo_owner, repo_name, None)
+    root = Path(directory).expanduser().resolve()
+    client = get_http_client(verify=not skip_tls)
+
+    start = time.perf_counter()
+    rows = []
+    for tag in tags or [None]:
+        release_data = fetch_release_data(client, repo_owner, repo_name, tag=tag, verbose=not json_output, debug=debug)
+        try:
+            with console.status(f"Mirroring {release_data['tag_name']}..."):
+                rows += mirror_release(client, release_data, root, repo_owner, repo_name, ai_assistants=selected_ais, script_types=selected_scripts, jobs=jobs)
+        except Exception as e:
+            console.print(f"[red]Error mirroring release[/red] {release_data.get('tag_name')}")
+            console.print(Panel(str(e), title="Mirror Error", border_style="red"))
+            raise typer.Exit(1)
+    latest = update_mirror_latest(root, repo_owner, repo_name)
+    elapsed = time.perf_counter() - start
+
+    if json_output:
+        print(json.dumps({"mirror": str(root), "repo": f"{repo_owner}/{repo_name}", "latest": latest, "assets": rows}, indent=2))
+        return
+
+    from rich.table import Table
+
+    for tag in dict.fromkeys(row["tag"] for row in rows):
+        table = Table(title=tag, title_justify="left", title_style="bold cyan", show_header=True, header_style="cyan", box=None, padding=(0, 2))
+        table.add_column("Asset", overflow="fold")
+        table.add_column("Size", justify="right", no_wrap=True)
+        table.add_column("Status", no_wrap=True)
+        for row in rows:
+            if row["tag"] == tag:
+                table.add_row(row["name"], f"{row['size']:,}", row["status"] if row["status"] != "present" else "[dim]present[/dim]")
+        console.print(table)
+    fetched = sum(row["size"] for row in rows if row["status"] != "present")
+    console.print(f"\n[bold green]Mirrored {len(rows)} assets[/bold green] of {repo_owner}/{repo_name} in {root} "
+                  f"[dim]({fetched:,} bytes downloaded, {elapsed:.2f}s)[/dim]")
+    console.print(f"[cyan]Latest:[/cyan] {latest}")
+    console.print(f"[dim]Use it with: specify init --template-source {root}[/dim]")
+
+
+@app.command()
+def paths(
+    target_repo: str = typer.Option(None, "--repo", help="Target repo in workspace mode (default: inferred from the spec's conventions)"),
+    branch: str = typer.Option(None, "--branch", help="Resolve for this branch instead of the current one"),
+    no_workspace: bool = typer.Option(False, "--no-workspace", help="Ignore workspace.yml and resolve against the repo (like get_feature_paths)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the variables as a JSON object instead of shell assignments"),
+):
+    """
+    Print the current feature's paths (the variables of get_feature_paths_smart in common.sh).
+
+    The repo root, git dir and branch come from a single `git rev-parse`;
+    workspace detection and convention routing run in-process. The default
+    output is shell assignments for eval.
+
+    Examples:
+        eval "$(specify paths)"
+        specify paths --json --repo backend-api
+    """
+    try:
+        variables, warnings = feature_paths(Path.cwd(), target_repo=target_repo, workspace=not no_workspace, branch=branch)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        raise typer.Exit(1)
+    for warning in warnings:
+        print(f"WARNING: {warning}", file=sys.stderr)
+    if json_output:
+        print(json.dumps(variables, indent=2))
+    else:
+        for name, value in variables.items():
+            quoted = value.replace("'", "'\\''")
+            print(f"{name}='{quoted}'")
+
+
+def resolve_workspace_root(workspace: str | None) -> Path:
+    """Explicit or detected workspace root; exits when it has no workspace.yml."""
+    workspace_root = Path(workspace).resolve() if workspace else find_workspace_root(Path.cwd().resolve())
+    if workspace_root is None or not (workspace_root / WORKSPACE_CONFIG).is_file():
+        console.print(f"[red]Error:[/red] No {WORKSPACE_CONFIG} found" + (f" in {workspace_root}" if workspace_root else " in this directory or its parents"))
+        raise typer.Exit(1)
+    return workspace_root
+
+
+@app.command()
+def route(
+    spec_id: str = typer.Argument(..., help="Spec ID or branch name to route (a Jira key prefix is ignored for matching)"),
+    workspace: str = typer.Option(None, "--workspace", help="Workspace root (default: detected from the current directory)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the route as JSON"),
+):
+    """
+    Show which workspace repos a spec targets, with their paths and Jira requirement.
+
+    Applies the prefix/suffix conventions of .specify/workspace.yml (every
+    repo when no rule matches) from a cached, pre-compiled snapshot of the
+    config.
+
+    Examples:
+        specify route proj-123.backend-auth-api
+        specify route fullstack-login --json
+    """
+    workspace_root = resolve_workspace_root(workspace)
+    result = WorkspaceRouter.load(workspace_root).route(feature_id_from_branch(spec_id))
+    if json_output:
+        print(json.dumps({"workspace_root": str(workspace_root), **result}, indent=2))
+        return
+
+    from rich.table import Table
+
+    rule = "convention match" if result["matched"] else "no rule matched, all repos"
+    console.print(f"[cyan]{result['spec_id']}[/cyan] [dim]({rule})[/dim]")
+    table = Table(show_header=True, header_style="cyan", box=None, padding=(0, 2))
+    table.add_column("Repo", no_wrap=True)
+    table.add_column("Path")
+    table.add_column("Jira")
+    for repo in result["repos"]:
+        table.add_row(repo["name"], repo["path"] or "[yellow]not configured[/yellow]", "required" if repo["require_jira"] else "optional")
+    console.print(table)
+
+
+workspace_app = typer.Typer(name="workspace", help="Inspect the repos of a multi-repo workspace", add_completion=False)
+app.add_typer(workspace_app, name="workspace")
+
+
+@workspace_app.command("status")
+def workspace_status_command(
+    ctx: typer.Context,
+    workspace: str = typer.Option(None, "--workspace", help="Workspace root (default: detected from the current directory)"),
+    jobs: int = typer.Option(None, "--jobs", "-j", min=1, help="Repos queried concurrently (default: CPU count + 4, max 32)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the repo statuses as JSON"),
+    trace_file: Path = typer.Option(None, "--trace-file", help="Write a Chrome trace (chrome://tracing, Perfetto) of the git status calls to this file"),
+):
+    """
+    Show every workspace repo's branch, spec, upstream divergence and changes.
+
+    Runs one `git status --porcelain=v2 --branch` per repo, concurrently.
+    Exits 1 when a repo could not be queried.
+    """
+    if trace_file:
+        start_tracing()
+        ctx.call_on_close(lambda: finish_tracing("specify workspace status", trace_file, False))
+    router = WorkspaceRouter.load(resolve_workspace_root(workspace))
+    start = time.perf_counter()
+    results = workspace_status(router, jobs=jobs)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for repo in results if "error" in repo)
+    if json_output:
+        print(json.dumps({"workspace_root": str(router.root), "repos": results}, indent=2))
+        raise typer.Exit(1 if failed else 0)
+
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style="cyan", box=None, padding=(0, 2))
+    table.add_column("Repo", no_wrap=True)
+    table.add_column("Branch", no_wrap=True)
+    table.add_column("Spec", no_wrap=True)
+    table.add_column("Upstream", justify="right", no_wrap=True)
+    table.add_column("Changes", no_wrap=True)
+    for repo in results:
+        if "error" in repo:
+            table.add_row(repo["name"], "", "", "", f"[red]{repo['error']}[/red]")
+            continue
+        branch = repo["branch"] or f"[yellow](detached {(repo['oid'] or '')[:7]})[/yellow]"
+        spec = f"[green]{repo['feature_id']}[/green]" if repo["has_spec"] else ""
+        upstream = "[dim]none[/dim]" if repo["ahead"] is None else f"↑{repo['ahead']} ↓{repo['behind']}"
+        changes = [f"{repo[key]} {label}" for key, label in (("conflicts", "conflicted"), ("staged", "staged"), ("unstaged", "modified"), ("untracked", "untracked")) if repo[key]]
+        table.add_row(repo["name"], branch, spec, upstream, ", ".join(changes) if changes else "[green]clean[/green]")
+    console.print(table)
+    console.print(f"[dim]{len(results)} repos in {elapsed * 1000:.0f} ms[/dim]")
+    if failed:
+        raise typer.Exit(1)
+
+
+agent_context_app = typer.Typer(name="agent-context", help="Keep agent context files (CLAUDE.md, ...) in sync with the plans", add_completion=False)
+app.add_typer(agent_context_app, name="agent-context")
+
+
+@agent_context_app.command("update")
+def agent_context_update(
+    agent: str = typer.Argument(None, help=f"Agent file to update: {', '.join(AGENT_CONTEXT_FILES)} (default: every existing one, else claude)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the results as JSON"),
+):
+    """
+    Regenerate agent context files from every plan under specs/.
+
+    Reads the Technical Context of all feature and capability plans (only
+    new or edited plans are re-parsed) and rewrites the Active Technologies
+    and Recent Changes sections of each agent file in one pass. Manual
+    additions are preserved; new files start from the agent-file template.
+    """
+    cwd = Path.cwd().resolve()
+    repo_root = find_repo_root(cwd) or cwd
+    if agent is not None and agent not in AGENT_CONTEXT_FILES:
+        console.print(f"[red]Error:[/red] Unknown agent '{agent}'. Choose from: {', '.join(AGENT_CONTEXT_FILES)}")
+        raise typer.Exit(1)
+    agents = [agent] if agent else [key for key, rel in AGENT_CONTEXT_FILES.items() if (repo_root / rel).is_file()] or ["claude"]
+    try:
+        results, sections = update_agent_context(repo_root, find_specs_root(cwd), agents)
+    except (OSError, UnicodeDecodeError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    if json_output:
+        print(json.dumps({"files": results, "technologies": sections["[EXTRACTED FROM ALL PLAN.MD FILES]"].splitlines()}, indent=2))
+        return
+    for result in results:
+        style = "dim" if result["status"] == "unchanged" else "green"
+        console.print(f"[{style}]{result['status']:>9}[/{style}] {AI_CHOICES.get(result['agent'], result['agent'])}: {result['path']}")
+
+
+index_app = typer.Typer(name="index", help="Maintain the on-disk index of features under specs/", add_completion=False)
+app.add_typer(index_app, name="index")
+
+
+def feature_index_json(index: FeatureIndex, feature_id: str, entry: dict) -> dict:
+    """Expand an index entry for JSON output (absolute paths, named artifact fields)."""
+    return {
+        "id": feature_id,
+        "path": str(index.root / entry["path"]),
+        "parent": entry["parent"],
+        "capability": entry["capability"],
+        "capabilities": entry.get("capabilities", []),
+        "artifacts": {
+            name: {"size": size, "mtime_ns": mtime_ns, "sha256": sha256}
+            for name, (size, mtime_ns, sha256) in entry["artifacts"].items()
+        },
+    }
+
+
+def resolve_index_root(root: str | None) -> Path:
+    return Path(root).resolve() if root else find_specs_root(Path.cwd().resolve())
+
+
+@index_app.command("update")
+def index_update(
+    root: str = typer.Option(None, "--root", help="Workspace or repo root holding specs/ (default: detected from the current directory)"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Discard the existing index and rescan and rehash everything"),
+    json_output: bool = typer.Option(False, "--json", help="Print the update counts as JSON"),
+):
+    """
+    Bring the feature index (.specify/cache/feature-index.json) up to date.
+
+    Only directories whose mtime changed are re-listed and only files whose
+    size or mtime changed are re-hashed, so refreshing an unchanged tree
+    costs one stat per directory and artifact.
+    """
+    index_root = resolve_index_root(root)
+    start = time.perf_counter()
+    index = FeatureIndex(index_root)
+    counts = index.update(rebuild=rebuild)
+    elapsed = time.perf_counter() - start
+    capabilities = sum(1 for entry in index.features.values() if entry["parent"])
+    if json_output:
+        print(json.dumps({
+            "root": str(index_root),
+            "features": len(index.features) - capabilities,
+            "capabilities": capabilities,
+            "scanned_dirs": counts["scanned"],
+            "hashed_files": counts["hashed"],
+            "seconds": round(elapsed, 4),
+        }, indent=2))
+        return
+    console.print(
+        f"[green]Indexed {len(index.features) - capabilities} features, {capabilities} capabilities[/green] "
+        f"[dim]({counts['scanned']} directories listed, {counts['hashed']} files hashed, {elapsed * 1000:.1f} ms)[/dim]"
+    )
+
+
+@index_app.command("get")
+def index_get(
+    feature: str = typer.Argument(None, help="Feature ID or branch name (default: the current branch)"),
+    root: str = typer.Option(None, "--root", help="Workspace or repo root holding specs/ (default: detected from the current directory)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the feature as JSON"),
+):
+    """Look up one feature or capability, re-checking only its own directory."""
+    index_root = resolve_index_root(root)
+    if not feature:
+        checkout = find_checkout_root(Path.cwd().resolve())
+        feature = git_head_branch(checkout) if checkout else None
+        if not feature:
+            console.print("[red]Error:[/red] Not on a branch; pass a feature ID")
+            raise typer.Exit(1)
+    index = FeatureIndex(index_root)
+    feature_id = feature_id_from_branch(feature)
+    entry = index.get(feature_id)
+    if entry is None:
+        if json_output:
+            print(json.dumps({"error": f"Feature not found: {feature_id}"}))
+        else:
+            console.print(f"[red]Error:[/red] Feature not found in {index_root / 'specs'}: {feature_id}")
+        raise typer.Exit(1)
+
+    data = feature_index_json(index, feature_id, entry)
+    if json_output:
+        print(json.dumps(data, indent=2))
+        return
+    tree = Tree(f"[cyan]{feature_id}[/cyan] [dim]{data['path']}[/dim]", guide_style="grey50")
+    if entry["parent"]:
+        tree.add(f"parent: {entry['parent']}")
+    for capability in data["capabilities"]:
+        tree.add(f"capability: {capability}")
+    for name, artifact in data["artifacts"].items():
+        tree.add(f"{name} [dim]{artifact['size']:,} bytes · {artifact['sha256'][:12]}[/dim]")
+    console.print(tree)
+
+
+@index_app.command("list")
+def index_list(
+    root: str = typer.Option(None, "--root", help="Workspace or repo root holding specs/ (default: detected from the current directory)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the features as JSON"),
+):
+    """List every indexed feature and capability (updating the index first)."""
+    index = FeatureIndex(resolve_index_root(root))
+    index.update()
+    if json_output:
+        print(json.dumps([feature_index_json(index, fid, entry) for fid, entry in sorted(index.features.items())], indent=2))
+        return
+
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style="cyan", box=None, padding=(0, 2))
+    table.add_column("Feature", no_wrap=True)
+    table.add_column("Parent")
+    table.add_column("Artifacts")
+    for feature_id, entry in sorted(index.features.items()):
+        table.add_row(feature_id, entry["parent"] or "", ", ".join(entry["artifacts"]))
+    console.print(table)
+
+
+archive_app = typer.Typer(name="archive", help="Pack completed features into compressed archives and read them back", add_completion=False)
+app.add_typer(archive_app, name="archive")
+
+
+@archive_app.command("pack")
+def archive_pack(
+    feature: str = typer.Argument(None, help="Feature ID or branch name to archive (default: the current branch)"),
+    bulk: bool = typer.Option(False, "--bulk", help="Archive every completed feature (all tasks ticked) and compress legacy archive/ directories"),
+    compression: str = typer.Option("deflate", "--compression", help=f"Zip compression: {', '.join(ARCHIVE_COMPRESSION)} (deflate opens anywhere, lzma is smaller)"),
+    jobs: int = typer.Option(None, "--jobs", "-j", min=1, help="Archives packed concurrently with --bulk (default: CPU count)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be archived without changing anything"),
+    root: str = typer.Option(None, "--root", help="Workspace or repo root holding specs/ (default: detected from the current directory)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the results as JSON"),
+):
+    """
+    Move features from specs/ into compressed archives under archive/.
+
+    Each feature becomes archive/<feature-id>-<timestamp>.zip (with a
+    completion report) and is listed in archive/index.json, so archived
+    features can be listed and single files read without unpacking.
+    --bulk archives every feature whose tasks.md checkboxes are all ticked,
+    and also compresses the archive/<id>-<timestamp>/ directories written
+    by archive-feature.sh, in parallel.
+
+    Examples:
+        specify archive pack
+        specify archive pack proj-123.user-auth
+        specify archive pack --bulk --dry-run
+    """
+    if compression not in ARCHIVE_COMPRESSION:
+        console.print(f"[red]Error:[/red] Invalid compression '{compression}'. Choose from: {', '.join(ARCHIVE_COMPRESSION)}")
+        raise typer.Exit(1)
+    index_root = resolve_index_root(root)
+
+    if bulk:
+        if feature:
+            console.print("[red]Error:[/red] Cannot combine a feature ID with --bulk")
+            raise typer.Exit(1)
+        features = FeatureIndex(index_root)
+        features.update()
+        features = [fid for fid, entry in sorted(features.features.items()) if entry["parent"] is None and feature_tasks_complete(index_root / entry["path"])]
+        legacy = legacy_archive_dirs(index_root)
+    else:
+        if not feature:
+            checkout = find_checkout_root(Path.cwd().resolve())
+            feature = git_head_branch(checkout) if checkout else None
+            if not feature:
+                console.print("[red]Error:[/red] Not on a branch; pass a feature ID")
+                raise typer.Exit(1)
+        feature_id = feature_id_from_branch(feature)
+        if not (index_root / "specs" / feature_id).is_dir():
+            if json_output:
+                print(json.dumps({"error": f"Feature directory not found: {index_root / 'specs' / feature_id}"}))
+            else:
+                console.print(f"[red]Error:[/red] Feature directory not found: {index_root / 'specs' / feature_id}")
+            raise typer.Exit(1)
+        features, legacy = [feature_id], []
+
+    if dry_run:
+        if json_output:
+            print(json.dumps({"features": features, "legacy": legacy}, indent=2))
+            return
+        for feature_id in features:
+            console.print(f"[cyan]would archive[/cyan] specs/{feature_id}")
+        for dirname in legacy:
+            console.print(f"[cyan]would compress[/cyan] {ARCHIVE_DIR}/{dirname}/")
+        if not features and not legacy:
+            console.print("[dim]Nothing to archive[/dim]")
+        return
+
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    tasks = [(feature_id, pack_feature, dict(root=index_root, feature_id=feature_id, timestamp=timestamp, compression=compression)) for feature_id in features]
+    tasks += [(f"{ARCHIVE_DIR}/{dirname}/", pack_legacy_archive, dict(root=index_root, dirname=dirname, compression=compression)) for dirname in legacy]
+    index = ArchiveIndex(index_root)
+    results, failures = [], []
+    start = time.perf_counter()
+    if tasks:
+        # zlib and lzma release the GIL, so threads compress in parallel
+        with ThreadPoolExecutor(max_workers=min(jobs or os.cpu_count() or 1, len(tasks))) as pool:
+            futures = {pool.submit(fn, **kwargs): label for label, fn, kwargs in tasks}
+            for future in as_completed(futures):
+                try:
+                    name, entry = future.result()
+                except (OSError, zipfile.BadZipFile) as e:
+                    failures.append({"source": futures[future], "error": str(e)})
+                    continue
+                index.add(name, entry)
+                raw = sum(size for size, _ in entry["files"].values())
+                results.append({"source": futures[future], "archive": f"{ARCHIVE_DIR}/{name}", "files": len(entry["files"]), "bytes": raw, "archive_bytes": entry["bytes"]})
+    if index.changed:
+        index.save()
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda result: result["archive"])
+
+    if json_output:
+        print(json.dumps({"archived": results, "failed": failures, "seconds": round(elapsed, 3)}, indent=2))
+    else:
+        for result in results:
+            console.print(f"[green]✓[/green] {result['source']} → {result['archive']} "
+                          f"[dim]({result['files']} files, {result['bytes']:,} → {result['archive_bytes']:,} bytes)[/dim]")
+        for failure in failures:
+            console.print(f"[red]✗[/red] {failure['source']}: {failure['error']}")
+        if not tasks:
+            console.print("[dim]No completed features to archive[/dim]")
+        elif len(tasks) > 1:
+            console.print(f"\n[bold green]Archived {len(results)} of {len(tasks)}[/bold green] [dim]({elapsed:.2f}s)[/dim]")
+    if failures:
+        raise typer.Exit(1)
+
+
+def resolve_archive(index: ArchiveIndex, feature: str) -> str:
+    name = index.find(feature)
+    if name is None:
+        console.print(f"[red]Error:[/red] No archive found for {feature} in {index.dir}")
+        raise typer.Exit(1)
+    return name
+
+
+@archive_app.command("list")
+def archive_list(
+    feature: str = typer.Argument(None, help="Feature ID or archive file name to list the files of (default: list all archives)"),
+    root: str = typer.Option(None, "--root", help="Workspace or repo root holding archive/ (default: detected from the current directory)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the listing as JSON"),
+):
+    """List archived features, or the files inside one archive, from archive/index.json."""
+    index = ArchiveIndex(resolve_index_root(root))
+    if index.changed:
+        index.save()
+
+    from rich.table import Table
+
+    if feature:
+        name = resolve_archive(index, feature)
+        entry = index.archives[name]
+        if json_output:
+            print(json.dumps({"archive": name, **entry}, indent=2))
+            return
+        console.print(f"[cyan]{name}[/cyan] [dim]{entry['feature_id']}, archived {entry['archived_at'] or 'unknown'}[/dim]")
+        table = Table(show_header=True, header_style="cyan", box=None, padding=(0, 2))
+        table.add_column("File", overflow="fold")
+        table.add_column("Size", justify="right", no_wrap=True)
+        table.add_column("Compressed", justify="right", no_wrap=True)
+        for filename, (size, compressed) in sorted(entry["files"].items()):
+            table.add_row(filename, f"{size:,}", f"{compressed:,}")
+        console.print(table)
+        return
+
+    if json_output:
+        print(json.dumps([{"archive": name, **entry} for name, entry in sorted(index.archives.items())], indent=2))
+        return
+    if not index.archives:
+        console.print(f"[dim]No archives in {index.dir}[/dim]")
+        return
+    table = Table(show_header=True, header_style="cyan", box=None, padding=(0, 2))
+    table.add_column("Feature", overflow="fold")
+    table.add_column("Archived", no_wrap=True)
+    table.add_column("Files", justify="right", no_wrap=True)
+    table.add_column("Size", justify="right", no_wrap=True)
+    for name, entry in sorted(index.archives.items()):
+        table.add_row(entry["feature_id"], entry["archived_at"] or "", str(len(entry["files"])), f"{entry['bytes']:,}")
+    console.print(table)
+
+
+@archive_app.command("extract")
+def archive_extract(
+    feature: str = typer.Argument(..., help="Feature ID (its most recent archive) or archive file name"),
+    files: list[str] = typer.Argument(None, help="Files to extract (default: all)"),
+    output: str = typer.Option(None, "--output", "-o", help="Directory to extract into (default: restore to specs/<feature-id>)"),
+    stdout: bool = typer.Option(False, "--stdout", help="Write the requested file(s) to standard output instead"),
+    force: bool = typer.Option(False, "--force", help="Overwrite existing files"),
+    root: str = typer.Option(None, "--root", help="Workspace or repo root holding archive/ (default: detected from the current directory)"),
+):
+    """
+    Read files back out of a feature archive without unpacking the rest.
+
+    Examples:
+        specify archive extract proj-123.user-auth spec.md --stdout
+        specify archive extract proj-123.user-auth -o /tmp/user-auth
+        specify archive extract proj-123.user-auth  # restore to specs/
+    """
+    index_root = resolve_index_root(root)
+    index = ArchiveIndex(index_root)
+    name = resolve_archive(index, feature)
+    entry = index.archives[name]
+    missing = [filename for filename in files or [] if filename not in entry["files"]]
+    if missing:
+        console.print(f"[red]Error:[/red] Not in {name}: {', '.join(missing)}")
+        raise typer.Exit(1)
+    names = files or sorted(entry["files"])
+
+    with zipfile.ZipFile(index.dir / name) as zf:
+        if stdout:
+            for filename in names:
+                sys.stdout.buffer.write(zf.read(filename))
+            sys.stdout.buffer.flush()
+            return
+        dest = Path(output).resolve() if output else index_root / entry["source"]
+        targets = [(filename, member_target(dest, filename)) for filename in names]
+        targets = [(filename, target) for filename, target in targets if target is not None]
+        # Refuse before writing anything so a conflict never leaves a half-restored directory
+        existing = [target for _, target in targets if target.exists()]
+        if existing and not force:
+            console.print(f"[red]Error:[/red] {len(existing)} file(s) already exist in {dest} (use --force to overwrite):")
+            for target in existing:
+                console.print(f"  - {target.relative_to(dest)}")
+            raise typer.Exit(1)
+        written = 0
+        for filename, target in targets:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(filename) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            written += 1
+    console.print(f"[green]Extracted {written} file(s)[/green] from {ARCHIVE_DIR}/{name} to {dest}")
+
+
+@app.command()
+def search(
+    query: list[str] = typer.Argument(..., help='Words, "quoted phrases", prefix* terms and IDs such as FR-001 or T014; all must match'),
+    limit: int = typer.Option(10, "--limit", "-n", min=1, help="Maximum number of results"),
+    scope: str = typer.Option("all", "--scope", help=f"Where to search: {', '.join(SEARCH_SCOPES)}"),
+    no_refresh: bool = typer.Option(False, "--no-refresh", help="Query the index as it is, without checking for changed files"),
+    rescan: bool = typer.Option(False, "--rescan", help=f"Stat every file, not only changed directories, to pick up files edited in place (done every {SEARCH_RESCAN_SECONDS // 60} minutes anyway)"),
+    reindex: bool = typer.Option(False, "--reindex", help="Discard the index and rebuild it from scratch"),
+    root: str = typer.Option(None, "--root", help="Workspace or repo root holding specs/ and archive/ (default: detected from the current directory)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the results as JSON"),
+):
+    """
+    Search specs/ and archive/ (including zipped archives) for prior decisions.
+
+    Results are ranked with matches in titles, requirement/task IDs and
+    headings above matches in body text. The index lives in
+    .specify/cache/search.sqlite and is refreshed before each query: only
+    directories whose mtime changed are re-listed, only files whose size or
+    mtime changed are re-read, and only those whose content changed are
+    re-indexed. Every file is stat'ed again with --rescan, or when that was
+    last done more than five minutes ago.
+
+    Examples:
+        specify search session timeout
+        specify search FR-012 --scope archive
+        specify search '"rate limit"' auth* --json
+    """
+    if scope not in SEARCH_SCOPES:
+        console.print(f"[red]Error:[/red] Invalid scope '{scope}'. Choose from: {', '.join(SEARCH_SCOPES)}")
+        raise typer.Exit(1)
+    text = " ".join(query)
+    index_root = resolve_index_root(root)
+    start = time.perf_counter()
+    try:
+        index = SearchIndex(index_root, reset=reindex)
+    except RuntimeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    try:
+        counts = None if no_refresh else index.refresh(full=rescan or index.rescan_due())
+        refreshed = time.perf_counter()
+        results = index.search(text, limit=limit, scope=scope)
+        finished = time.perf_counter()
+    finally:
+        index.close()
+
+    if json_output:
+        print(json.dumps({
+            "query": text,
+            "scope": scope,
+            "results": [{**result, "snippet": result["snippet"].replace("\x02", "").replace("\x03", "")} for result in results],
+            "refresh": counts,
+            "refresh_ms": round((refreshed - start) * 1000, 2),
+            "query_ms": round((finished - refreshed) * 1000, 2),
+        }, indent=2))
+        return
+
+    from rich.markup import escape
+
+    if not results:
+        console.print(f"[dim]No matches for {escape(text)}[/dim]")
+    for result in results:
+        location = f"{result['path']}:{result['line']}" if result["line"] else result["path"]
+        snippet = escape(result["snippet"]).replace("\x02", "[bold yellow]").replace("\x03", "[/bold yellow]")
+        console.print(f"[cyan]{escape(location)}[/cyan]  [dim]{escape(result['title'])}[/dim]")
+        console.print(f"    {snippet}", highlight=False)
+    summary = f"{len(results)} result(s) in {(finished - refreshed) * 1000:.1f} ms"
+    if counts is not None:
+        summary += f"; refreshed {counts['documents']:,} documents in {(refreshed - start) * 1000:.0f} ms ({counts['scanned']} directories listed, {counts['indexed']} indexed, {counts['removed']} removed)"
+    console.print(f"[dim]{summary}[/dim]")
+
+
 @app.command()
 def check():
     """Check that all required tools are installed."""